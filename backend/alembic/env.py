@@ -19,6 +19,11 @@ from app.models.event import Event
 from app.models.goal import Goal
 from app.models.group import Group, GroupMember, ExpenseSplit
 from app.models.audit import AuditLog
+from app.models.daily_spend import DailySpend
+from app.models.import_job import ImportJob
+from app.models.sync import SyncVersion, Tombstone
+from app.models.spending_stats import SpendingStats
+from app.models.category_example import CategoryExample
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,68 @@
+"""add_expense_fingerprint
+
+Revision ID: a8e1f5c3d726
+Revises: f2c8a6d4b913
+Create Date: 2026-10-18 15:12:44.903518
+
+"""
+import hashlib
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8e1f5c3d726'
+down_revision: Union[str, Sequence[str], None] = 'f2c8a6d4b913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _fingerprint(user_id, amount, expense_date, description) -> str:
+    # Frozen copy of expense_service.expense_fingerprint as of this revision
+    day = expense_date[:10] if isinstance(expense_date, str) else expense_date.date().isoformat()
+    normalized = " ".join(re.findall(r"[a-z0-9]+", (description or "").lower()))
+    raw = f"{user_id}|{float(amount):.2f}|{day}|{normalized}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('expenses', sa.Column('fingerprint', sa.String(length=64), nullable=True))
+    op.add_column('expenses', sa.Column('idempotency_key', sa.String(length=64), nullable=True))
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, user_id, amount, date, description FROM expenses "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            sa.text("UPDATE expenses SET fingerprint = :fingerprint WHERE id = :id"),
+            [
+                {"id": row.id, "fingerprint": _fingerprint(row.user_id, row.amount, row.date, row.description)}
+                for row in rows
+            ]
+        )
+        last_id = rows[-1].id
+
+    op.create_index('ix_expenses_user_fingerprint', 'expenses', ['user_id', 'fingerprint'], unique=False)
+    op.create_index('ix_expenses_user_idempotency_key', 'expenses', ['user_id', 'idempotency_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_expenses_user_idempotency_key', table_name='expenses')
+    op.drop_index('ix_expenses_user_fingerprint', table_name='expenses')
+    op.drop_column('expenses', 'idempotency_key')
+    op.drop_column('expenses', 'fingerprint')
@@ -0,0 +1,56 @@
+"""add_sync_change_tracking
+
+Revision ID: b1d4e7a2c958
+Revises: a8e1f5c3d726
+Create Date: 2026-10-18 16:02:37.481265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1d4e7a2c958'
+down_revision: Union[str, Sequence[str], None] = 'a8e1f5c3d726'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = ('categories', 'budgets', 'goals', 'expenses')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows keep change_seq 0 and are picked up by cold-start syncs
+    for table in SYNCED_TABLES:
+        op.add_column(table, sa.Column('change_seq', sa.BigInteger(), server_default='0', nullable=False))
+        op.create_index(f'ix_{table}_user_change_seq', table, ['user_id', 'change_seq'], unique=False)
+
+    op.create_table('sync_versions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('seq', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('change_seq', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_user_change_seq', 'tombstones', ['user_id', 'change_seq'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tombstones_user_change_seq', table_name='tombstones')
+    op.drop_table('tombstones')
+    op.drop_table('sync_versions')
+    for table in reversed(SYNCED_TABLES):
+        op.drop_index(f'ix_{table}_user_change_seq', table_name=table)
+        op.drop_column(table, 'change_seq')
@@ -0,0 +1,45 @@
+"""add_daily_spend_rollup
+
+Revision ID: b7e2d4a91c05
+Revises: 9fb008be69c1
+Create Date: 2026-10-18 10:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d4a91c05'
+down_revision: Union[str, Sequence[str], None] = '9fb008be69c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_spend',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('expense_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day', 'category_id')
+    )
+    # Backfill from existing expenses (0 = uncategorized)
+    op.execute(
+        """
+        INSERT INTO daily_spend (user_id, day, category_id, total, expense_count)
+        SELECT user_id, date(date), COALESCE(category_id, 0), SUM(amount), COUNT(id)
+        FROM expenses
+        GROUP BY user_id, date(date), COALESCE(category_id, 0)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_spend')
@@ -0,0 +1,32 @@
+"""add_budget_breach_tracking
+
+Revision ID: c3f81a6e2d47
+Revises: b7e2d4a91c05
+Create Date: 2026-10-18 11:40:02.561937
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f81a6e2d47'
+down_revision: Union[str, Sequence[str], None] = 'b7e2d4a91c05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('budgets', sa.Column('period_start', sa.Date(), nullable=True))
+    op.add_column('budgets', sa.Column('period_spent', sa.Float(), server_default='0', nullable=False))
+    op.add_column('budgets', sa.Column('alert_level', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('budgets', 'alert_level')
+    op.drop_column('budgets', 'period_spent')
+    op.drop_column('budgets', 'period_start')
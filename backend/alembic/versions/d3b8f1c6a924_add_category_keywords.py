@@ -0,0 +1,28 @@
+"""add_category_keywords
+
+Revision ID: d3b8f1c6a924
+Revises: c9f2a7d4e615
+Create Date: 2026-10-18 19:26:40.918352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3b8f1c6a924'
+down_revision: Union[str, Sequence[str], None] = 'c9f2a7d4e615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('categories', sa.Column('keywords', sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('categories', 'keywords')
@@ -0,0 +1,47 @@
+"""add_expense_search_index
+
+Revision ID: d4a7c2e91f36
+Revises: c3f81a6e2d47
+Create Date: 2026-10-18 13:05:47.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7c2e91f36'
+down_revision: Union[str, Sequence[str], None] = 'c3f81a6e2d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_TEXT_SQL = (
+    "lower(coalesce(description, '') || ' ' || coalesce(notes, '') || ' ' || coalesce(tags, ''))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'expenses',
+        sa.Column('search_text', sa.Text(), sa.Computed(SEARCH_TEXT_SQL, persisted=True), nullable=True)
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        # Trigram GIN index serves both ILIKE '%term%' and the <% fuzzy operator
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index(
+            'ix_expenses_search_text_trgm',
+            'expenses',
+            ['search_text'],
+            postgresql_using='gin',
+            postgresql_ops={'search_text': 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_expenses_search_text_trgm', table_name='expenses')
+    op.drop_column('expenses', 'search_text')
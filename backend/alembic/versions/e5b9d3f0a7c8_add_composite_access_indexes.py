@@ -0,0 +1,69 @@
+"""add_composite_access_indexes
+
+Revision ID: e5b9d3f0a7c8
+Revises: d4a7c2e91f36
+Create Date: 2026-10-18 13:52:19.604731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b9d3f0a7c8'
+down_revision: Union[str, Sequence[str], None] = 'd4a7c2e91f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_expenses_user_date_id',
+        'expenses',
+        ['user_id', sa.text('date DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_include=['amount', 'category_id']
+    )
+    op.create_index(
+        'ix_expenses_user_category_date',
+        'expenses',
+        ['user_id', 'category_id', 'date'],
+        unique=False,
+        postgresql_include=['amount']
+    )
+    # Leading column of both composites above
+    op.drop_index(op.f('ix_expenses_user_id'), table_name='expenses')
+
+    op.create_index(
+        'ix_notifications_user_created',
+        'notifications',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False
+    )
+    op.create_index(
+        'ix_notifications_user_unread',
+        'notifications',
+        ['user_id'],
+        unique=False,
+        postgresql_where=sa.text('is_read = false'),
+        sqlite_where=sa.text('is_read = 0')
+    )
+    op.create_index(
+        'ix_events_user_created',
+        'events',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_user_created', table_name='events')
+    op.drop_index('ix_notifications_user_unread', table_name='notifications')
+    op.drop_index('ix_notifications_user_created', table_name='notifications')
+    op.create_index(op.f('ix_expenses_user_id'), 'expenses', ['user_id'], unique=False)
+    op.drop_index('ix_expenses_user_category_date', table_name='expenses')
+    op.drop_index('ix_expenses_user_date_id', table_name='expenses')
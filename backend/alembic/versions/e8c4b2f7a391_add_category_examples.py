@@ -0,0 +1,43 @@
+"""add_category_examples
+
+Revision ID: e8c4b2f7a391
+Revises: d3b8f1c6a924
+Create Date: 2026-10-18 20:47:13.662091
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c4b2f7a391'
+down_revision: Union[str, Sequence[str], None] = 'd3b8f1c6a924'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled by rebuild_category_examples_task, then maintained on expense writes
+    op.create_table('category_examples',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('text', sa.String(length=100), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('vector', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_category_examples_user_text', 'category_examples', ['user_id', 'text'], unique=True)
+    op.create_index('ix_category_examples_user_updated', 'category_examples', ['user_id', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_category_examples_user_updated', table_name='category_examples')
+    op.drop_index('ix_category_examples_user_text', table_name='category_examples')
+    op.drop_table('category_examples')
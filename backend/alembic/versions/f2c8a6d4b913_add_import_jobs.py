@@ -0,0 +1,53 @@
+"""add_import_jobs
+
+Revision ID: f2c8a6d4b913
+Revises: e5b9d3f0a7c8
+Create Date: 2026-10-18 14:31:08.257390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8a6d4b913'
+down_revision: Union[str, Sequence[str], None] = 'e5b9d3f0a7c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # ALTER TYPE ... ADD VALUE cannot share a transaction with its first use
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE expensesource ADD VALUE IF NOT EXISTS 'IMPORT'")
+
+    op.create_table('import_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='importstatus'), nullable=False),
+    sa.Column('profile', sa.String(length=50), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('rows_processed', sa.Integer(), nullable=False),
+    sa.Column('rows_imported', sa.Integer(), nullable=False),
+    sa.Column('rows_skipped', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_import_jobs_id'), 'import_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_import_jobs_user_id'), 'import_jobs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_import_jobs_user_id'), table_name='import_jobs')
+    op.drop_index(op.f('ix_import_jobs_id'), table_name='import_jobs')
+    op.drop_table('import_jobs')
+    sa.Enum(name='importstatus').drop(op.get_bind(), checkfirst=True)
+    # PostgreSQL cannot drop a single enum value; 'IMPORT' stays on expensesource
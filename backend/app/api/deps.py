@@ -1,16 +1,20 @@
 """
 API Dependencies
 """
+import hashlib
+from datetime import datetime
 from typing import Generator, Optional, Any, cast
 
-from fastapi import Depends, HTTPException, status, Header
+from fastapi import Depends, HTTPException, status, Header, Request, Response
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 
 from app.db.database import get_db
 from app.core.security import decode_token
 from app.models.user import User, UserRole
+from app.models.sync import SyncVersion
 from app.services.auth_service import AuthService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
@@ -78,3 +82,36 @@ async def get_current_admin_user(
             detail="Not enough permissions"
         )
     return current_user
+
+
+async def check_etag(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+) -> None:
+    """
+    Conditional GET for per-user read endpoints.
+    
+    The strong ETag covers the URL, the user's change sequence (bumped in the
+    same transaction as any write to their data) and the UTC date, since
+    period-based figures roll over daily. A matching If-None-Match gets a
+    304 before the endpoint runs any queries.
+    """
+    if request.method != "GET":
+        return
+    
+    result = await db.execute(
+        select(SyncVersion.seq).where(SyncVersion.user_id == current_user.id)
+    )
+    version = int(result.scalar() or 0)
+    raw = f"{request.url.path}?{request.url.query}|{current_user.id}|{version}|{datetime.utcnow().date()}"
+    etag = f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in candidates or "*" in candidates:
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
@@ -1,6 +1,7 @@
 """
 Admin Panel Endpoints
 """
+from typing import Optional
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -91,3 +92,16 @@ async def get_feature_flags(
     """Get current feature flag status"""
     from app.core.feature_flags import feature_flags
     return feature_flags.get_all_flags()
+
+
+@router.post("/rollups/rebuild")
+async def rebuild_spend_rollup(
+    user_id: Optional[int] = None,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Rebuild the daily spend rollup from raw expenses (all users by default)"""
+    from app.services.rollup_service import RollupService
+    rows = await RollupService(db).rebuild(user_id)
+    await db.commit()
+    return {"message": "Rollup rebuilt", "rows": rows}
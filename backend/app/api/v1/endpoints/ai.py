@@ -1,10 +1,10 @@
 """
 AI Feature Endpoints
 """
-from typing import Any, cast
+from typing import Any, List, cast
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.db.database import get_db
 from app.api.deps import get_current_active_user
@@ -22,6 +22,10 @@ class CategorySuggestionRequest(BaseModel):
     amount: float
 
 
+class BatchCategorizationRequest(BaseModel):
+    items: List[CategorySuggestionRequest] = Field(..., min_length=1, max_length=500)
+
+
 router = APIRouter()
 
 
@@ -47,6 +51,27 @@ async def suggest_category(
     return suggestion
 
 
+@router.post("/categorize/batch")
+async def suggest_categories(
+    request: BatchCategorizationRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Categorize up to 500 descriptions at once; results are in request order"""
+    if not feature_flags.is_ai_enabled():
+        raise HTTPException(
+            status_code=400,
+            detail="AI features are disabled"
+        )
+    
+    ai_service = AIService(db)
+    results = await ai_service.suggest_categories(
+        cast(Any, current_user.id),
+        [(item.description, item.amount) for item in request.items]
+    )
+    return {"results": results}
+
+
 @router.post("/suggest-category", include_in_schema=False)
 async def suggest_category_alias(
     request: CategorySuggestionRequest,
@@ -4,7 +4,7 @@ Analytics Endpoints
 from typing import Optional, Any, cast
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db
@@ -18,7 +18,7 @@ router = APIRouter()
 
 @router.get("/summary", response_model=AnalyticsResponse)
 async def get_analytics_summary(
-    period: str = Query("monthly", regex="^(daily|weekly|monthly)$"),
+    period: str = Query("monthly", pattern="^(daily|weekly|monthly)$"),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     current_user: User = Depends(get_current_active_user),
@@ -48,22 +48,23 @@ async def get_spending_forecast(
 
 @router.get("/trends")
 async def get_spending_trends(
-    months: int = Query(6, ge=1, le=12),
+    months: int = Query(6, ge=1, le=36),
+    bucket: str = Query("month", pattern="^(week|month|quarter)$"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get spending trends over time"""
+    """Get spending trends over time, bucketed by week, month or quarter"""
     analytics_service = AnalyticsService(db)
-    trends = await analytics_service.get_trends(cast(Any, current_user.id), months)
+    trends = await analytics_service.get_trends(cast(Any, current_user.id), months, bucket)
     return trends
 
 @router.get("/export")
 async def export_data(
+    response: Response,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Export expenses as CSV"""
-    from fastapi.responses import Response
     from app.services.export_service import export_service
     from sqlalchemy import select
     from app.models.expense import Expense
@@ -82,8 +83,12 @@ async def export_data(
     
     filename = f"hisabkitab_export_{date.today().isoformat()}.csv"
     
+    # Returning a Response bypasses the injected one, so carry over the
+    # validators check_etag set on it
+    headers = {name: response.headers[name] for name in ("ETag", "Cache-Control") if name in response.headers}
+    headers["Content-Disposition"] = f"attachment; filename={filename}"
     return Response(
         content=csv_content,
         media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        headers=headers
     )
@@ -4,7 +4,7 @@ Expense Endpoints
 from typing import Optional, Any, cast
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Header, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db
@@ -12,11 +12,16 @@ from app.api.deps import get_current_active_user
 from app.models.user import User
 from app.schemas.expense import (
     ExpenseCreate,
+    ExpenseBulkCreate,
+    ExpenseBulkCreateResponse,
     ExpenseUpdate,
     ExpenseResponse,
     ExpenseListResponse,
 )
 from app.services.expense_service import ExpenseService
+from app.services.columnar_service import ColumnarService
+from app.services.import_service import ImportService, IMPORT_PROFILES, resolve_profile, run_import_job
+from app.schemas.import_job import ImportJobResponse
 
 router = APIRouter()
 
@@ -29,41 +34,75 @@ async def get_expenses(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from `next_cursor`; pass empty for the first page"),
+    total_mode: Optional[str] = Query(None, pattern="^(exact|estimate|none)$"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all expenses for current user with filtering"""
+    """
+    Get all expenses for current user with filtering.
+    
+    Offset pagination (`page`) is kept for existing clients. Passing `cursor`
+    switches to keyset pagination, which skips the total count by default.
+    `search` matches description, notes and tags; offset results are ranked
+    by relevance where the database supports it.
+    """
+    if total_mode is None:
+        total_mode = "exact" if cursor is None else "none"
+    
     expense_service = ExpenseService(db)
-    expenses, total = await expense_service.get_expenses(
+    return await expense_service.get_expenses(
         user_id=cast(Any, current_user.id),
         page=page,
         page_size=page_size,
         category_id=category_id,
         start_date=start_date,
         end_date=end_date,
-        search=search
-    )
-    
-    return ExpenseListResponse(
-        items=expenses,
-        total=total,
-        page=page,
-        page_size=page_size
+        search=search,
+        cursor=cursor,
+        total_mode=total_mode
     )
 
 
 @router.post("/", response_model=ExpenseResponse, status_code=status.HTTP_201_CREATED)
 async def create_expense(
     expense_data: ExpenseCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=64),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Create a new expense"""
+    """
+    Create a new expense.
+    
+    Retries carrying the same `Idempotency-Key` header return the original
+    expense instead of creating another. `duplicate_of` flags a likely
+    duplicate (same amount, day and description).
+    """
     expense_service = ExpenseService(db)
-    expense = await expense_service.create_expense(cast(Any, current_user.id), expense_data)
+    expense = await expense_service.create_expense(
+        cast(Any, current_user.id),
+        expense_data,
+        idempotency_key=idempotency_key
+    )
     return expense
 
 
+@router.post("/bulk", response_model=ExpenseBulkCreateResponse)
+async def bulk_create_expenses(
+    payload: ExpenseBulkCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create up to 500 expenses in one request.
+    
+    Items are inserted together in a single transaction; `results` reports
+    the new id or the error for each item, in request order.
+    """
+    expense_service = ExpenseService(db)
+    return await expense_service.bulk_create_expenses(cast(Any, current_user.id), payload.items)
+
+
 @router.get("/{expense_id}", response_model=ExpenseResponse)
 async def get_expense(
     expense_id: int,
@@ -132,19 +171,126 @@ async def bulk_delete_expenses(
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Bulk delete expenses"""
+    """Bulk delete expenses (up to 500 per request)"""
     expense_service = ExpenseService(db)
     await expense_service.bulk_delete_expenses(expense_ids, cast(Any, current_user.id))
     return None
 
 @router.get("/export/csv")
 async def export_expenses_csv(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category_id: Optional[int] = None,
+    gzip: bool = False,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Export expenses as CSV"""
+    """Export expenses as a streamed CSV, optionally filtered and gzipped"""
     expense_service = ExpenseService(db)
-    return await expense_service.export_csv(cast(Any, current_user.id))
+    return await expense_service.export_csv(
+        cast(Any, current_user.id),
+        start_date=start_date,
+        end_date=end_date,
+        category_id=category_id,
+        compress=gzip
+    )
+
+
+@router.get("/export/columnar")
+async def export_expenses_columnar(
+    format: str = Query("parquet", pattern="^(parquet|arrow)$"),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category_id: Optional[int] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Export expenses as typed Parquet or Arrow IPC stream for offline analysis"""
+    columnar_service = ColumnarService(db)
+    return columnar_service.export_expenses(
+        cast(Any, current_user.id),
+        file_format=format,
+        start_date=start_date,
+        end_date=end_date,
+        category_id=category_id
+    )
+
+
+@router.post("/import/columnar")
+async def import_expenses_columnar(
+    file: UploadFile = File(...),
+    format: str = Query("parquet", pattern="^(parquet|arrow)$"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Bulk import expenses from a Parquet or Arrow file (e.g. a previous export)"""
+    columnar_service = ColumnarService(db)
+    return await columnar_service.import_expenses(
+        cast(Any, current_user.id),
+        file.file,
+        file_format=format
+    )
+
+
+@router.get("/import/profiles")
+async def get_import_profiles(
+    current_user: User = Depends(get_current_active_user)
+):
+    """List the built-in bank statement column profiles"""
+    return {name: profile.model_dump() for name, profile in IMPORT_PROFILES.items()}
+
+
+@router.post("/import/csv", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def import_expenses_csv(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    profile: str = "generic",
+    date_column: Optional[str] = None,
+    description_column: Optional[str] = None,
+    amount_column: Optional[str] = None,
+    debit_column: Optional[str] = None,
+    date_format: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import a bank statement CSV in the background.
+    
+    Columns are mapped by `profile`; any column parameter overrides the
+    profile's default. Poll `/import/jobs/{job_id}` for progress.
+    """
+    import_profile = resolve_profile(profile, {
+        "date_column": date_column,
+        "description_column": description_column,
+        "amount_column": amount_column,
+        "debit_column": debit_column,
+        "date_format": date_format,
+    })
+    import_service = ImportService(db)
+    job, path = await import_service.start_import(
+        cast(Any, current_user.id), file, profile, import_profile
+    )
+    background_tasks.add_task(run_import_job, cast(Any, job.id), path, import_profile)
+    return job
+
+
+@router.get("/import/jobs/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(
+    job_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the progress of a CSV import"""
+    import_service = ImportService(db)
+    job = await import_service.get_job(job_id, cast(Any, current_user.id))
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    
+    return job
 
 
 @router.get("/export/pdf")
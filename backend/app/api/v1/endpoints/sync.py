@@ -0,0 +1,51 @@
+"""
+Sync Endpoints
+"""
+import gzip
+from typing import Optional, Any, cast
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_db
+from app.api.deps import get_current_active_user
+from app.models.user import User
+from app.schemas.sync import SyncResponse
+from app.services.sync_service import SyncService
+
+router = APIRouter()
+
+# Pages smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+
+@router.get("/", response_model=SyncResponse)
+async def get_changes(
+    request: Request,
+    since: int = Query(0, ge=0, description="Watermark from the previous sync; 0 for a cold start"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page"),
+    limit: int = Query(500, ge=1, le=2000),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delta sync for categories, budgets, goals and expenses.
+    
+    Returns rows changed after `since` plus tombstones for deleted rows,
+    paged by `next_cursor`. Store `watermark` once the last page arrives.
+    Responses are gzipped when the client accepts it.
+    """
+    sync_service = SyncService(db)
+    changes = await sync_service.get_changes(
+        cast(Any, current_user.id),
+        since=since,
+        cursor=cursor,
+        limit=limit
+    )
+    
+    body = changes.model_dump_json().encode()
+    headers = {"Vary": "Accept-Encoding"}
+    if len(body) >= GZIP_MIN_SIZE and "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_active_user, check_etag
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate
 from app.services.auth_service import AuthService
@@ -14,7 +14,7 @@ from app.services.auth_service import AuthService
 router = APIRouter()
 
 
-@router.get("/me", response_model=UserResponse)
+@router.get("/me", response_model=UserResponse, dependencies=[Depends(check_etag)])
 async def get_current_user_info(
     current_user: User = Depends(get_current_active_user)
 ):
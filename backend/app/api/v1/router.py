@@ -1,8 +1,9 @@
 """
 API v1 Router - Combines all endpoint routers
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from app.api.deps import check_etag
 from app.api.v1.endpoints import (
     auth,
     users,
@@ -15,10 +16,14 @@ from app.api.v1.endpoints import (
     ai,
     notifications,
     admin,
+    sync,
 )
 
 api_router = APIRouter()
 
+# Per-user read endpoints polled by dashboards answer If-None-Match with 304
+conditional_get = [Depends(check_etag)]
+
 # Authentication routes
 api_router.include_router(
     auth.router,
@@ -44,6 +49,7 @@ api_router.include_router(
 api_router.include_router(
     categories.router,
     prefix="/categories",
+    dependencies=conditional_get,
     tags=["Categories"]
 )
 
@@ -51,6 +57,7 @@ api_router.include_router(
 api_router.include_router(
     budgets.router,
     prefix="/budgets",
+    dependencies=conditional_get,
     tags=["Budgets"]
 )
 
@@ -58,6 +65,7 @@ api_router.include_router(
 api_router.include_router(
     analytics.router,
     prefix="/analytics",
+    dependencies=conditional_get,
     tags=["Analytics"]
 )
 
@@ -86,9 +94,17 @@ api_router.include_router(
 api_router.include_router(
     notifications.router,
     prefix="/notifications",
+    dependencies=conditional_get,
     tags=["Notifications"]
 )
 
+# Delta sync routes
+api_router.include_router(
+    sync.router,
+    prefix="/sync",
+    tags=["Sync"]
+)
+
 # Admin routes
 api_router.include_router(
     admin.router,
@@ -100,5 +116,6 @@ from app.api.v1.endpoints import goals
 api_router.include_router(
     goals.router,
     prefix="/goals",
+    dependencies=conditional_get,
     tags=["Financial Goals"]
 )
@@ -2,6 +2,7 @@
 Celery Configuration
 """
 from celery import Celery
+from celery.schedules import crontab
 from app.core.config import settings
 
 celery_app = Celery("worker", broker=settings.CELERY_BROKER_URL)
@@ -16,4 +17,11 @@ celery_app.conf.update(
     task_routes={
         "app.tasks.*": {"queue": "default"},
     },
+    beat_schedule={
+        # After midnight UTC, so the cached results match the day's cache keys
+        "precompute-forecasts": {
+            "task": "app.tasks.precompute_forecasts_task",
+            "schedule": crontab(hour=0, minute=30),
+        },
+    },
 )
@@ -89,6 +89,24 @@ class Settings(BaseSettings):
     # AI Configuration (LongCat & Hugging Face)
     LONGCAT_API_KEY: Optional[str] = None
     HF_API_KEY: Optional[str] = None
+    HF_INFERENCE_TIMEOUT: float = 10.0  # seconds per call, queueing included
+    HF_MAX_CONCURRENCY: int = 4  # in-flight calls per worker
+    
+    # Event Buffer (batched activity logging)
+    EVENT_BUFFER_MAX_SIZE: int = 10000
+    EVENT_BUFFER_BATCH_SIZE: int = 500
+    EVENT_BUFFER_FLUSH_INTERVAL: float = 2.0  # seconds
+    EVENT_BUFFER_PUT_TIMEOUT: float = 0.5  # seconds to wait on a full buffer
+    
+    # Analytics Cache (keys are invalidated by the per-user change sequence)
+    ANALYTICS_CACHE_TTL: int = 3600  # seconds in Redis
+    ANALYTICS_CACHE_L1_TTL: float = 60.0  # seconds in process memory
+    ANALYTICS_CACHE_L1_MAX_ENTRIES: int = 2048
+    
+    # Categorization Memo (per-user description -> category)
+    CATEGORY_MEMO_TTL: int = 30 * 86400  # seconds in Redis
+    CATEGORY_MEMO_L1_TTL: float = 300.0  # seconds in process memory
+    CATEGORY_MEMO_L1_MAX_ENTRIES: int = 10000
     
     # Feature Flags
     ENABLE_AI_FEATURES: bool = True
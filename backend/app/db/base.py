@@ -2,7 +2,7 @@
 SQLAlchemy Base Model
 """
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, BigInteger
 from datetime import datetime
 
 
@@ -20,3 +20,9 @@ class TimestampMixin:
         onupdate=datetime.utcnow,
         nullable=False
     )
+
+
+class SyncMixin:
+    """Mixin for the per-user change sequence read by the /sync delta feed"""
+    # Stamped on every flush by app.models.sync; 0 means "before sync existed"
+    change_seq = Column(BigInteger, default=0, server_default="0", nullable=False)
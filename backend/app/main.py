@@ -20,6 +20,8 @@ from app.db.base import Base
 from app.middleware.logging import LoggingMiddleware
 from app.middleware.error_handler import ErrorHandlerMiddleware
 from app.core.limiter import limiter
+from app.services.event_service import event_buffer
+from app.services.hf_inference import hf_inference
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -70,9 +72,14 @@ async def lifespan(app: FastAPI):
                 firebase_admin.initialize_app(cred)
         except Exception as e:
             print(f"Firebase initialization failed: {e}")
+    
+    await event_buffer.start()
             
     yield
     # Shutdown
+    await event_buffer.stop()  # Flush queued events before the pool closes
+    if hf_inference:
+        hf_inference.shutdown()
     await engine.dispose()
 
 
@@ -8,6 +8,11 @@ from app.models.budget import Budget
 from app.models.notification import Notification
 from app.models.event import Event
 from app.models.group import Group, GroupMember, ExpenseSplit
+from app.models.daily_spend import DailySpend
+from app.models.import_job import ImportJob
+from app.models.sync import SyncVersion, Tombstone
+from app.models.spending_stats import SpendingStats
+from app.models.category_example import CategoryExample
 
 __all__ = [
     "User",
@@ -19,4 +24,10 @@ __all__ = [
     "Group",
     "GroupMember",
     "ExpenseSplit",
+    "DailySpend",
+    "ImportJob",
+    "SyncVersion",
+    "Tombstone",
+    "SpendingStats",
+    "CategoryExample",
 ]
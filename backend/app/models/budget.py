@@ -1,13 +1,13 @@
 """
 Budget Model
 """
-from sqlalchemy import Column, Integer, Float, ForeignKey, String
+from sqlalchemy import Column, Integer, Float, ForeignKey, String, Date, Index
 from sqlalchemy.orm import relationship
 
-from app.db.base import Base, TimestampMixin
+from app.db.base import Base, TimestampMixin, SyncMixin
 
 
-class Budget(Base, TimestampMixin):
+class Budget(Base, TimestampMixin, SyncMixin):
     """Budget database model"""
     __tablename__ = "budgets"
     
@@ -19,9 +19,17 @@ class Budget(Base, TimestampMixin):
     amount = Column(Float, nullable=False)  # Budget limit
     period = Column(String(20), default="monthly")  # daily, weekly, monthly
     
+    # Incremental breach tracking, maintained by BudgetService.track_spend
+    period_start = Column(Date, nullable=True)  # Period the counters below cover
+    period_spent = Column(Float, default=0.0, nullable=False)
+    alert_level = Column(Integer, default=0, nullable=False)  # 0 none, 1 warning, 2 exceeded
+    
     # Relationships
     user = relationship("User", back_populates="budgets")
     category = relationship("Category", back_populates="budgets")
     
     def __repr__(self):
         return f"<Budget(id={self.id}, name={self.name}, amount={self.amount})>"
+
+
+Index("ix_budgets_user_change_seq", Budget.user_id, Budget.change_seq)
@@ -1,13 +1,13 @@
 """
 Category Model
 """
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
-from app.db.base import Base, TimestampMixin
+from app.db.base import Base, TimestampMixin, SyncMixin
 
 
-class Category(Base, TimestampMixin):
+class Category(Base, TimestampMixin, SyncMixin):
     """Category database model"""
     __tablename__ = "categories"
     
@@ -18,6 +18,7 @@ class Category(Base, TimestampMixin):
     icon = Column(String(50), nullable=True)  # Emoji or icon name
     color = Column(String(20), nullable=True)  # Hex color
     is_default = Column(Boolean, default=False)  # System default category
+    keywords = Column(String(500), nullable=True)  # Merchant rules, comma-separated
     
     # Relationships
     user = relationship("User", back_populates="categories")
@@ -28,6 +29,9 @@ class Category(Base, TimestampMixin):
         return f"<Category(id={self.id}, name={self.name})>"
 
 
+Index("ix_categories_user_change_seq", Category.user_id, Category.change_seq)
+
+
 # Default categories to create for new users
 DEFAULT_CATEGORIES = [
     {"name": "Food", "icon": "🍽️", "color": "#FF6B6B"},
@@ -0,0 +1,31 @@
+"""
+Category Example Model
+"""
+from sqlalchemy import Column, Integer, String, LargeBinary, ForeignKey, Index
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base, TimestampMixin
+
+
+class CategoryExample(Base, TimestampMixin):
+    """A labelled expense description and its embedding, for nearest-neighbour categorization"""
+    __tablename__ = "category_examples"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    text = Column(String(100), nullable=False)  # Normalized description
+    category_id = Column(Integer, nullable=False)  # No FK: stale labels are skipped on lookup
+    vector = Column(LargeBinary, nullable=False)  # float32, L2-normalized
+
+    # Relationships
+    user = relationship("User", back_populates="category_examples")
+
+    def __repr__(self):
+        return f"<CategoryExample(user_id={self.user_id}, text={self.text}, category_id={self.category_id})>"
+
+
+# One example per distinct description; the latest label wins
+Index("ix_category_examples_user_text", CategoryExample.user_id, CategoryExample.text, unique=True)
+
+# Recency order, for loading the newest examples and trimming the oldest
+Index("ix_category_examples_user_updated", CategoryExample.user_id, CategoryExample.updated_at)
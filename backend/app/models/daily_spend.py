@@ -0,0 +1,29 @@
+"""
+Daily Spend Rollup Model
+"""
+from sqlalchemy import Column, Integer, Float, ForeignKey, Date
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+# Rollup rows use 0 instead of NULL for uncategorized spend so that
+# (user_id, day, category_id) can be a plain primary key for upserts
+UNCATEGORIZED = 0
+
+
+class DailySpend(Base):
+    """Pre-aggregated spend per user, day and category, maintained on expense writes"""
+    __tablename__ = "daily_spend"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    category_id = Column(Integer, primary_key=True, default=UNCATEGORIZED)  # No FK, see UNCATEGORIZED
+    
+    total = Column(Float, nullable=False, default=0.0)
+    expense_count = Column(Integer, nullable=False, default=0)
+    
+    # Relationships
+    user = relationship("User", back_populates="daily_spend")
+    
+    def __repr__(self):
+        return f"<DailySpend(user_id={self.user_id}, day={self.day}, total={self.total})>"
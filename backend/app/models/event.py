@@ -1,7 +1,7 @@
 """
 Event Model for Activity Tracking
 """
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -40,3 +40,6 @@ class Event(Base, TimestampMixin):
     
     def __repr__(self):
         return f"<Event(id={self.id}, type={self.event_type})>"
+
+
+Index("ix_events_user_created", Event.user_id, Event.created_at.desc())
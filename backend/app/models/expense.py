@@ -1,12 +1,12 @@
 """
 Expense Model
 """
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, Enum, Computed, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 
-from app.db.base import Base, TimestampMixin
+from app.db.base import Base, TimestampMixin, SyncMixin
 
 
 class ExpenseSource(str, enum.Enum):
@@ -14,14 +14,23 @@ class ExpenseSource(str, enum.Enum):
     MANUAL = "manual"
     VOICE = "voice"
     OCR = "ocr"
+    IMPORT = "import"
 
 
-class Expense(Base, TimestampMixin):
+# Lower-cased text searched by the expense list. On PostgreSQL it is served by
+# a pg_trgm GIN index created in migration d4a7c2e91f36 (not declared here so
+# create_all works without the extension).
+SEARCH_TEXT_SQL = (
+    "lower(coalesce(description, '') || ' ' || coalesce(notes, '') || ' ' || coalesce(tags, ''))"
+)
+
+
+class Expense(Base, TimestampMixin, SyncMixin):
     """Expense database model"""
     __tablename__ = "expenses"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True, index=True)
     
     amount = Column(Float, nullable=False)
@@ -31,6 +40,9 @@ class Expense(Base, TimestampMixin):
     tags = Column(String(500), nullable=True)  # Comma-separated tags
     source = Column(Enum(ExpenseSource), default=ExpenseSource.MANUAL, nullable=False)
     group_id = Column(Integer, ForeignKey("groups.id"), nullable=True)
+    search_text = Column(Text, Computed(SEARCH_TEXT_SQL, persisted=True))
+    fingerprint = Column(String(64), nullable=True)  # See expense_service.expense_fingerprint
+    idempotency_key = Column(String(64), nullable=True)  # Client-supplied, unique per user
     
     # Relationships
     user = relationship("User", back_populates="expenses")
@@ -40,3 +52,21 @@ class Expense(Base, TimestampMixin):
     
     def __repr__(self):
         return f"<Expense(id={self.id}, amount={self.amount}, user_id={self.user_id})>"
+
+
+# Nearly every query filters on user_id plus a date range. On PostgreSQL the
+# INCLUDE columns let sums and keyset pages run as index-only scans.
+Index(
+    "ix_expenses_user_date_id",
+    Expense.user_id, Expense.date.desc(), Expense.id.desc(),
+    postgresql_include=["amount", "category_id"]
+)
+Index(
+    "ix_expenses_user_category_date",
+    Expense.user_id, Expense.category_id, Expense.date,
+    postgresql_include=["amount"]
+)
+# Not unique: two identical coffees on the same day are legitimate
+Index("ix_expenses_user_fingerprint", Expense.user_id, Expense.fingerprint)
+Index("ix_expenses_user_idempotency_key", Expense.user_id, Expense.idempotency_key, unique=True)
+Index("ix_expenses_user_change_seq", Expense.user_id, Expense.change_seq)
@@ -1,13 +1,13 @@
 """
 Financial Goal Model
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Date
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Date, Index
 from sqlalchemy.orm import relationship
 from datetime import date
 
-from app.db.base import Base, TimestampMixin
+from app.db.base import Base, TimestampMixin, SyncMixin
 
-class Goal(Base, TimestampMixin):
+class Goal(Base, TimestampMixin, SyncMixin):
     """Financial Goal database model"""
     __tablename__ = "goals"
 
@@ -24,3 +24,6 @@ class Goal(Base, TimestampMixin):
     
     # Relationships
     user = relationship("User", back_populates="goals")
+
+
+Index("ix_goals_user_change_seq", Goal.user_id, Goal.change_seq)
@@ -0,0 +1,38 @@
+"""
+Import Job Model
+"""
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Enum
+from sqlalchemy.orm import relationship
+import enum
+
+from app.db.base import Base, TimestampMixin
+
+
+class ImportStatus(str, enum.Enum):
+    """Import job status enumeration"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ImportJob(Base, TimestampMixin):
+    """Progress of a background bank-statement import"""
+    __tablename__ = "import_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    
+    status = Column(Enum(ImportStatus), default=ImportStatus.PENDING, nullable=False)
+    profile = Column(String(50), nullable=False)
+    filename = Column(String(255), nullable=True)
+    rows_processed = Column(Integer, default=0, nullable=False)
+    rows_imported = Column(Integer, default=0, nullable=False)
+    rows_skipped = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+    
+    # Relationships
+    user = relationship("User", back_populates="import_jobs")
+    
+    def __repr__(self):
+        return f"<ImportJob(id={self.id}, status={self.status}, rows_imported={self.rows_imported})>"
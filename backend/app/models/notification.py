@@ -1,7 +1,7 @@
 """
 Notification Model
 """
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -34,3 +34,13 @@ class Notification(Base, TimestampMixin):
     
     def __repr__(self):
         return f"<Notification(id={self.id}, type={self.type})>"
+
+
+Index("ix_notifications_user_created", Notification.user_id, Notification.created_at.desc())
+# Partial index: unread counts only touch the (small) unread set
+Index(
+    "ix_notifications_user_unread",
+    Notification.user_id,
+    postgresql_where=Notification.is_read == False,  # noqa: E712
+    sqlite_where=Notification.is_read == False  # noqa: E712
+)
@@ -0,0 +1,32 @@
+"""
+Spending Statistics Model
+"""
+from sqlalchemy import Column, Integer, Float, ForeignKey
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+from app.models.daily_spend import UNCATEGORIZED
+
+
+class SpendingStats(Base):
+    """
+    Running per-user, per-category expense amount statistics for anomaly scoring.
+    Welford's count/mean/M2 cover the whole history; the exponentially weighted
+    mean and variance follow recent habits.
+    """
+    __tablename__ = "spending_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    category_id = Column(Integer, primary_key=True, default=UNCATEGORIZED)  # No FK, see UNCATEGORIZED
+
+    count = Column(Integer, nullable=False, default=0)
+    mean = Column(Float, nullable=False, default=0.0)
+    m2 = Column(Float, nullable=False, default=0.0)  # Sum of squared deviations
+    ewma = Column(Float, nullable=False, default=0.0)
+    ewm_var = Column(Float, nullable=False, default=0.0)
+
+    # Relationships
+    user = relationship("User", back_populates="spending_stats")
+
+    def __repr__(self):
+        return f"<SpendingStats(user_id={self.user_id}, category_id={self.category_id}, count={self.count})>"
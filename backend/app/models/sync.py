@@ -0,0 +1,152 @@
+"""
+Sync Models
+
+Every flush that writes a user's data bumps their change sequence. Synced
+rows are stamped with it and deleted ones leave a tombstone, so the /sync
+feed can return rows with `change_seq` above the client's watermark. The
+sequence also versions the ETags of per-user read endpoints.
+"""
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Index, event, inspect, insert, update, select
+from sqlalchemy.orm import relationship, Session
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, cast
+
+from app.db.base import Base
+from app.models.user import User
+from app.models.expense import Expense
+from app.models.category import Category
+from app.models.budget import Budget
+from app.models.goal import Goal
+from app.models.notification import Notification
+
+# Synced model -> entity name used in tombstones and the /sync response
+SYNCED_ENTITIES: Dict[type, str] = {
+    Category: "categories",
+    Budget: "budgets",
+    Goal: "goals",
+    Expense: "expenses",
+}
+
+# Server-maintained columns whose changes do not need to reach clients
+UNSYNCED_COLUMNS: Dict[type, set] = {
+    Budget: {"period_start", "period_spent", "alert_level"},
+}
+
+
+class SyncVersion(Base):
+    """Per-user change sequence; the row lock orders a user's concurrent writes"""
+    __tablename__ = "sync_versions"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    seq = Column(BigInteger, nullable=False, default=0)
+
+    # Relationships
+    user = relationship("User", back_populates="sync_version")
+
+    def __repr__(self):
+        return f"<SyncVersion(user_id={self.user_id}, seq={self.seq})>"
+
+
+class Tombstone(Base):
+    """Marker for a deleted synced row"""
+    __tablename__ = "tombstones"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    entity = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    user = relationship("User", back_populates="tombstones")
+
+    def __repr__(self):
+        return f"<Tombstone(entity={self.entity}, entity_id={self.entity_id})>"
+
+
+Index("ix_tombstones_user_change_seq", Tombstone.user_id, Tombstone.change_seq)
+
+
+def next_change_seq(session: Session, user_id: int) -> int:
+    """Bump and return the user's change sequence in the current transaction"""
+    dialect = session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+        stmt = dialect_insert(SyncVersion).values(user_id=user_id, seq=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SyncVersion.user_id],
+            set_={"seq": SyncVersion.seq + 1}
+        ).returning(SyncVersion.seq)
+        return int(session.execute(stmt).scalar_one())
+
+    result = session.execute(
+        update(SyncVersion)
+        .where(SyncVersion.user_id == user_id)
+        .values(seq=SyncVersion.seq + 1)
+    )
+    if not cast(Any, result).rowcount:
+        session.execute(insert(SyncVersion).values(user_id=user_id, seq=1))
+    return int(session.execute(
+        select(SyncVersion.seq).where(SyncVersion.user_id == user_id)
+    ).scalar_one())
+
+
+def _has_column_changes(obj: Any, skipped: Iterable[str] = ()) -> bool:
+    ignored = set(skipped) | {"change_seq", "updated_at"}
+    state = inspect(obj)
+    return any(
+        state.attrs[column.key].history.has_changes()
+        for column in state.mapper.column_attrs
+        if column.key not in ignored
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_changes(session: Session, flush_context: Any, instances: Any) -> None:
+    """Bump change sequences, stamp synced rows and record tombstones for deletes"""
+    changed: Dict[int, List[Any]] = {}
+    deleted: Dict[int, List[Any]] = {}
+    touched: set = set()  # Users whose other data changed (version bump only)
+
+    for obj in session.new:
+        if type(obj) in SYNCED_ENTITIES:
+            changed.setdefault(obj.user_id, []).append(obj)
+        elif isinstance(obj, Notification):
+            touched.add(obj.user_id)
+    for obj in session.dirty:
+        if type(obj) in SYNCED_ENTITIES:
+            if _has_column_changes(obj, UNSYNCED_COLUMNS.get(type(obj), ())):
+                changed.setdefault(obj.user_id, []).append(obj)
+            else:
+                touched.add(obj.user_id)  # e.g. budget spend counters
+        elif isinstance(obj, Notification) and _has_column_changes(obj):
+            touched.add(obj.user_id)
+        elif isinstance(obj, User) and _has_column_changes(obj):
+            touched.add(obj.id)
+
+    # Rows removed along with their user need no tombstones
+    deleted_users = {obj.id for obj in session.deleted if isinstance(obj, User)}
+    for obj in session.deleted:
+        if getattr(obj, "user_id", None) in deleted_users:
+            continue
+        if type(obj) in SYNCED_ENTITIES:
+            deleted.setdefault(obj.user_id, []).append(obj)
+        elif isinstance(obj, Notification):
+            touched.add(obj.user_id)
+
+    for user_id in changed.keys() | deleted.keys() | touched:
+        seq = next_change_seq(session, user_id)
+        for obj in changed.get(user_id, []):
+            obj.change_seq = seq
+        for obj in deleted.get(user_id, []):
+            session.add(Tombstone(
+                user_id=user_id,
+                entity=SYNCED_ENTITIES[type(obj)],
+                entity_id=obj.id,
+                change_seq=seq
+            ))
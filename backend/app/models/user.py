@@ -48,6 +48,12 @@ class User(Base, TimestampMixin):
     notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
     events = relationship("Event", back_populates="user", cascade="all, delete-orphan")
     goals = relationship("Goal", back_populates="user", cascade="all, delete-orphan")
+    daily_spend = relationship("DailySpend", back_populates="user", cascade="all, delete-orphan")
+    import_jobs = relationship("ImportJob", back_populates="user", cascade="all, delete-orphan")
+    sync_version = relationship("SyncVersion", back_populates="user", uselist=False, cascade="all, delete-orphan")
+    tombstones = relationship("Tombstone", back_populates="user", cascade="all, delete-orphan")
+    spending_stats = relationship("SpendingStats", back_populates="user", cascade="all, delete-orphan")
+    category_examples = relationship("CategoryExample", back_populates="user", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email})>"
@@ -41,8 +41,23 @@ class AnalyticsResponse(BaseModel):
     month_over_month: Optional[float] = None  # Percentage change
 
 
+class CategoryForecast(BaseModel):
+    """Predicted spend for one category"""
+    category_id: Optional[int]  # None for uncategorized spend
+    category_name: str
+    predicted_amount: float
+    lower_bound: float
+    upper_bound: float
+
+
 class ForecastResponse(BaseModel):
     """Spending forecast response"""
     predicted_amount: float
     confidence: float
     based_on_months: int
+    lower_bound: float = 0.0
+    upper_bound: float = 0.0
+    interval: float = 0.8  # Coverage of [lower_bound, upper_bound]
+    period_start: Optional[date] = None
+    period_end: Optional[date] = None
+    categories: List[CategoryForecast] = []
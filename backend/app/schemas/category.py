@@ -1,7 +1,7 @@
 """
 Category Schemas
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
@@ -11,6 +11,7 @@ class CategoryBase(BaseModel):
     name: str
     icon: Optional[str] = None
     color: Optional[str] = None
+    keywords: Optional[str] = Field(None, max_length=500)  # e.g. "blinkit, big bazaar"
 
 
 class CategoryCreate(CategoryBase):
@@ -23,6 +24,7 @@ class CategoryUpdate(BaseModel):
     name: Optional[str] = None
     icon: Optional[str] = None
     color: Optional[str] = None
+    keywords: Optional[str] = Field(None, max_length=500)
 
 
 class CategoryResponse(CategoryBase):
@@ -1,7 +1,7 @@
 """
 Expense Schemas
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -23,6 +23,26 @@ class ExpenseCreate(ExpenseBase):
     source: Optional[ExpenseSource] = ExpenseSource.MANUAL
 
 
+class ExpenseBulkCreate(BaseModel):
+    """Schema for creating many expenses in one request"""
+    items: List[ExpenseCreate] = Field(..., min_length=1, max_length=500)
+
+
+class ExpenseBulkItemResult(BaseModel):
+    """Outcome for one item of a bulk create, in request order"""
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None  # None when the item was created
+    duplicate_of: Optional[int] = None  # Existing expense this item matched
+
+
+class ExpenseBulkCreateResponse(BaseModel):
+    """Schema for bulk create response"""
+    created: int
+    failed: int
+    results: List[ExpenseBulkItemResult]
+
+
 class ExpenseUpdate(BaseModel):
     """Schema for updating an expense"""
     amount: Optional[float] = None
@@ -41,6 +61,9 @@ class ExpenseResponse(ExpenseBase):
     created_at: datetime
     updated_at: datetime
     category_name: Optional[str] = None
+    category_icon: Optional[str] = None
+    category_color: Optional[str] = None
+    duplicate_of: Optional[int] = None  # Set on create when a likely duplicate exists
     
     class Config:
         from_attributes = True
@@ -49,6 +72,8 @@ class ExpenseResponse(ExpenseBase):
 class ExpenseListResponse(BaseModel):
     """Schema for expense list response"""
     items: List[ExpenseResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # None when the count was skipped
+    total_is_estimate: bool = False  # True when total is a lower bound
+    page: Optional[int] = None  # None in cursor mode
     page_size: int
+    next_cursor: Optional[str] = None  # None on the last page
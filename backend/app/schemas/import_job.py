@@ -0,0 +1,38 @@
+"""
+Import Schemas
+"""
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+from app.models.import_job import ImportStatus
+
+
+class ImportProfile(BaseModel):
+    """Maps a bank's CSV columns onto expense fields"""
+    date_column: str
+    description_column: str
+    amount_column: Optional[str] = None  # Single signed/unsigned amount column
+    debit_column: Optional[str] = None  # Or separate debit/credit columns
+    credit_column: Optional[str] = None
+    notes_column: Optional[str] = None
+    date_format: Optional[str] = None  # strptime format; None tries common formats
+    delimiter: str = ","
+    debits_negative: bool = False  # amount_column only: spend is negative, credits positive
+
+
+class ImportJobResponse(BaseModel):
+    """Schema for import job status"""
+    id: int
+    status: ImportStatus
+    profile: str
+    filename: Optional[str] = None
+    rows_processed: int
+    rows_imported: int
+    rows_skipped: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
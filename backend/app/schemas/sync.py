@@ -0,0 +1,28 @@
+"""
+Sync Schemas
+"""
+from pydantic import BaseModel
+from typing import Optional, List
+
+from app.schemas.expense import ExpenseResponse
+from app.schemas.category import CategoryResponse
+from app.schemas.budget import BudgetResponse
+from app.schemas.goal import GoalResponse
+
+
+class SyncTombstone(BaseModel):
+    """A row deleted since the client's watermark"""
+    entity: str
+    id: int
+
+
+class SyncResponse(BaseModel):
+    """One page of the delta sync feed"""
+    categories: List[CategoryResponse] = []
+    budgets: List[BudgetResponse] = []  # Definitions only; spend comes from /budgets
+    goals: List[GoalResponse] = []
+    expenses: List[ExpenseResponse] = []
+    deleted: List[SyncTombstone] = []
+    watermark: int  # Pass as `since` on the next sync once next_cursor is None
+    next_cursor: Optional[str] = None  # None on the last page
+    full_resync: bool = False  # Client watermark was unknown; drop local data first
@@ -1,19 +1,26 @@
-from typing import Optional, List, Any, Sequence, Dict
+from typing import Optional, List, Any, Sequence, Dict, Tuple
+import asyncio
 import json
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from openai import AsyncOpenAI
-from huggingface_hub import InferenceClient
 
 from app.core.config import settings
 from app.models.category import Category
 from app.services.analytics_service import AnalyticsService
+from app.services.category_memo import SAVED_CONFIDENCE, category_memo, normalize_description
+from app.services.embedding_categorizer import EmbeddingCategorizer, MIN_CONFIDENCE as KNN_MIN_CONFIDENCE
 from app.services.event_service import EventService
+from app.services.hf_inference import hf_inference
+from app.services.keyword_matcher import category_matcher
 from app.models.event import EventType
 from typing import cast, TypedDict, Union
 
+# Descriptions per remote categorization prompt in batch mode
+REMOTE_BATCH_SIZE = 50
+
 
 class AIService:
     """
@@ -36,10 +43,8 @@ class AIService:
                 base_url="https://api.longcat.chat/openai/v1" 
             )
 
-        # Configure Hugging Face (Secondary/Fallback)
-        self.hf_client = None
-        if settings.HF_API_KEY:
-            self.hf_client = InferenceClient(token=settings.HF_API_KEY)
+        # Configure Hugging Face (Secondary/Fallback); shared, runs off the event loop
+        self.hf_client = hf_inference
 
     async def suggest_category(
         self,
@@ -49,7 +54,7 @@ class AIService:
     ) -> dict:
         """
         AI-powered expense categorization.
-        Routing: Rule-based -> Hugging Face Zero-shot -> LongCat
+        Routing: Saved memo -> Rule-based -> Model memo -> Nearest examples -> Hugging Face Zero-shot -> LongCat
         """
         try:
             # Get user's category names
@@ -59,9 +64,28 @@ class AIService:
             categories = result.scalars().all()
             category_names: List[str] = [str(c.name) for c in categories]
             valid_names = [str(name) for name in category_names]
+            names_by_id = {c.id: str(c.name) for c in categories}
+            
+            # Saved categories outrank the rules; remembered model answers don't
+            remembered = await category_memo.get(user_id, description)
+            memo_answer = None
+            if remembered and remembered["category_id"] in names_by_id:
+                name = names_by_id[remembered["category_id"]]
+                memo_answer = {
+                    "suggested_category": name,
+                    "confidence": remembered["confidence"],
+                    "source": "memo",
+                    "alternatives": [c for c in valid_names if c != name][:2]
+                }
+            
+            # 0. What this user saved for the same description before
+            if memo_answer and memo_answer["confidence"] >= SAVED_CONFIDENCE:
+                return memo_answer
             
             # 1. Rule-based (Fastest)
-            rule_suggestion = self._rule_based_categorization(description, valid_names)
+            rule_suggestion = self._rule_based_categorization(
+                description, valid_names, {str(c.name): cast(Any, c).keywords for c in categories}
+            )
             if rule_suggestion:
                 return {
                     "suggested_category": rule_suggestion,
@@ -69,16 +93,31 @@ class AIService:
                     "source": "rule-based",
                     "alternatives": []
                 }
+            
+            # 1a. What a model answered for the same description before
+            if memo_answer:
+                return memo_answer
 
             suggested_category = None
             confidence = 0.0
             source = "none"
 
+            # 1b. Nearest labelled examples (local, sub-millisecond)
+            [neighbours] = await EmbeddingCategorizer(self.db).suggest(user_id, [description], names_by_id)
+            if neighbours and neighbours[1] >= KNN_MIN_CONFIDENCE:
+                name = names_by_id[neighbours[0]]
+                return {
+                    "suggested_category": name,
+                    "confidence": neighbours[1],
+                    "source": "embedding-knn",
+                    "alternatives": [c for c in valid_names if c != name][:2]
+                }
+
             # 2. Hugging Face Zero-shot (Secondary)
             if not suggested_category and self.hf_client and valid_names:
                 try:
                     # Corrected parameter name for InferenceClient: candidate_labels
-                    output = self.hf_client.zero_shot_classification(
+                    output = await self.hf_client.zero_shot_classification(
                         text=description,
                         candidate_labels=valid_names,
                         model="facebook/bart-large-mnli"
@@ -130,6 +169,11 @@ class AIService:
                 except Exception as e:
                     print(f"LongCat Categorization failed: {e}")
 
+            # Remember model answers so repeats skip the models
+            ids_by_name = {name: category_id for category_id, name in names_by_id.items()}
+            if suggested_category in ids_by_name:
+                await category_memo.learn(user_id, description, ids_by_name[suggested_category], confidence)
+            
             # Default fallback if all else fails
             if not suggested_category and valid_names:
                  suggested_category = valid_names[0]
@@ -156,25 +200,150 @@ class AIService:
                 "fallback": True
             }
 
-    def _rule_based_categorization(self, description: str, categories: Sequence[str]) -> Optional[str]:
-        """Rule-based fallback for categorization"""
-        description_lower = description.lower()
+    async def suggest_categories(self, user_id: int, items: Sequence[Tuple[str, float]]) -> List[dict]:
+        """
+        Categorize many (description, amount) pairs at once, e.g. for imports
+        and offline sync.
+        
+        Categories are loaded once and descriptions that normalize alike are
+        resolved once. The local tiers (memo, keyword rules, nearest examples)
+        run over the whole set; only what they leave unresolved goes to
+        LongCat, REMOTE_BATCH_SIZE descriptions per prompt. Results are in
+        input order and a single event is logged.
+        """
+        result = await self.db.execute(
+            select(Category).where(Category.user_id == user_id)
+        )
+        categories = result.scalars().all()
+        names_by_id = {c.id: str(c.name) for c in categories}
+        ids_by_name = {name: category_id for category_id, name in names_by_id.items()}
+        valid_names = list(ids_by_name)
+        
+        unique: Dict[str, Tuple[str, float]] = {}
+        keys = []
+        for description, amount in items:
+            key = normalize_description(description) or description.strip().lower()
+            unique.setdefault(key, (description, amount))
+            keys.append(key)
+        
+        # key -> (category name, confidence, source)
+        resolved: Dict[str, Tuple[str, float, str]] = {}
+        guesses: Dict[str, Tuple[str, float, str]] = {}
+        pending = list(unique)
+        
+        # 1. Memo; categories the user saved outrank the rules
+        remembered = dict(zip(pending, await asyncio.gather(
+            *(category_memo.get(user_id, unique[key][0]) for key in pending)
+        )))
+        for key, memo in remembered.items():
+            if memo and memo["category_id"] in names_by_id and memo["confidence"] >= SAVED_CONFIDENCE:
+                resolved[key] = (names_by_id[memo["category_id"]], memo["confidence"], "memo")
+        pending = [key for key in pending if key not in resolved]
+        
+        # 2. Keyword rules, one compiled matcher for the whole batch; then
+        # remembered model answers
+        matcher = category_matcher(tuple((str(c.name), cast(Any, c).keywords or "") for c in categories))
+        for key, name in zip(pending, matcher.match_many([unique[key][0] for key in pending])):
+            memo = remembered[key]
+            if name:
+                resolved[key] = (name, 0.95, "rule-based")
+            elif memo and memo["category_id"] in names_by_id:
+                resolved[key] = (names_by_id[memo["category_id"]], memo["confidence"], "memo")
+        pending = [key for key in pending if key not in resolved]
+        
+        # 3. Nearest labelled examples, one matrix product for the whole batch
+        if pending:
+            neighbours = await EmbeddingCategorizer(self.db).suggest(
+                user_id, [unique[key][0] for key in pending], names_by_id
+            )
+            for key, match in zip(pending, neighbours):
+                if match is None:
+                    continue
+                answer = (names_by_id[match[0]], match[1], "embedding-knn")
+                if match[1] >= KNN_MIN_CONFIDENCE:
+                    resolved[key] = answer
+                else:
+                    guesses[key] = answer  # Used if the remote tier can't answer
+        pending = [key for key in pending if key not in resolved]
+        remote_count = len(pending) if self.longcat_client and valid_names else 0
         
-        keyword_map = {
-            "food": ["food", "restaurant", "cafe", "grocery", "lunch", "dinner", "swiggy", "zomato", "burger", "pizza"],
-            "transport": ["uber", "taxi", "fuel", "bus", "train", "petrol", "ola", "rapido", "pathao", "indriver"],
-            "shopping": ["amazon", "store", "mall", "buy", "purchase", "flipkart", "myntra", "daraz"],
-            "bills": ["electricity", "water", "internet", "phone", "bill", "recharge", "wifi", "broadband"],
-            "entertainment": ["movie", "netflix", "spotify", "game", "pvr", "cinema"],
-            "health": ["doctor", "medicine", "pharmacy", "hospital", "pharmeasy"],
-        }
+        # 4. LongCat for the remainder, in batched prompts
+        if remote_count:
+            for offset in range(0, len(pending), REMOTE_BATCH_SIZE):
+                chunk = pending[offset:offset + REMOTE_BATCH_SIZE]
+                answers = await self._categorize_remote([unique[key] for key in chunk], valid_names)
+                for key, name in zip(chunk, answers):
+                    if name:
+                        resolved[key] = (name, 0.95, "longcat")
+                        await category_memo.learn(user_id, unique[key][0], ids_by_name[name], 0.95)
         
-        for category, keywords in keyword_map.items():
-            if any(kw in description_lower for kw in keywords):
-                for user_cat in categories:
-                    if category.lower() in str(user_cat).lower():
-                        return str(user_cat)
-        return None
+        await self.event_service.log_event(
+            user_id=user_id,
+            event_type=EventType.AI_FEATURE_USED,
+            description=f"Batch category suggestion ({len(keys)} descriptions)",
+            event_metadata={"items": len(keys), "unique": len(unique), "remote": remote_count}
+        )
+        
+        results = []
+        for (description, _), key in zip(items, keys):
+            fallback = (valid_names[0], 0.0, "fallback-default") if valid_names else (None, 0.0, "none")
+            name, confidence, source = resolved.get(key) or guesses.get(key) or fallback
+            results.append({
+                "description": description,
+                "suggested_category": name,
+                "category_id": ids_by_name.get(name) if name else None,
+                "confidence": confidence,
+                "source": source,
+            })
+        return results
+    
+    async def _categorize_remote(self, items: Sequence[Tuple[str, float]], valid_names: Sequence[str]) -> List[Optional[str]]:
+        """Ask LongCat for a category per item in one prompt; None where it gave no valid answer"""
+        if not self.longcat_client:
+            return [None] * len(items)
+        lines = "\n".join(
+            f'{number}. "{description}" ({amount})'
+            for number, (description, amount) in enumerate(items, start=1)
+        )
+        prompt = f"""
+        Role: Financial Category Expert
+        Task: Categorize each numbered expense into EXACTLY one of the provided categories.
+        
+        Expenses (description and amount):
+        {lines}
+        
+        User's Categories: {', '.join(valid_names)}
+        
+        Return ONLY a JSON object mapping each expense number to a category name, e.g. {{"1": "Food"}}.
+        """
+        try:
+            response = await self.longcat_client.chat.completions.create(
+                model="LongCat-Flash-Chat",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.1,
+                response_format={"type": "json_object"}
+            )
+            answers = json.loads(response.choices[0].message.content or "{}")
+        except Exception as e:
+            print(f"LongCat batch categorization failed: {e}")
+            return [None] * len(items)
+        
+        by_lower = {name.lower(): name for name in valid_names}
+        return [
+            by_lower.get(str(answers.get(str(number), "")).strip().lower())
+            for number in range(1, len(items) + 1)
+        ]
+
+    def _rule_based_categorization(
+        self,
+        description: str,
+        categories: Sequence[str],
+        merchant_rules: Optional[Dict[str, Optional[str]]] = None
+    ) -> Optional[str]:
+        """Keyword match against the user's categories and their merchant rules"""
+        rules = merchant_rules or {}
+        matcher = category_matcher(tuple((name, rules.get(name) or "") for name in categories))
+        return matcher.match(description)
 
     async def generate_insights(self, user_id: int) -> dict:
         """
@@ -252,7 +421,7 @@ class AIService:
                         "The user should consider checking their top expenses."
                     )
                     
-                    output = self.hf_client.summarization(
+                    output = await self.hf_client.summarization(
                         input_text,
                         model="google/pegasus-xsum"
                     )
@@ -435,7 +604,7 @@ Style: Authoritative on data, friendly in tone."""
         if self.hf_client:
             try:
                 # feature_extraction returns the embeddings
-                output = self.hf_client.feature_extraction(
+                output = await self.hf_client.feature_extraction(
                     text, 
                     model="sentence-transformers/all-MiniLM-L6-v2"
                 )
@@ -0,0 +1,27 @@
+"""
+Analytics Result Cache
+"""
+from datetime import datetime
+from typing import Any
+
+from app.core.config import settings
+from app.services.two_level_cache import TwoLevelCache
+
+
+def analytics_cache_key(user_id: int, generation: int, name: str, *args: Any) -> str:
+    """
+    Cache key for one analytics result. `generation` is the user's change
+    sequence; the date covers "this month"-style defaults.
+    """
+    params = ":".join(str(arg) for arg in args)
+    return f"analytics:{user_id}:{generation}:{datetime.utcnow().date()}:{name}:{params}"
+
+
+# Callers put the user's change sequence in the key, so a write to their data
+# moves readers to fresh keys and stale entries simply age out
+analytics_cache = TwoLevelCache(
+    name="Analytics",
+    max_entries=settings.ANALYTICS_CACHE_L1_MAX_ENTRIES,
+    l1_ttl=settings.ANALYTICS_CACHE_L1_TTL,
+    ttl=settings.ANALYTICS_CACHE_TTL,
+)
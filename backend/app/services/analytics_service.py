@@ -1,13 +1,18 @@
 """
 Analytics Service
 """
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import date, datetime, timedelta
+from dateutil.relativedelta import relativedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, cast, DateTime
 
-from app.models.expense import Expense
 from app.models.category import Category
+from app.models.daily_spend import DailySpend
+from app.models.sync import SyncVersion
+from app.services.analytics_cache import analytics_cache, analytics_cache_key
+from app.services.forecast_service import ForecastService
+from app.services.rollup_service import RollupService
 from app.schemas.analytics import (
     SpendingSummary,
     CategoryBreakdown,
@@ -17,11 +22,38 @@ from app.schemas.analytics import (
 )
 
 
+# Trend bucket sizes supported by get_trends
+BUCKET_STEPS = {
+    "week": relativedelta(weeks=1),
+    "month": relativedelta(months=1),
+    "quarter": relativedelta(months=3),
+}
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    """First day of the week (Monday), month or quarter containing `day`"""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "quarter":
+        return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    return day.replace(day=1)
+
+
+def bucket_label(start: date, bucket: str) -> str:
+    """Human readable label for a trend bucket"""
+    if bucket == "week":
+        return f"Week of {start.strftime('%d %b %Y')}"
+    if bucket == "quarter":
+        return f"Q{(start.month - 1) // 3 + 1} {start.year}"
+    return start.strftime("%B %Y")
+
+
 class AnalyticsService:
     """Analytics and insights service"""
     
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.rollup_service = RollupService(db)
     
     async def get_summary(
         self,
@@ -30,7 +62,34 @@ class AnalyticsService:
         start_date: Optional[date] = None,
         end_date: Optional[date] = None
     ) -> AnalyticsResponse:
-        """Get comprehensive analytics summary"""
+        """Get comprehensive analytics summary (cached until the user's data changes)"""
+        key = await self._cache_key(user_id, "summary", period, start_date, end_date)
+        cached = await analytics_cache.get(key)
+        if cached is not None:
+            return AnalyticsResponse.model_validate(cached)
+        
+        analytics = await self._compute_summary(user_id, period, start_date, end_date)
+        await analytics_cache.set(key, analytics.model_dump(mode="json"))
+        return analytics
+    
+    async def _cache_key(self, user_id: int, name: str, *args: Any) -> str:
+        """
+        Cache key for one analytics result. The user's change sequence is bumped
+        by every expense, category and budget write, so it acts as the
+        generation counter.
+        """
+        result = await self.db.execute(
+            select(SyncVersion.seq).where(SyncVersion.user_id == user_id)
+        )
+        return analytics_cache_key(user_id, int(result.scalar() or 0), name, *args)
+    
+    async def _compute_summary(
+        self,
+        user_id: int,
+        period: str,
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> AnalyticsResponse:
         now = datetime.utcnow()
         
         # Determine date range
@@ -45,42 +104,26 @@ class AnalyticsService:
             else:  # monthly
                 start_date = end_date.replace(day=1)
         
-        start_datetime = datetime.combine(start_date, datetime.min.time())
-        end_datetime = datetime.combine(end_date, datetime.max.time())
-        
-        # Get total and average
-        result = await self.db.execute(
-            select(
-                func.sum(Expense.amount).label("total"),
-                func.avg(Expense.amount).label("average"),
-                func.count(Expense.id).label("count_val")
-            ).where(
-                and_(
-                    Expense.user_id == user_id,
-                    Expense.date >= start_datetime,
-                    Expense.date <= end_datetime
-                )
-            )
-        )
-        row = result.one()
+        # Get total and average from the daily rollup
+        total, count = await self.rollup_service.get_totals(user_id, start_date, end_date)
         
         summary = SpendingSummary(
             period=period,
-            total=float(row[0]) if row[0] else 0.0,
-            average=float(row[1]) if row[1] else 0.0,
-            count=int(row[2]) if row[2] else 0,
+            total=total,
+            average=total / count if count else 0.0,
+            count=count,
             start_date=start_date,
             end_date=end_date
         )
         
         # Get category breakdown
         category_breakdown = await self._get_category_breakdown(
-            user_id, start_datetime, end_datetime, summary.total
+            user_id, start_date, end_date, summary.total
         )
         
         # Get daily trend
         daily_trend = await self._get_daily_trend(
-            user_id, start_datetime, end_datetime
+            user_id, start_date, end_date
         )
         
         # Calculate month-over-month change
@@ -96,64 +139,64 @@ class AnalyticsService:
     async def _get_category_breakdown(
         self,
         user_id: int,
-        start_datetime: datetime,
-        end_datetime: datetime,
+        start_date: date,
+        end_date: date,
         total: float
     ) -> List[CategoryBreakdown]:
         """Get spending breakdown by category"""
         result = await self.db.execute(
             select(
-                Expense.category_id,
-                func.sum(Expense.amount).label("total"),
-                func.count(Expense.id).label("count_val")
-            ).where(
+                Category.id,
+                Category.name,
+                Category.icon,
+                Category.color,
+                func.sum(DailySpend.total).label("total"),
+                func.sum(DailySpend.expense_count).label("count_val")
+            )
+            .join(Category, DailySpend.category_id == Category.id)
+            .where(
                 and_(
-                    Expense.user_id == user_id,
-                    Expense.date >= start_datetime,
-                    Expense.date <= end_datetime
+                    DailySpend.user_id == user_id,
+                    DailySpend.day >= start_date,
+                    DailySpend.day <= end_date
                 )
-            ).group_by(Expense.category_id)
+            )
+            .group_by(Category.id, Category.name, Category.icon, Category.color)
         )
         
         breakdowns = []
         for row in result:
-            if row.category_id:
-                cat_result = await self.db.execute(
-                    select(Category).where(Category.id == row.category_id)
-                )
-                category = cat_result.scalar_one_or_none()
-                if category:
-                    breakdowns.append(CategoryBreakdown(
-                        category_id=int(category.id), # type: ignore
-                        category_name=str(category.name),
-                        category_icon=str(category.icon) if getattr(category, 'icon') else None,
-                        category_color=str(category.color) if getattr(category, 'color') else None,
-                        total=float(row[1]),
-                        percentage=(float(row[1]) / total * 100) if total > 0 else 0,
-                        count=int(row[2])
-                    ))
+            breakdowns.append(CategoryBreakdown(
+                category_id=int(row.id),
+                category_name=str(row.name),
+                category_icon=str(row.icon) if row.icon else None,
+                category_color=str(row.color) if row.color else None,
+                total=float(row.total),
+                percentage=(float(row.total) / total * 100) if total > 0 else 0,
+                count=int(row.count_val)
+            ))
         
         return sorted(breakdowns, key=lambda x: x.total, reverse=True)
     
     async def _get_daily_trend(
         self,
         user_id: int,
-        start_datetime: datetime,
-        end_datetime: datetime
+        start_date: date,
+        end_date: date
     ) -> List[TrendData]:
         """Get daily spending trend"""
         result = await self.db.execute(
             select(
-                func.date(Expense.date).label("day"),
-                func.sum(Expense.amount).label("amount")
+                DailySpend.day,
+                func.sum(DailySpend.total).label("amount")
             ).where(
                 and_(
-                    Expense.user_id == user_id,
-                    Expense.date >= start_datetime,
-                    Expense.date <= end_datetime
+                    DailySpend.user_id == user_id,
+                    DailySpend.day >= start_date,
+                    DailySpend.day <= end_date
                 )
-            ).group_by(func.date(Expense.date))
-            .order_by(func.date(Expense.date))
+            ).group_by(DailySpend.day)
+            .order_by(DailySpend.day)
         )
         
         return [
@@ -163,106 +206,103 @@ class AnalyticsService:
     
     async def _calculate_mom_change(self, user_id: int) -> Optional[float]:
         """Calculate month-over-month spending change"""
-        now = datetime.utcnow()
+        today = datetime.utcnow().date()
         
         # Current month
-        current_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        current_result = await self.db.execute(
-            select(func.sum(Expense.amount)).where(
-                and_(
-                    Expense.user_id == user_id,
-                    Expense.date >= current_start
-                )
-            )
-        )
-        current_total = current_result.scalar() or 0
+        current_start = today.replace(day=1)
+        current_total, _ = await self.rollup_service.get_totals(user_id, current_start)
         
         # Previous month
         prev_end = current_start - timedelta(days=1)
         prev_start = prev_end.replace(day=1)
-        prev_result = await self.db.execute(
-            select(func.sum(Expense.amount)).where(
-                and_(
-                    Expense.user_id == user_id,
-                    Expense.date >= prev_start,
-                    Expense.date <= prev_end
-                )
-            )
-        )
-        prev_total = prev_result.scalar() or 0
+        prev_total, _ = await self.rollup_service.get_totals(user_id, prev_start, prev_end)
         
         if prev_total > 0:
             return ((current_total - prev_total) / prev_total) * 100
         return None
     
     async def get_forecast(self, user_id: int) -> ForecastResponse:
-        """Get spending forecast based on historical data"""
-        # Get last 3 months average
-        now = datetime.utcnow()
-        three_months_ago = now - timedelta(days=90)
+        """Get next month's spending forecast (precomputed nightly, see ForecastService)"""
+        key = await self._cache_key(user_id, "forecast")
+        cached = await analytics_cache.get(key)
+        if cached is not None:
+            return ForecastResponse.model_validate(cached)
         
-        result = await self.db.execute(
-            select(func.avg(Expense.amount).label("avg")).where(
-                and_(
-                    Expense.user_id == user_id,
-                    Expense.date >= three_months_ago
-                )
-            )
-        )
-        avg_expense = result.scalar() or 0
+        forecast = await self._compute_forecast(user_id)
+        await analytics_cache.set(key, forecast.model_dump(mode="json"))
+        return forecast
+    
+    async def _compute_forecast(self, user_id: int) -> ForecastResponse:
+        return await ForecastService(self.db).forecast_user(user_id)
+    
+    async def get_trends(
+        self,
+        user_id: int,
+        months: int = 6,
+        bucket: str = "month"
+    ) -> List[dict]:
+        """
+        Get spending trends over the last `months` calendar months.
         
-        # Estimate monthly based on average daily spending
-        result = await self.db.execute(
-            select(func.count(Expense.id)).where(
-                and_(
-                    Expense.user_id == user_id,
-                    Expense.date >= three_months_ago
-                )
-            )
-        )
-        expense_count = result.scalar() or 0
+        One grouped query over the daily rollup, bucketed by week, month or
+        quarter; buckets with no spending are filled with zero. Cached until
+        the user's data changes.
+        """
+        key = await self._cache_key(user_id, "trends", months, bucket)
+        cached = await analytics_cache.get(key)
+        if cached is not None:
+            return cached
         
-        # Calculate predicted monthly
-        days_in_period = 90
-        daily_avg = (avg_expense * expense_count) / days_in_period if expense_count > 0 else 0
-        predicted_monthly = daily_avg * 30
+        trends = await self._compute_trends(user_id, months, bucket)
+        await analytics_cache.set(key, trends)
+        return trends
+    
+    async def _compute_trends(self, user_id: int, months: int, bucket: str) -> List[dict]:
+        today = datetime.utcnow().date()
+        range_start = bucket_start(
+            today.replace(day=1) - relativedelta(months=months - 1), bucket
+        )
         
-        return ForecastResponse(
-            predicted_amount=predicted_monthly,
-            confidence=0.7 if expense_count > 30 else 0.5,
-            based_on_months=3
+        filters = and_(
+            DailySpend.user_id == user_id,
+            DailySpend.day >= range_start,
+            DailySpend.day <= today
         )
-    
-    async def get_trends(self, user_id: int, months: int = 6) -> List[dict]:
-        """Get monthly spending trends"""
-        now = datetime.utcnow()
-        trends = []
+        totals: Dict[date, float] = {}
         
-        for i in range(months):
-            month_start = (now - timedelta(days=30 * i)).replace(
-                day=1, hour=0, minute=0, second=0, microsecond=0
+        if self.db.get_bind().dialect.name == "postgresql":
+            # Truncate as a plain timestamp so the session time zone can't shift days
+            period = func.date_trunc(bucket, cast(DailySpend.day, DateTime)).label("period")
+            result = await self.db.execute(
+                select(period, func.sum(DailySpend.total))
+                .where(filters)
+                .group_by(period)
             )
-            if i > 0:
-                month_end = (now - timedelta(days=30 * (i - 1))).replace(
-                    day=1, hour=0, minute=0, second=0, microsecond=0
-                ) - timedelta(days=1)
-            else:
-                month_end = now
-            
+            for period_start, total in result:
+                totals[period_start.date()] = float(total or 0.0)
+        else:
+            # No date_trunc (e.g. SQLite): group by day and fold into buckets here
             result = await self.db.execute(
-                select(func.sum(Expense.amount)).where(
-                    and_(
-                        Expense.user_id == user_id,
-                        Expense.date >= month_start,
-                        Expense.date <= month_end
-                    )
-                )
+                select(DailySpend.day, func.sum(DailySpend.total))
+                .where(filters)
+                .group_by(DailySpend.day)
             )
-            total = result.scalar() or 0
-            
-            trends.append({
-                "month": month_start.strftime("%B %Y"),
-                "total": total
-            })
+            for day, total in result:
+                key = bucket_start(day, bucket)
+                totals[key] = totals.get(key, 0.0) + float(total or 0.0)
+        
+        trends = []
+        period_start = range_start
+        while period_start <= today:
+            label = bucket_label(period_start, bucket)
+            point = {
+                "period": label,
+                "start_date": period_start.isoformat(),
+                "total": totals.get(period_start, 0.0)
+            }
+            if bucket == "month":
+                point["month"] = label  # Kept for existing clients
+            trends.append(point)
+            period_start += BUCKET_STEPS[bucket]
         
-        return list(reversed(trends))
+        return trends
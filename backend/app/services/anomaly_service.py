@@ -0,0 +1,220 @@
+"""
+Spending Anomaly Detection Service
+"""
+import math
+from typing import Optional, Dict, List, Tuple, Any, cast
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert
+
+from app.models.category import Category
+from app.models.daily_spend import UNCATEGORIZED
+from app.models.expense import Expense
+from app.models.notification import NotificationType
+from app.models.spending_stats import SpendingStats
+from app.services.notification_service import NotificationService
+
+# Weight of the newest amount in the exponentially weighted mean/variance
+ANOMALY_EWMA_ALPHA = 0.2
+
+# Standard deviations above both the lifetime and the recent mean that flag an expense
+ANOMALY_THRESHOLD = 3.0
+
+# Expenses seen in a category before its amounts are scored
+ANOMALY_MIN_OBSERVATIONS = 8
+
+# Spread floor as a fraction of the mean, so near-constant amounts (rent,
+# subscriptions) are not flagged for small changes
+ANOMALY_MIN_STD_RATIO = 0.1
+
+# Expense rows read per round trip while rebuilding
+REBUILD_BATCH_SIZE = 10000
+
+STATS_COLUMNS = ("user_id", "category_id", "count", "mean", "m2", "ewma", "ewm_var")
+
+
+def _z_score(amount: float, mean: float, variance: float) -> float:
+    std = max(math.sqrt(max(variance, 0.0)), ANOMALY_MIN_STD_RATIO * abs(mean))
+    if std == 0:
+        return 0.0
+    return (amount - mean) / std
+
+
+def anomaly_score(stats: SpendingStats, amount: float) -> float:
+    """
+    How unusual an amount is for the category before it is recorded.
+
+    The smaller of the z-scores against the lifetime (Welford) and the recent
+    (EWMA) statistics, so an expense has to stand out from both; 0 until the
+    category has ANOMALY_MIN_OBSERVATIONS expenses.
+    """
+    state = cast(Any, stats)
+    if state.count < ANOMALY_MIN_OBSERVATIONS:
+        return 0.0
+    lifetime = _z_score(amount, state.mean, state.m2 / (state.count - 1))
+    recent = _z_score(amount, state.ewma, state.ewm_var)
+    return min(lifetime, recent)
+
+
+def update_stats(stats: SpendingStats, amount: float) -> None:
+    """Fold one amount into the running statistics in O(1)"""
+    state = cast(Any, stats)
+    state.count += 1
+    delta = amount - state.mean
+    state.mean += delta / state.count
+    state.m2 += delta * (amount - state.mean)
+
+    if state.count == 1:
+        state.ewma, state.ewm_var = amount, 0.0
+        return
+    diff = amount - state.ewma
+    increment = ANOMALY_EWMA_ALPHA * diff
+    state.ewma += increment
+    state.ewm_var = (1 - ANOMALY_EWMA_ALPHA) * (state.ewm_var + diff * increment)
+
+
+def merge_stats(stats: SpendingStats, other: SpendingStats) -> None:
+    """
+    Fold another category's statistics into these. Welford's moments combine
+    exactly; the recent mean and variance are mixed by expense count.
+    """
+    state, extra = cast(Any, stats), cast(Any, other)
+    count = state.count + extra.count
+    if not extra.count:
+        return
+    if not state.count:
+        state.count, state.mean, state.m2 = extra.count, extra.mean, extra.m2
+        state.ewma, state.ewm_var = extra.ewma, extra.ewm_var
+        return
+
+    delta = extra.mean - state.mean
+    state.m2 += extra.m2 + delta * delta * state.count * extra.count / count
+    state.mean += delta * extra.count / count
+
+    ewma = (state.count * state.ewma + extra.count * extra.ewma) / count
+    state.ewm_var = (
+        state.count * (state.ewm_var + (state.ewma - ewma) ** 2)
+        + extra.count * (extra.ewm_var + (extra.ewma - ewma) ** 2)
+    ) / count
+    state.ewma = ewma
+    state.count = count
+
+
+def _new_stats(user_id: int, category_id: int) -> SpendingStats:
+    return SpendingStats(user_id=user_id, category_id=category_id, count=0, mean=0.0, m2=0.0, ewma=0.0, ewm_var=0.0)
+
+
+class AnomalyService:
+    """Scores expenses against per-category running statistics"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def observe_expense(self, expense: Expense) -> float:
+        """
+        Score a new expense, fold it into its category's statistics and stage
+        an UNUSUAL_SPENDING notification when the score crosses
+        ANOMALY_THRESHOLD. One primary-key read; runs in the caller's
+        transaction after the expense is flushed, when the user's change
+        sequence row lock already serializes their writes.
+        """
+        user_id = cast(Any, expense.user_id)
+        category_id = cast(Any, expense.category_id) or UNCATEGORIZED
+        amount = float(cast(Any, expense.amount))
+
+        stats = await self.db.get(SpendingStats, (user_id, category_id))
+        if stats is None:
+            stats = _new_stats(user_id, category_id)
+            self.db.add(stats)
+
+        score = anomaly_score(stats, amount)
+        usual = float(cast(Any, stats).ewma)
+        update_stats(stats, amount)
+        if score >= ANOMALY_THRESHOLD:
+            await self._notify(expense, category_id, usual)
+        return score
+
+    async def observe_rows(self, user_id: int, rows: List[dict]) -> None:
+        """Fold bulk-inserted expense rows into the statistics, oldest first, without notifying"""
+        if not rows:
+            return
+        category_ids = {row.get("category_id") or UNCATEGORIZED for row in rows}
+        result = await self.db.execute(
+            select(SpendingStats).where(
+                SpendingStats.user_id == user_id,
+                SpendingStats.category_id.in_(category_ids)
+            )
+        )
+        stats_by_category: Dict[int, SpendingStats] = {
+            cast(Any, stats).category_id: stats for stats in result.scalars().all()
+        }
+        for row in sorted(rows, key=lambda row: row["date"]):
+            category_id = row.get("category_id") or UNCATEGORIZED
+            stats = stats_by_category.get(category_id)
+            if stats is None:
+                stats = stats_by_category[category_id] = _new_stats(user_id, category_id)
+                self.db.add(stats)
+            update_stats(stats, float(row["amount"]))
+
+    async def uncategorize(self, user_id: int, category_id: int) -> None:
+        """Fold a deleted category's statistics into the user's uncategorized ones"""
+        stats = await self.db.get(SpendingStats, (user_id, category_id))
+        if stats is None:
+            return
+        target = await self.db.get(SpendingStats, (user_id, UNCATEGORIZED))
+        if target is None:
+            target = _new_stats(user_id, UNCATEGORIZED)
+            self.db.add(target)
+        merge_stats(target, stats)
+        await self.db.delete(stats)
+
+    async def rebuild(self, user_id: Optional[int] = None) -> int:
+        """
+        Recompute the statistics from raw expenses for one user, or everyone,
+        streaming them in date order. Backfills new installs and resets the
+        drift left by edits and deletes, which are not subtracted. Returns the
+        number of rows written. Caller commits.
+        """
+        delete_stmt = delete(SpendingStats)
+        query = (
+            select(Expense.user_id, Expense.category_id, Expense.amount)
+            .order_by(Expense.user_id, Expense.date, Expense.id)
+            .execution_options(yield_per=REBUILD_BATCH_SIZE)
+        )
+        if user_id is not None:
+            delete_stmt = delete_stmt.where(SpendingStats.user_id == user_id)
+            query = query.where(Expense.user_id == user_id)
+        await self.db.execute(delete_stmt)
+
+        states: Dict[Tuple[int, int], SpendingStats] = {}
+        result = await self.db.stream(query)
+        async for partition in result.partitions():
+            for owner_id, category_id, amount in partition:
+                key = (owner_id, category_id or UNCATEGORIZED)
+                stats = states.get(key)
+                if stats is None:
+                    stats = states[key] = _new_stats(*key)
+                update_stats(stats, float(amount))
+
+        rows = [
+            {column: getattr(stats, column) for column in STATS_COLUMNS}
+            for stats in states.values()
+        ]
+        for offset in range(0, len(rows), REBUILD_BATCH_SIZE):
+            await self.db.execute(insert(SpendingStats), rows[offset:offset + REBUILD_BATCH_SIZE])
+        return len(rows)
+
+    async def _notify(self, expense: Expense, category_id: int, usual: float) -> None:
+        """Stage an unusual spending notification"""
+        category = "Uncategorized"
+        if category_id != UNCATEGORIZED:
+            result = await self.db.execute(select(Category.name).where(Category.id == category_id))
+            category = result.scalar() or category
+
+        label = expense.description or "An expense"
+        await NotificationService(self.db).create_notification(
+            user_id=cast(Any, expense.user_id),
+            notification_type=NotificationType.UNUSUAL_SPENDING,
+            title=f"Unusual Spending: {category}",
+            message=f"{label} of {expense.amount} is well above your usual {usual:.2f} for {category}.",
+            commit=False
+        )
@@ -1,14 +1,33 @@
 """
 Budget Service
 """
-from typing import Optional, List, Any, cast
-from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, cast
+from datetime import date, datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, or_, func, case
 
 from app.models.budget import Budget
-from app.models.expense import Expense
+from app.models.daily_spend import DailySpend
+from app.models.notification import NotificationType
 from app.schemas.budget import BudgetCreate, BudgetUpdate, BudgetResponse
+from app.services.notification_service import NotificationService
+from app.services.rollup_service import RollupDeltas
+
+# Breach levels stored on Budget.alert_level
+ALERT_NONE = 0
+ALERT_WARNING = 1
+ALERT_EXCEEDED = 2
+
+WARNING_THRESHOLD = 0.9
+
+
+def _alert_level(spent: float, limit: float) -> int:
+    """Breach level for an amount spent against a budget limit"""
+    if spent > limit:
+        return ALERT_EXCEEDED
+    if spent > limit * WARNING_THRESHOLD:
+        return ALERT_WARNING
+    return ALERT_NONE
 
 
 class BudgetService:
@@ -22,49 +41,163 @@ class BudgetService:
         result = await self.db.execute(
             select(Budget).where(Budget.user_id == user_id)
         )
-        budgets = result.scalars().all()
+        budgets = list(result.scalars().all())
+        
+        spent_by_budget = await self._calculate_spent_batch(user_id, budgets)
+        return [
+            self._to_response(budget, spent_by_budget[cast(Any, budget.id)])
+            for budget in budgets
+        ]
+    
+    def _period_starts(self) -> Dict[str, date]:
+        """Start day of the current daily, weekly and monthly budget periods"""
+        today = datetime.utcnow().date()
+        return {
+            "daily": today,
+            "weekly": today - timedelta(days=today.weekday()),
+            "monthly": today.replace(day=1),
+        }
+    
+    async def _calculate_spent_batch(self, user_id: int, budgets: List[Budget]) -> Dict[int, float]:
+        """
+        Calculate spent amounts for many budgets with one grouped query.
+        
+        Sums the daily rollup per category with one conditional aggregate per
+        period start, then resolves each budget from (period, category).
+        """
+        if not budgets:
+            return {}
+        
+        starts = self._period_starts()
+        periods = list(starts)
+        result = await self.db.execute(
+            select(
+                DailySpend.category_id,
+                *[
+                    func.sum(
+                        case((DailySpend.day >= starts[period], DailySpend.total), else_=0.0)
+                    )
+                    for period in periods
+                ]
+            )
+            .where(
+                and_(
+                    DailySpend.user_id == user_id,
+                    DailySpend.day >= min(starts.values())
+                )
+            )
+            .group_by(DailySpend.category_id)
+        )
         
-        budget_responses = []
+        by_category: Dict[int, Dict[str, float]] = {}
+        for row in result:
+            by_category[row[0]] = {
+                period: float(row[i + 1] or 0.0) for i, period in enumerate(periods)
+            }
+        
+        spent_by_budget = {}
         for budget in budgets:
-            spent = await self._calculate_spent(budget)
-            response = BudgetResponse.model_validate(budget)
-            response.spent = cast(Any, spent)
-            response.remaining = float(max(0, cast(Any, budget.amount) - cast(Any, spent)))
-            if cast(Any, budget.amount) > 0:
-                response.percentage_used = float(cast(Any, spent) / cast(Any, budget.amount) * 100)
+            period = str(budget.period) if str(budget.period) in starts else "monthly"
+            category_id = cast(Any, budget).category_id
+            if category_id:
+                spent = by_category.get(category_id, {}).get(period, 0.0)
             else:
-                response.percentage_used = 0.0
-            budget_responses.append(response)
-        
-        return budget_responses
+                spent = sum(totals[period] for totals in by_category.values())
+            spent_by_budget[cast(Any, budget.id)] = spent
+        return spent_by_budget
     
-    async def _calculate_spent(self, budget: Budget) -> float:
-        """Calculate amount spent for a budget period"""
-        now = datetime.utcnow()
+    async def track_spend(self, user_id: int, deltas: RollupDeltas) -> None:
+        """
+        Incrementally update the budgets an expense change touches.
         
-        # Determine period start date
-        if str(budget.period) == "daily":
-            start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif str(budget.period) == "weekly":
-            start_date = now - timedelta(days=now.weekday())
-            start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        else:  # monthly
-            start_date = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        # Build query
-        query = select(func.sum(Expense.amount)).where(
-            and_(
-                Expense.user_id == budget.user_id,
-                Expense.date >= start_date
+        Applies the amount deltas to each affected budget's period counter and
+        notifies only when a threshold is crossed upwards, so repeat expenses
+        above 90% don't re-send the same warning. Counters from an earlier
+        period are re-seeded from the rollup once, then updated by delta again.
+        Runs in the caller's transaction.
+        """
+        category_ids = {category_id for _, category_id in deltas}
+        result = await self.db.execute(
+            select(Budget).where(
+                and_(
+                    Budget.user_id == user_id,
+                    or_(Budget.category_id.is_(None), Budget.category_id.in_(category_ids))
+                )
             )
         )
+        budgets = list(result.scalars().all())
+        if not budgets:
+            return
         
-        if cast(Any, budget).category_id:
-            query = query.where(Expense.category_id == budget.category_id)
+        starts = self._period_starts()
+        stale = [
+            budget for budget in budgets
+            if budget.period_start != starts.get(str(budget.period), starts["monthly"])
+        ]
+        reseeded = await self._calculate_spent_batch(user_id, stale)
+        
+        notification_service = NotificationService(self.db)
+        for budget in budgets:
+            period_start = starts.get(str(budget.period), starts["monthly"])
+            category_id = cast(Any, budget).category_id
+            delta = sum(
+                amount
+                for (day, expense_category_id), (amount, _) in deltas.items()
+                if day >= period_start and (not category_id or expense_category_id == category_id)
+            )
+            if cast(Any, budget.id) in reseeded:
+                # Rollup already includes this change
+                spent = reseeded[cast(Any, budget.id)]
+                budget.period_start = cast(Any, period_start)
+                budget.alert_level = cast(Any, _alert_level(spent - delta, cast(Any, budget.amount)))
+            elif not delta:
+                continue
+            else:
+                spent = cast(Any, budget.period_spent) + delta
+            
+            level = _alert_level(spent, cast(Any, budget.amount))
+            budget.period_spent = cast(Any, spent)
+            if level > cast(Any, budget.alert_level):
+                await self._notify(notification_service, user_id, budget, level)
+            budget.alert_level = cast(Any, level)
         
-        result = await self.db.execute(query)
-        spent = result.scalar() or 0.0
-        return spent
+        await self.db.flush()
+    
+    async def _notify(
+        self,
+        notification_service: NotificationService,
+        user_id: int,
+        budget: Budget,
+        level: int
+    ) -> None:
+        """Stage a budget threshold notification"""
+        if level == ALERT_EXCEEDED:
+            await notification_service.create_notification(
+                user_id=user_id,
+                notification_type=NotificationType.BUDGET_EXCEEDED,
+                title=f"Budget Exceeded: {budget.name}",
+                message=f"Your spending has exceeded the budget limit of {budget.amount}.",
+                commit=False
+            )
+        else:
+            await notification_service.create_notification(
+                user_id=user_id,
+                notification_type=NotificationType.BUDGET_WARNING,
+                title=f"Budget Warning: {budget.name}",
+                message=f"You have used over 90% of your budget limit for {budget.name}.",
+                commit=False
+            )
+    
+    def _to_response(self, budget: Budget, spent: float) -> BudgetResponse:
+        """Build a budget response with derived spending fields"""
+        response = BudgetResponse.model_validate(budget)
+        response.spent = spent
+        response.remaining = float(max(0, cast(Any, budget.amount) - spent))
+        if cast(Any, budget.amount) > 0:
+            response.percentage_used = float(spent / cast(Any, budget.amount) * 100)
+        else:
+            response.percentage_used = 0.0
+        return response
     
     async def get_budget(self, budget_id: int, user_id: int) -> Optional[Budget]:
         """Get a specific budget"""
@@ -81,15 +214,8 @@ class BudgetService:
         if not budget:
             return None
         
-        spent = await self._calculate_spent(budget)
-        response = BudgetResponse.model_validate(budget)
-        response.spent = cast(Any, spent)
-        response.remaining = float(max(0, cast(Any, budget.amount) - cast(Any, spent)))
-        if cast(Any, budget.amount) > 0:
-            response.percentage_used = float(cast(Any, spent) / cast(Any, budget.amount) * 100)
-        else:
-            response.percentage_used = 0.0
-        return response
+        spent_by_budget = await self._calculate_spent_batch(user_id, [budget])
+        return self._to_response(budget, spent_by_budget[cast(Any, budget.id)])
     
     async def create_budget(self, user_id: int, budget_data: BudgetCreate) -> Budget:
         """Create a new budget"""
@@ -117,6 +243,10 @@ class BudgetService:
         for field, value in update_data.items():
             setattr(budget, field, value)
         
+        if {"amount", "period", "category_id"} & update_data.keys():
+            # Re-seed breach tracking on the next expense
+            budget.period_start = None  # type: ignore
+        
         await self.db.commit()
         await self.db.refresh(budget)
         return budget
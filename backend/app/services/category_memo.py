@@ -0,0 +1,76 @@
+"""
+Categorization Memo
+"""
+import re
+from typing import Optional, Any, Dict
+
+from app.core.config import settings
+from app.services.two_level_cache import TwoLevelCache
+
+# Digits and punctuation vary between repeats of the same merchant
+# ("Swiggy order #4411", "UPI/0923/ZOMATO"), so they are dropped
+_NOISE = re.compile(r"[\W\d_]+")
+
+# Longest normalized description kept as a key
+MAX_KEY_LENGTH = 100
+
+# Confidence of categories the user saved themselves
+SAVED_CONFIDENCE = 1.0
+
+# Model answers less confident than this are not remembered, so a weak
+# guess can't shadow better tiers for the whole TTL
+MIN_LEARNED_CONFIDENCE = 0.8
+
+
+def normalize_description(description: str) -> str:
+    """Lowercase, keep only the words and collapse whitespace"""
+    return " ".join(_NOISE.sub(" ", description.lower()).split())[:MAX_KEY_LENGTH]
+
+
+class CategoryMemo:
+    """
+    Per-user memo of description -> category, consulted before any model.
+
+    Categories the user saves on expenses are learned with SAVED_CONFIDENCE
+    and replace earlier entries; confident model suggestions are remembered
+    with their own confidence until the user saves something. Callers rank
+    saved entries above their keyword rules and model entries below them.
+    Entries live in Redis, fronted by an in-process LRU (see TwoLevelCache).
+    """
+
+    def __init__(self, max_entries: int, l1_ttl: float, ttl: int):
+        self._cache = TwoLevelCache("Category memo", max_entries=max_entries, l1_ttl=l1_ttl, ttl=ttl)
+
+    async def get(self, user_id: int, description: str) -> Optional[Dict[str, Any]]:
+        """Remembered {"category_id", "confidence"} for a description, if any"""
+        key = self._key(user_id, description)
+        return await self._cache.get(key) if key else None
+
+    async def learn(
+        self,
+        user_id: int,
+        description: Optional[str],
+        category_id: Any,
+        confidence: float = SAVED_CONFIDENCE
+    ) -> None:
+        if confidence < MIN_LEARNED_CONFIDENCE:
+            return
+        key = self._key(user_id, description or "")
+        if key and category_id:
+            await self._cache.set(key, {"category_id": category_id, "confidence": confidence})
+
+    def clear(self) -> None:
+        """Drop the in-process entries (Redis entries expire on their own)"""
+        self._cache.clear()
+
+    @staticmethod
+    def _key(user_id: int, description: str) -> Optional[str]:
+        normalized = normalize_description(description)
+        return f"category_memo:{user_id}:{normalized}" if normalized else None
+
+
+category_memo = CategoryMemo(
+    max_entries=settings.CATEGORY_MEMO_L1_MAX_ENTRIES,
+    l1_ttl=settings.CATEGORY_MEMO_L1_TTL,
+    ttl=settings.CATEGORY_MEMO_TTL,
+)
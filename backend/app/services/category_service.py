@@ -6,6 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 
 from app.models.category import Category
+from app.services.anomaly_service import AnomalyService
+from app.services.rollup_service import RollupService
 from app.schemas.category import CategoryCreate, CategoryUpdate
 
 
@@ -65,11 +67,13 @@ class CategoryService:
         return category
     
     async def delete_category(self, category_id: int, user_id: int) -> bool:
-        """Delete a category"""
+        """Delete a category; its expenses and their aggregates become uncategorized"""
         category = await self.get_category(category_id, user_id)
         if not category:
             return False
         
+        await RollupService(self.db).uncategorize(user_id, category_id)
+        await AnomalyService(self.db).uncategorize(user_id, category_id)
         await self.db.delete(category)
         await self.db.commit()
         return True
@@ -0,0 +1,275 @@
+"""
+Columnar (Parquet / Arrow) Export and Import Service
+"""
+import io
+from typing import Optional, List, Dict, Any, AsyncIterator, BinaryIO, Iterator
+from datetime import date, datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+from app.core.exceptions import BaseAPIException, BadRequestException
+from app.models.expense import Expense, ExpenseSource
+from app.models.category import Category
+from app.services.expense_service import ExpenseService
+from app.services.event_service import EventService
+from app.models.event import EventType
+
+# Rows per record batch / Parquet row group
+ROW_GROUP_SIZE = 10000
+
+COLUMNAR_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+def _require_pyarrow():
+    """Import pyarrow lazily so the rest of the API works without it"""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        raise BaseAPIException(
+            status_code=501,
+            detail="Columnar export requires the pyarrow package"
+        )
+
+
+def _expense_schema(pa: Any) -> Any:
+    """Typed Arrow schema shared by export and import"""
+    return pa.schema([
+        ("id", pa.int64()),
+        ("date", pa.timestamp("us")),
+        ("amount", pa.float64()),
+        ("description", pa.string()),
+        ("notes", pa.string()),
+        ("category_id", pa.int64()),
+        ("category_name", pa.string()),
+        ("tags", pa.string()),
+        ("source", pa.string()),  # Parquet dictionary-encodes repeated values
+        ("created_at", pa.timestamp("us")),
+    ])
+
+
+def _open_batches(pa: Any, file: BinaryIO, file_format: str) -> Iterator[Any]:
+    """Open a lazy record batch reader over an uploaded file"""
+    if file_format == "parquet":
+        return iter(pa.parquet.ParquetFile(file).iter_batches(batch_size=ROW_GROUP_SIZE))
+    return iter(pa.ipc.open_stream(file))
+
+
+def _next_records(batches: Iterator[Any]) -> Optional[List[Dict[str, Any]]]:
+    """Decode the next record batch into rows; None once the file is exhausted"""
+    batch = next(batches, None)
+    return None if batch is None else batch.to_pylist()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose buffered bytes can be drained between row groups"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        # Parquet records absolute offsets, so report the logical position
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ColumnarService:
+    """Bulk expense export/import in Parquet or Arrow IPC stream format"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.expense_service = ExpenseService(db)
+
+    def export_expenses(
+        self,
+        user_id: int,
+        file_format: str = "parquet",
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_id: Optional[int] = None
+    ):
+        """Stream a typed columnar export, one row group per cursor partition"""
+        from fastapi.responses import StreamingResponse
+
+        pa = _require_pyarrow()
+        media_type, extension = COLUMNAR_FORMATS[file_format]
+        query = self._export_query(user_id, start_date, end_date, category_id)
+
+        filename = f"expenses_{datetime.now().strftime('%Y%m%d')}.{extension}"
+        return StreamingResponse(
+            _stream_batches(pa, query, file_format),
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+
+    def _export_query(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_id: Optional[int] = None
+    ) -> Any:
+        """Export rows in schema column order, streamed in ROW_GROUP_SIZE partitions"""
+        filters = self.expense_service._build_filters(user_id, category_id, start_date, end_date)
+        return (
+            select(
+                Expense.id,
+                Expense.date,
+                Expense.amount,
+                Expense.description,
+                Expense.notes,
+                Expense.category_id,
+                Category.name,
+                Expense.tags,
+                Expense.source,
+                Expense.created_at
+            )
+            .outerjoin(Category, Expense.category_id == Category.id)
+            .where(*filters)
+            .order_by(Expense.date, Expense.id)
+            .execution_options(yield_per=ROW_GROUP_SIZE)
+        )
+
+    async def import_expenses(self, user_id: int, file: BinaryIO, file_format: str = "parquet") -> dict:
+        """
+        Bulk-load expenses from a Parquet or Arrow file in record batches.
+
+        Only `amount` is required. Categories are matched by id, then by name,
+        against the user's own categories; unknown ones import as uncategorized.
+        Ids in the file are ignored and rows matching an existing expense's
+        fingerprint are skipped. Everything commits in one transaction.
+        """
+        pa = _require_pyarrow()
+        result = await self.db.execute(
+            select(Category.id, Category.name).where(Category.user_id == user_id)
+        )
+        categories = result.all()
+        category_ids = {row.id for row in categories}
+        category_by_name = {str(row.name).lower(): row.id for row in categories}
+
+        imported = 0
+        skipped = 0
+        try:
+            # Decoding is CPU and file bound, so keep it off the event loop.
+            # Batches are decoded lazily, so corruption can surface mid-file
+            # (truncated bodies raise OSError rather than ArrowInvalid)
+            batches = await run_in_threadpool(_open_batches, pa, file, file_format)
+            while (records := await run_in_threadpool(_next_records, batches)) is not None:
+                rows = []
+                for record in records:
+                    row = self._coerce_row(record, category_ids, category_by_name)
+                    if row is None:
+                        skipped += 1
+                        continue
+                    rows.append(row)
+                duplicates = await self.expense_service.find_duplicate_rows(user_id, rows)
+                skipped += len(duplicates)
+                rows = [row for index, row in enumerate(rows) if index not in duplicates]
+                imported += len(await self.expense_service.bulk_insert_expenses(user_id, rows))
+        except (pa.ArrowException, OSError) as e:
+            raise BadRequestException(f"Could not read {file_format} file: {e}")
+
+        await EventService(self.db).log_event(
+            user_id=user_id,
+            event_type=EventType.EXPENSE_CREATED,
+            description=f"Imported {imported} expenses ({file_format})",
+            event_metadata={"imported": imported, "skipped": skipped}
+        )
+        await self.db.commit()
+        return {"imported": imported, "skipped": skipped}
+
+    def _coerce_row(
+        self,
+        record: Dict[str, Any],
+        category_ids: set,
+        category_by_name: Dict[str, int]
+    ) -> Optional[dict]:
+        """Validate one imported record; None means skip it"""
+        try:
+            amount = float(record["amount"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        category_id = record.get("category_id")
+        if category_id not in category_ids:
+            name = record.get("category_name")
+            category_id = category_by_name.get(str(name).lower()) if name else None
+
+        source = record.get("source")
+        try:
+            source = ExpenseSource(source) if source else ExpenseSource.MANUAL
+        except ValueError:
+            source = ExpenseSource.MANUAL
+
+        expense_date = record.get("date")
+        if not isinstance(expense_date, datetime):
+            expense_date = None
+        elif expense_date.tzinfo is not None:
+            # Expense dates are stored as naive UTC
+            expense_date = expense_date.astimezone(timezone.utc).replace(tzinfo=None)
+        return {
+            "amount": amount,
+            "description": record.get("description"),
+            "notes": record.get("notes"),
+            "category_id": category_id,
+            "date": expense_date,
+            "tags": record.get("tags"),
+            "source": source,
+        }
+
+
+async def _stream_batches(
+    pa: Any,
+    query: Any,
+    file_format: str,
+    session_factory: Optional[Any] = None
+) -> AsyncIterator[bytes]:
+    """
+    Encode cursor partitions as Arrow record batches and yield the bytes
+    written. Runs on its own session (the app's by default), since the
+    request's is closed before the response body is sent.
+    """
+    from app.db.database import async_session
+
+    schema = _expense_schema(pa)
+    sink = _ChunkSink()
+    if file_format == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    try:
+        async with (session_factory or async_session)() as session:
+            result = await session.stream(query)
+            async for partition in result.partitions():
+                columns = list(zip(*partition))
+                columns[8] = tuple(getattr(s, "value", s) for s in columns[8])
+                batch = pa.RecordBatch.from_arrays(
+                    [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                    schema=schema
+                )
+                writer.write_batch(batch)
+                yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,350 @@
+"""
+Nearest-Neighbour Categorization Service
+"""
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple, Sequence, Iterable, Any, cast
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy import event, select, delete, insert, update
+
+from app.models.category_example import CategoryExample
+from app.models.expense import Expense
+from app.services.category_memo import normalize_description
+
+# Hashed feature buckets per embedding (float32, so 1 KiB per example)
+EMBEDDING_DIM = 256
+
+# Character n-gram size; whole words are hashed as well
+NGRAM_SIZE = 3
+
+# Neighbours that vote on a description's category
+TOP_K = 5
+
+# Neighbours less similar than this don't vote (unrelated strings score about ±0.15)
+MIN_SIMILARITY = 0.3
+
+# Confidence at which callers can skip the remote models
+MIN_CONFIDENCE = 0.35
+
+# Most recent examples kept per user
+MAX_EXAMPLES_PER_USER = 5000
+
+# Users whose index is kept in process memory, and for how long (seconds)
+MAX_CACHED_INDEXES = 256
+INDEX_TTL = 300.0
+
+# Examples embedded and written per statement
+REBUILD_BATCH_SIZE = 1000
+
+# Session.info key of the examples written in the open transaction
+PENDING_EXAMPLES = "pending_category_examples"
+
+
+def _features(text: str) -> List[str]:
+    padded = f" {text} "
+    grams = [padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)]
+    return grams + text.split()
+
+
+def embed(descriptions: Sequence[str]) -> np.ndarray:
+    """
+    Embed descriptions as L2-normalized float32 rows.
+
+    Signed feature hashing of character trigrams and words: computed locally
+    in microseconds, stable across processes (crc32, not the salted hash())
+    and robust to the spelling variants merchant strings come in.
+    """
+    rows: List[int] = []
+    buckets: List[int] = []
+    signs: List[float] = []
+    for row, description in enumerate(descriptions):
+        for feature in _features(normalize_description(description)):
+            digest = zlib.crc32(feature.encode())
+            rows.append(row)
+            buckets.append(digest % EMBEDDING_DIM)
+            signs.append(1.0 if digest & 0x80000000 else -1.0)
+
+    matrix = np.zeros((len(descriptions), EMBEDDING_DIM), dtype=np.float32)
+    np.add.at(matrix, (np.array(rows, dtype=np.int64), np.array(buckets, dtype=np.int64)), signs)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+class UserIndex:
+    """One user's labelled examples as a dense matrix for cosine top-k search"""
+
+    def __init__(self, texts: List[str], category_ids: np.ndarray, vectors: np.ndarray):
+        # Oldest first, so trimming drops from the front
+        self.texts = texts
+        self.category_ids = category_ids
+        self.vectors = vectors
+        self.loaded_at = time.monotonic()
+
+    def add(self, examples: Sequence[Tuple[str, int, np.ndarray]]) -> None:
+        """
+        Insert or relabel examples as the most recent, dropping the oldest
+        beyond MAX_EXAMPLES_PER_USER
+        """
+        if not examples:
+            return
+        fresh = {text: (category_id, vector) for text, category_id, vector in examples}
+        keep = [position for position, text in enumerate(self.texts) if text not in fresh]
+        texts = [self.texts[position] for position in keep] + list(fresh)
+        category_ids = np.concatenate([
+            self.category_ids[keep],
+            np.array([category_id for category_id, _ in fresh.values()], dtype=np.int64)
+        ])
+        vectors = np.vstack([self.vectors[keep]] + [vector[np.newaxis] for _, vector in fresh.values()])
+
+        excess = max(len(texts) - MAX_EXAMPLES_PER_USER, 0)
+        self.texts = texts[excess:]
+        self.category_ids = category_ids[excess:]
+        self.vectors = vectors[excess:]
+
+    def search(
+        self,
+        queries: np.ndarray,
+        allowed: Optional[Iterable[int]] = None
+    ) -> List[Optional[Tuple[int, float]]]:
+        """
+        Vote on a category for each query row among its TOP_K most similar
+        examples. Votes are weighted by similarity; confidence is the winner's
+        share of the vote times its best similarity. Labels outside `allowed`
+        (e.g. deleted categories) don't vote. None when nothing is similar enough.
+        """
+        if not len(self.texts) or not len(queries):
+            return [None] * len(queries)
+
+        similarities = queries @ self.vectors.T  # (queries, examples)
+        k = min(TOP_K, similarities.shape[1])
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        top_similarities = np.take_along_axis(similarities, top, axis=1)
+
+        labels, label_index = np.unique(self.category_ids, return_inverse=True)
+        votes_allowed = top_similarities >= MIN_SIMILARITY
+        if allowed is not None:
+            votes_allowed &= np.isin(labels, list(allowed))[label_index[top]]
+        weights = np.where(votes_allowed, top_similarities, 0.0)
+
+        rows = np.repeat(np.arange(len(queries)), k)
+        votes = np.zeros((len(queries), len(labels)))
+        best = np.zeros((len(queries), len(labels)))
+        np.add.at(votes, (rows, label_index[top].ravel()), weights.ravel())
+        np.maximum.at(best, (rows, label_index[top].ravel()), weights.ravel())
+
+        winners = votes.argmax(axis=1)
+        totals = votes.sum(axis=1)
+        results: List[Optional[Tuple[int, float]]] = []
+        for row, winner in enumerate(winners):
+            if totals[row] <= 0:
+                results.append(None)
+                continue
+            confidence = votes[row, winner] / totals[row] * best[row, winner]
+            results.append((int(labels[winner]), float(confidence)))
+        return results
+
+
+# user_id -> index, least recently used first
+_indexes: "OrderedDict[int, UserIndex]" = OrderedDict()
+
+
+def clear_indexes() -> None:
+    """Drop every in-process index; they reload from the database on next use"""
+    _indexes.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_examples(session: Session) -> None:
+    """Add committed examples to this worker's loaded indexes"""
+    for user_id, examples in session.info.pop(PENDING_EXAMPLES, []):
+        index = _indexes.get(user_id)
+        if index is not None:
+            index.add(examples)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_examples(session: Session) -> None:
+    session.info.pop(PENDING_EXAMPLES, None)
+
+
+class EmbeddingCategorizer:
+    """Categorizes descriptions by their nearest labelled examples, locally"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def suggest(
+        self,
+        user_id: int,
+        descriptions: Sequence[str],
+        allowed: Optional[Iterable[int]] = None
+    ) -> List[Optional[Tuple[int, float]]]:
+        """(category_id, confidence) for each description, in order; None when unknown"""
+        index = await self._get_index(user_id)
+        return index.search(embed(descriptions), allowed)
+
+    async def add_example(self, user_id: int, description: Optional[str], category_id: Optional[int]) -> None:
+        """Upsert the example for one labelled description (see add_examples)"""
+        await self.add_examples(user_id, [(description, category_id)])
+
+    async def add_examples(
+        self,
+        user_id: int,
+        labelled: Iterable[Tuple[Optional[str], Optional[int]]]
+    ) -> None:
+        """
+        Upsert examples for labelled descriptions in the caller's transaction,
+        REBUILD_BATCH_SIZE per statement, and drop the user's oldest beyond
+        MAX_EXAMPLES_PER_USER. This worker's index picks them up when the
+        transaction commits; other workers when their copy expires (INDEX_TTL).
+        """
+        labels: Dict[str, int] = {}
+        for description, category_id in labelled:
+            text = normalize_description(description or "")
+            if text and category_id:
+                labels.pop(text, None)  # Latest label wins, as the most recent
+                labels[text] = category_id
+        if not labels:
+            return
+
+        texts = list(labels)
+        vectors = embed(texts)
+        now = datetime.utcnow()
+        values = [
+            {
+                "user_id": user_id,
+                "text": text,
+                "category_id": labels[text],
+                "vector": vector.tobytes(),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for text, vector in zip(texts, vectors)
+        ]
+        dialect = self.db.get_bind().dialect.name
+        for offset in range(0, len(values), REBUILD_BATCH_SIZE):
+            batch = values[offset:offset + REBUILD_BATCH_SIZE]
+            if dialect in ("postgresql", "sqlite"):
+                if dialect == "postgresql":
+                    from sqlalchemy.dialects.postgresql import insert as dialect_insert
+                else:
+                    from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+                stmt = dialect_insert(CategoryExample).values(batch)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[CategoryExample.user_id, CategoryExample.text],
+                    set_={"category_id": stmt.excluded.category_id, "updated_at": now}
+                )
+                await self.db.execute(stmt)
+                continue
+
+            for value in batch:
+                result = await self.db.execute(
+                    update(CategoryExample)
+                    .where(CategoryExample.user_id == user_id, CategoryExample.text == value["text"])
+                    .values(category_id=value["category_id"], updated_at=now)
+                )
+                if not cast(Any, result).rowcount:
+                    await self.db.execute(insert(CategoryExample).values(value))
+
+        stale = (
+            select(CategoryExample.id)
+            .where(CategoryExample.user_id == user_id)
+            .order_by(CategoryExample.updated_at.desc(), CategoryExample.id.desc())
+            .offset(MAX_EXAMPLES_PER_USER)
+        )
+        await self.db.execute(delete(CategoryExample).where(CategoryExample.id.in_(stale)))
+
+        self.db.info.setdefault(PENDING_EXAMPLES, []).append(
+            (user_id, [(text, labels[text], vector) for text, vector in zip(texts, vectors)])
+        )
+
+    async def rebuild(self, user_id: Optional[int] = None) -> int:
+        """
+        Recompute examples from categorized expenses for one user, or everyone:
+        the latest category per distinct description, keeping the most recent
+        MAX_EXAMPLES_PER_USER. Returns the number of examples written. Caller commits.
+        """
+        delete_stmt = delete(CategoryExample)
+        query = (
+            select(Expense.user_id, Expense.description, Expense.category_id)
+            .where(Expense.category_id.is_not(None), Expense.description.is_not(None))
+            .order_by(Expense.user_id, Expense.date, Expense.id)
+            .execution_options(yield_per=REBUILD_BATCH_SIZE)
+        )
+        if user_id is not None:
+            delete_stmt = delete_stmt.where(CategoryExample.user_id == user_id)
+            query = query.where(Expense.user_id == user_id)
+        await self.db.execute(delete_stmt)
+        if user_id is not None:
+            _indexes.pop(user_id, None)
+        else:
+            clear_indexes()
+
+        written = 0
+        current_user: Optional[int] = None
+        labels: Dict[str, int] = {}
+        result = await self.db.stream(query)
+        async for partition in result.partitions():
+            for owner_id, description, category_id in partition:
+                if owner_id != current_user:
+                    written += await self._write_examples(current_user, labels)
+                    current_user, labels = owner_id, {}
+                text = normalize_description(description)
+                if text:
+                    labels.pop(text, None)  # Re-insert so dict order tracks recency
+                    labels[text] = category_id
+        written += await self._write_examples(current_user, labels)
+        return written
+
+    async def _write_examples(self, user_id: Optional[int], labels: Dict[str, int]) -> int:
+        if user_id is None or not labels:
+            return 0
+        recent = list(labels.items())[-MAX_EXAMPLES_PER_USER:]
+        now = datetime.utcnow()
+        for offset in range(0, len(recent), REBUILD_BATCH_SIZE):
+            batch = recent[offset:offset + REBUILD_BATCH_SIZE]
+            vectors = embed([text for text, _ in batch])
+            await self.db.execute(insert(CategoryExample), [
+                {
+                    "user_id": user_id,
+                    "text": text,
+                    "category_id": category_id,
+                    "vector": vector.tobytes(),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for (text, category_id), vector in zip(batch, vectors)
+            ])
+        return len(recent)
+
+    async def _get_index(self, user_id: int) -> UserIndex:
+        """The user's index from process memory, loading it in one query when missing or expired"""
+        index = _indexes.get(user_id)
+        if index is not None and time.monotonic() - index.loaded_at < INDEX_TTL:
+            _indexes.move_to_end(user_id)
+            return index
+
+        result = await self.db.execute(
+            select(CategoryExample.text, CategoryExample.category_id, CategoryExample.vector)
+            .where(CategoryExample.user_id == user_id)
+            .order_by(CategoryExample.updated_at.desc())
+            .limit(MAX_EXAMPLES_PER_USER)
+        )
+        rows = result.all()[::-1]  # Oldest first
+        vectors = np.frombuffer(b"".join(row.vector for row in rows), dtype=np.float32)
+        index = UserIndex(
+            [row.text for row in rows],
+            np.array([row.category_id for row in rows], dtype=np.int64),
+            vectors.reshape(len(rows), EMBEDDING_DIM).copy()
+        )
+        _indexes[user_id] = index
+        _indexes.move_to_end(user_id)
+        while len(_indexes) > MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+        return index
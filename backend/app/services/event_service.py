@@ -1,33 +1,174 @@
 """
 Event Tracking Service
 """
+import asyncio
 import json
-from typing import Optional
+from datetime import datetime
+from typing import Optional, List
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.event import Event, EventType
+from app.utils.logger import logger
+
+
+class EventBuffer:
+    """
+    In-process event sink that batches inserts off the request path.
+
+    Events are queued in a bounded asyncio.Queue and written by a background
+    task with one multi-row INSERT per batch, flushed when `batch_size` events
+    are waiting or `flush_interval` seconds have passed. When the queue is
+    full, callers wait up to `put_timeout` seconds before the event is dropped.
+
+    Batches are written in their own transaction, not the caller's, so an
+    event is kept even if the write it describes is later rolled back. The
+    activity log is best-effort; don't derive state from it.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        batch_size: int,
+        flush_interval: float,
+        put_timeout: float
+    ):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.dropped = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Start the background flusher (called from app lifespan)"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._closing = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush everything still queued and stop the flusher"""
+        if not self.running or not self._task or not self._closing:
+            return
+        self._closing.set()
+        await self._task
+        self._task = None
+
+    async def put(self, row: dict) -> None:
+        """Queue one event row, applying backpressure when the buffer is full"""
+        if not self._queue:
+            return
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self._queue.put(row), self.put_timeout)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                logger.warning(f"Event buffer full, dropped event ({self.dropped} total)")
+
+    async def _run(self):
+        assert self._queue is not None and self._closing is not None
+        while not (self._closing.is_set() and self._queue.empty()):
+            batch = await self._collect()
+            if batch:
+                await self._write(batch)
+
+    async def _collect(self) -> List[dict]:
+        """Wait for a full batch or the flush interval, whichever comes first"""
+        assert self._queue is not None and self._closing is not None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        batch: List[dict] = []
+        while len(batch) < self.batch_size:
+            if self._closing.is_set() and self._queue.empty():
+                break
+            if self._closing.is_set():
+                # Stopping: take what is queued without waiting for more
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            row = await self._get(timeout)
+            if row is None:
+                continue
+            batch.append(row)
+        return batch
+
+    async def _get(self, timeout: float) -> Optional[dict]:
+        """Next queued row, or None on timeout or when stop() is called"""
+        assert self._queue is not None and self._closing is not None
+        getter = asyncio.ensure_future(self._queue.get())
+        closing = asyncio.ensure_future(self._closing.wait())
+        try:
+            await asyncio.wait({getter, closing}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            closing.cancel()
+        if getter.done():
+            return getter.result()
+        getter.cancel()
+        return None
+
+    async def _write(self, batch: List[dict]) -> None:
+        from app.db.database import async_session
+        try:
+            async with async_session() as session:
+                await session.execute(insert(Event), batch)
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to flush {len(batch)} events: {e}")
+
+
+event_buffer = EventBuffer(
+    max_size=settings.EVENT_BUFFER_MAX_SIZE,
+    batch_size=settings.EVENT_BUFFER_BATCH_SIZE,
+    flush_interval=settings.EVENT_BUFFER_FLUSH_INTERVAL,
+    put_timeout=settings.EVENT_BUFFER_PUT_TIMEOUT,
+)
 
 
 class EventService:
     """Event tracking service for activity logs"""
-    
+
     def __init__(self, db: AsyncSession):
         self.db = db
-    
+
     async def log_event(
         self,
         user_id: int,
         event_type: EventType,
         description: Optional[str] = None,
         event_metadata: Optional[dict] = None
-    ) -> Event:
-        """Log an event"""
-        event = Event(
-            user_id=user_id,
-            event_type=event_type,
-            description=description,
-            event_metadata=json.dumps(event_metadata) if event_metadata else None
-        )
+    ) -> Optional[Event]:
+        """
+        Log an event.
+
+        Goes through the shared event buffer when it is running (no write on the
+        request path); otherwise the event joins the caller's transaction.
+        """
+        now = datetime.utcnow()
+        row = {
+            "user_id": user_id,
+            "event_type": event_type,
+            "description": description,
+            "event_metadata": json.dumps(event_metadata) if event_metadata else None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        if event_buffer.running:
+            await event_buffer.put(row)
+            return None
+
+        event = Event(**row)
         self.db.add(event)
-        await self.db.commit()
         return event
@@ -1,14 +1,121 @@
 """
 Expense Service
 """
-from typing import Optional, List, Tuple, Any, cast
+import base64
+import csv
+import hashlib
+import io
+import json
+import re
+import zlib
+from typing import Optional, List, Dict, Tuple, Iterable, Any, AsyncIterator, cast
 from datetime import date, datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, func, and_, or_, tuple_, insert, delete, literal
 
-from app.models.expense import Expense
+from app.core.exceptions import BadRequestException
+from app.models.expense import Expense, ExpenseSource
 from app.models.category import Category
-from app.schemas.expense import ExpenseCreate, ExpenseUpdate, ExpenseResponse
+from app.models.group import ExpenseSplit
+from app.models.sync import Tombstone, next_change_seq
+from app.services.anomaly_service import AnomalyService
+from app.services.budget_service import BudgetService
+from app.services.category_memo import category_memo
+from app.services.embedding_categorizer import EmbeddingCategorizer
+from app.services.rollup_service import RollupService, RollupDeltas, add_delta, rollup_key
+from app.schemas.expense import (
+    ExpenseCreate,
+    ExpenseBulkCreateResponse,
+    ExpenseBulkItemResult,
+    ExpenseUpdate,
+    ExpenseResponse,
+    ExpenseListResponse,
+)
+
+# Upper bound on rows scanned when a caller asks for an estimated total
+ESTIMATE_COUNT_CAP = 1000
+
+# Rows fetched per server-side cursor round trip during exports
+EXPORT_BATCH_SIZE = 1000
+
+# Most expenses a single bulk delete may remove
+BULK_DELETE_LIMIT = 500
+
+
+def encode_cursor(expense_date: datetime, expense_id: int) -> str:
+    """Encode an opaque keyset cursor pointing at `(date, id)`"""
+    raw = json.dumps([expense_date.isoformat(), expense_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by `encode_cursor`"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_date, raw_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(raw_date), int(raw_id)
+    except (ValueError, TypeError):
+        raise BadRequestException("Invalid cursor")
+
+
+def expense_fingerprint(
+    user_id: int,
+    amount: float,
+    expense_date: datetime,
+    description: Optional[str]
+) -> str:
+    """
+    Hash of what makes two expenses look like the same purchase: user, amount
+    to two decimals, calendar day and description with case, punctuation
+    and spacing removed.
+    """
+    normalized = " ".join(re.findall(r"[a-z0-9]+", (description or "").lower()))
+    raw = f"{user_id}|{float(amount):.2f}|{expense_date.date().isoformat()}|{normalized}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _drain(output: io.StringIO) -> str:
+    """Return buffered text and reset the buffer"""
+    value = output.getvalue()
+    output.seek(0)
+    output.truncate(0)
+    return value
+
+
+async def _stream_csv(query: Any) -> AsyncIterator[str]:
+    """Encode export rows as CSV one cursor partition at a time"""
+    # The request's session is closed before the response body is sent,
+    # so the stream runs on its own session
+    from app.db.database import async_session
+    
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["Date", "Description", "Amount", "Category", "Source"])
+    yield _drain(output)
+    
+    async with async_session() as session:
+        result = await session.stream(query)
+        async for partition in result.partitions():
+            for expense_date, description, amount, category_name, source in partition:
+                writer.writerow([
+                    expense_date.isoformat(),
+                    description,
+                    amount,
+                    category_name or "Uncategorized",
+                    getattr(source, "value", source)
+                ])
+            yield _drain(output)
+
+
+async def _gzip_chunks(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Gzip a text stream incrementally"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
 
 
 class ExpenseService:
@@ -25,55 +132,137 @@ class ExpenseService:
         category_id: Optional[int] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
+    ) -> ExpenseListResponse:
+        """
+        Get expenses with filtering and pagination.
+        
+        When `cursor` is given (an empty string means "first page"), the page is
+        fetched with a keyset predicate on `(date, id)` instead of OFFSET, so deep
+        pages cost the same as the first one. `total_mode` controls the count:
+        "exact" runs a full count, "estimate" counts at most ESTIMATE_COUNT_CAP rows
+        and "none" skips it.
+        """
+        filters = self._build_filters(user_id, category_id, start_date, end_date, search)
+        # Category details come from the same round trip, so a page costs a
+        # fixed number of queries regardless of page_size
+        query = (
+            select(Expense, Category.name, Category.icon, Category.color)
+            .outerjoin(Category, Expense.category_id == Category.id)
+            .where(*filters)
+        )
+        
+        if cursor is not None:
+            if cursor:
+                cursor_date, cursor_id = decode_cursor(cursor)
+                query = query.where(
+                    tuple_(Expense.date, Expense.id) < tuple_(cursor_date, cursor_id)
+                )
+        else:
+            query = query.offset((page - 1) * page_size)
+        
+        # Offset searches are ranked by relevance; cursors need (date, id) order
+        rank = self._search_rank(search) if search and cursor is None else None
+        if rank is not None:
+            query = query.order_by(rank.desc(), Expense.date.desc(), Expense.id.desc())
+        else:
+            query = query.order_by(Expense.date.desc(), Expense.id.desc())
+        
+        # Fetch one extra row to know whether another page exists
+        result = await self.db.execute(query.limit(page_size + 1))
+        rows = list(result.all())
+        
+        next_cursor = None
+        if len(rows) > page_size and rank is None:
+            last = rows[page_size - 1][0]
+            next_cursor = encode_cursor(cast(Any, last.date), cast(Any, last.id))
+        rows = rows[:page_size]
+        
+        total, total_is_estimate = await self._count_expenses(filters, total_mode)
+        
+        # Convert to response with category details
+        expense_responses = []
+        for expense, category_name, category_icon, category_color in rows:
+            response = ExpenseResponse.model_validate(expense)
+            response.category_name = category_name
+            response.category_icon = category_icon
+            response.category_color = category_color
+            expense_responses.append(response)
+        
+        return ExpenseListResponse(
+            items=expense_responses,
+            total=total,
+            total_is_estimate=total_is_estimate,
+            page=page if cursor is None else None,
+            page_size=page_size,
+            next_cursor=next_cursor
+        )
+    
+    def _build_filters(
+        self,
+        user_id: int,
+        category_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
         search: Optional[str] = None
-    ) -> Tuple[List[ExpenseResponse], int]:
-        """Get expenses with filtering and pagination"""
-        query = select(Expense).where(Expense.user_id == user_id)
-        count_query = select(func.count(Expense.id)).where(Expense.user_id == user_id)
+    ) -> List[Any]:
+        """Build the WHERE clauses shared by the list and count queries"""
+        filters: List[Any] = [Expense.user_id == user_id]
         
-        # Apply filters
         if category_id:
-            query = query.where(Expense.category_id == category_id)
-            count_query = count_query.where(Expense.category_id == category_id)
+            filters.append(Expense.category_id == category_id)
         
         if start_date:
-            start_datetime = datetime.combine(start_date, datetime.min.time())
-            query = query.where(Expense.date >= start_datetime)
-            count_query = count_query.where(Expense.date >= start_datetime)
+            filters.append(Expense.date >= datetime.combine(start_date, datetime.min.time()))
         
         if end_date:
-            end_datetime = datetime.combine(end_date, datetime.max.time())
-            query = query.where(Expense.date <= end_datetime)
-            count_query = count_query.where(Expense.date <= end_datetime)
+            filters.append(Expense.date <= datetime.combine(end_date, datetime.max.time()))
         
         if search:
-            search_filter = Expense.description.ilike(f"%{search}%")
-            query = query.where(search_filter)
-            count_query = count_query.where(search_filter)
+            filters.append(self._search_filter(search))
         
-        # Get total count
-        total_result = await self.db.execute(count_query)
-        total = int(total_result.scalar() or 0)
-        
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.order_by(Expense.date.desc()).offset(offset).limit(page_size)
+        return filters
+    
+    def _uses_trigram_search(self) -> bool:
+        """pg_trgm fuzzy matching is only available on PostgreSQL"""
+        return self.db.get_bind().dialect.name == "postgresql"
+    
+    def _search_filter(self, search: str) -> Any:
+        """
+        Match `search` against description, notes and tags.
         
-        result = await self.db.execute(query)
-        expenses = list(result.scalars().all())
+        Substring matches are always included; on PostgreSQL, trigram word
+        similarity also catches typos ("swigy" -> "Swiggy"). Both forms are
+        served by the GIN index on `search_text`.
+        """
+        term = search.strip().lower()
+        substring = Expense.search_text.contains(term, autoescape=True)
+        if not self._uses_trigram_search():
+            return substring
+        return or_(substring, literal(term).op("<%")(Expense.search_text))
+    
+    def _search_rank(self, search: str) -> Optional[Any]:
+        """Relevance score for ranked search results, if the database supports it"""
+        if not self._uses_trigram_search():
+            return None
+        return func.word_similarity(search.strip().lower(), Expense.search_text)
+    
+    async def _count_expenses(self, filters: List[Any], total_mode: str) -> Tuple[Optional[int], bool]:
+        """Count matching expenses according to `total_mode`"""
+        if total_mode == "none":
+            return None, False
         
-        # Convert to response with category name
-        expense_responses = []
-        for expense in expenses:
-            response = ExpenseResponse.model_validate(expense)
-            if cast(Any, expense.category_id):
-                cat_result = await self.db.execute(
-                    select(Category.name).where(Category.id == cast(Any, expense.category_id))
-                )
-                response.category_name = cat_result.scalar_one_or_none()
-            expense_responses.append(response)
+        if total_mode == "estimate":
+            # Bounded count: never scans more than ESTIMATE_COUNT_CAP rows
+            capped = select(Expense.id).where(*filters).limit(ESTIMATE_COUNT_CAP).subquery()
+            result = await self.db.execute(select(func.count()).select_from(capped))
+            total = int(result.scalar() or 0)
+            return total, total >= ESTIMATE_COUNT_CAP
         
-        return expense_responses, total
+        result = await self.db.execute(select(func.count(Expense.id)).where(*filters))
+        return int(result.scalar() or 0), False
     
     async def get_expense(self, expense_id: int, user_id: int) -> Optional[Expense]:
         """Get a specific expense"""
@@ -84,24 +273,59 @@ class ExpenseService:
         )
         return result.scalar_one_or_none()
     
-    async def create_expense(self, user_id: int, expense_data: ExpenseCreate) -> Expense:
-        """Create a new expense"""
-        from app.services.budget_service import BudgetService
-        from app.services.notification_service import NotificationService
+    async def create_expense(
+        self,
+        user_id: int,
+        expense_data: ExpenseCreate,
+        idempotency_key: Optional[str] = None
+    ) -> Expense:
+        """
+        Create a new expense.
+        
+        Repeating a call with the same `idempotency_key` returns the expense
+        created the first time. The result's `duplicate_of` names an existing
+        expense with the same fingerprint, if any.
+        """
         from app.services.event_service import EventService
         from app.models.event import EventType
-        from app.models.notification import NotificationType
+
+        if idempotency_key:
+            existing = await self._get_by_idempotency_key(user_id, idempotency_key)
+            if existing:
+                return existing
 
         expense = Expense(
             user_id=user_id,
+            idempotency_key=idempotency_key,
             **expense_data.model_dump()
         )
         
         if not cast(Any, expense).date:
             cast(Any, expense).date = datetime.utcnow()
+        fingerprint = expense_fingerprint(
+            user_id,
+            cast(Any, expense.amount),
+            cast(Any, expense.date),
+            cast(Any, expense.description)
+        )
+        cast(Any, expense).fingerprint = fingerprint
+        duplicates = await self.find_duplicates(user_id, [fingerprint])
         
         self.db.add(expense)
-        await self.db.flush() # Flush to get expense ID but don't commit yet
+        try:
+            await self.db.flush() # Flush to get expense ID but don't commit yet
+        except IntegrityError:
+            await self.db.rollback()
+            if not idempotency_key:
+                raise
+            # A concurrent request with the same idempotency key got there first
+            existing = await self._get_by_idempotency_key(user_id, idempotency_key)
+            if existing is None:
+                raise
+            return existing
+        
+        # Keep the daily rollup in step, in the same transaction
+        deltas = await RollupService(self.db).record_expense(expense)
         
         # 1. Log Event
         event_service = EventService(self.db)
@@ -112,39 +336,177 @@ class ExpenseService:
             event_metadata={"expense_id": expense.id, "amount": expense.amount}
         )
 
-        # 2. Check for Budget Breaches
-        budget_service = BudgetService(self.db)
-        notification_service = NotificationService(self.db)
-        
-        # Get all budgets for this user (could be general or category-specific)
-        budgets = await budget_service.get_budgets(user_id)
-        for budget in budgets:
-            # Check if this expense affects this budget
-            if budget.category_id is None or budget.category_id == expense.category_id:
-                # If budget was already exceeded, we might redundant notifications? 
-                # For now, just check if NEW total exceeds it.
-                spent = budget.spent if budget.spent is not None else 0.0
-                limit = budget.amount
-                
-                if spent > limit:
-                    await notification_service.create_notification(
-                        user_id=user_id,
-                        notification_type=NotificationType.BUDGET_EXCEEDED,
-                        title=f"Budget Exceeded: {budget.name}",
-                        message=f"Your spending has exceeded the budget limit of {limit}."
-                    )
-                elif spent > (limit * 0.9): # 90% Warning
-                    await notification_service.create_notification(
-                        user_id=user_id,
-                        notification_type=NotificationType.BUDGET_WARNING,
-                        title=f"Budget Warning: {budget.name}",
-                        message=f"You have used over 90% of your budget limit for {budget.name}."
-                    )
+        # 2. Check for Budget Breaches (only budgets this expense touches)
+        await BudgetService(self.db).track_spend(user_id, deltas)
+
+        # 3. Score against the category's usual amounts
+        await AnomalyService(self.db).observe_expense(expense)
+
+        # 4. Label example for nearest-neighbour categorization
+        await EmbeddingCategorizer(self.db).add_example(
+            user_id, cast(Any, expense.description), cast(Any, expense.category_id)
+        )
 
         await self.db.commit()
         await self.db.refresh(expense)
+        # Not a column: only reported on the create response
+        cast(Any, expense).duplicate_of = duplicates.get(fingerprint)
+        await category_memo.learn(user_id, cast(Any, expense.description), expense.category_id)
         return expense
     
+    async def _get_by_idempotency_key(self, user_id: int, idempotency_key: str) -> Optional[Expense]:
+        result = await self.db.execute(
+            select(Expense).where(
+                Expense.user_id == user_id,
+                Expense.idempotency_key == idempotency_key
+            )
+        )
+        return result.scalar_one_or_none()
+    
+    async def find_duplicates(self, user_id: int, fingerprints: Iterable[str]) -> Dict[str, int]:
+        """Map each fingerprint that already exists for the user to its oldest expense id"""
+        unique = set(fingerprints)
+        if not unique:
+            return {}
+        result = await self.db.execute(
+            select(Expense.fingerprint, func.min(Expense.id))
+            .where(Expense.user_id == user_id, Expense.fingerprint.in_(unique))
+            .group_by(Expense.fingerprint)
+        )
+        return {fingerprint: expense_id for fingerprint, expense_id in result.all()}
+    
+    async def find_duplicate_rows(self, user_id: int, rows: List[dict]) -> Dict[int, int]:
+        """
+        Fingerprint bulk rows in place (defaulting missing dates to now) and
+        look up existing matches in one query. Returns {row index: existing id}.
+        """
+        now = datetime.utcnow()
+        for row in rows:
+            row["date"] = row.get("date") or now
+            row["fingerprint"] = expense_fingerprint(
+                user_id, row["amount"], row["date"], row.get("description")
+            )
+        existing = await self.find_duplicates(user_id, [row["fingerprint"] for row in rows])
+        return {
+            index: existing[row["fingerprint"]]
+            for index, row in enumerate(rows)
+            if row["fingerprint"] in existing
+        }
+    
+    async def bulk_create_expenses(
+        self,
+        user_id: int,
+        items: List[ExpenseCreate]
+    ) -> ExpenseBulkCreateResponse:
+        """
+        Create many expenses in one transaction (offline sync catch-up).
+        
+        Category ownership is checked with a single lookup; items pointing at
+        someone else's (or a missing) category, and items matching an existing
+        expense's fingerprint (a re-sent sync), are reported and skipped while
+        the rest are inserted together. One summarizing event is logged.
+        """
+        from app.services.event_service import EventService
+        from app.models.event import EventType
+        
+        category_ids = {item.category_id for item in items if item.category_id is not None}
+        owned_ids: set = set()
+        if category_ids:
+            result = await self.db.execute(
+                select(Category.id).where(
+                    Category.user_id == user_id,
+                    Category.id.in_(category_ids)
+                )
+            )
+            owned_ids = set(result.scalars().all())
+        
+        results = [ExpenseBulkItemResult(index=index) for index in range(len(items))]
+        valid = []
+        for index, item in enumerate(items):
+            if item.category_id is not None and item.category_id not in owned_ids:
+                results[index].error = "Category not found"
+                continue
+            valid.append((index, item.model_dump()))
+        
+        duplicates = await self.find_duplicate_rows(user_id, [row for _, row in valid])
+        for position, existing_id in duplicates.items():
+            index = valid[position][0]
+            results[index].error = f"Duplicate of expense {existing_id}"
+            results[index].duplicate_of = existing_id
+        valid = [entry for position, entry in enumerate(valid) if position not in duplicates]
+        
+        expense_ids = await self.bulk_insert_expenses(user_id, [row for _, row in valid])
+        for (index, _), expense_id in zip(valid, expense_ids):
+            results[index].id = expense_id
+        
+        if expense_ids:
+            await EventService(self.db).log_event(
+                user_id=user_id,
+                event_type=EventType.EXPENSE_CREATED,
+                description=f"{len(expense_ids)} expenses created",
+                event_metadata={"expense_ids": expense_ids}
+            )
+            await self.db.commit()
+        
+        return ExpenseBulkCreateResponse(
+            created=len(expense_ids),
+            failed=len(items) - len(expense_ids),
+            results=results
+        )
+    
+    async def bulk_insert_expenses(self, user_id: int, rows: List[dict]) -> List[int]:
+        """
+        Insert already-validated expense rows with multi-row INSERTs.
+        
+        The rollup is updated once for the whole set and budgets are evaluated
+        once per affected budget; categorized rows become nearest-neighbour
+        examples in batched upserts. Returns the new ids in input order; the
+        caller commits.
+        """
+        if not rows:
+            return []
+        
+        now = datetime.utcnow()
+        values = [
+            {
+                "user_id": user_id,
+                "amount": float(row["amount"]),
+                "description": row.get("description"),
+                "notes": row.get("notes"),
+                "category_id": row.get("category_id"),
+                "date": row.get("date") or now,
+                "tags": row.get("tags"),
+                "source": row.get("source") or ExpenseSource.MANUAL,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for row in rows
+        ]
+        # Core inserts skip the ORM flush hook that stamps change_seq
+        change_seq = await self.db.run_sync(next_change_seq, user_id)
+        for value, row in zip(values, rows):
+            value["change_seq"] = change_seq
+            value["fingerprint"] = row.get("fingerprint") or expense_fingerprint(
+                user_id, value["amount"], value["date"], value["description"]
+            )
+        result = await self.db.execute(
+            insert(Expense).returning(Expense.id, sort_by_parameter_order=True),
+            values
+        )
+        expense_ids = [row[0] for row in result.all()]
+        
+        deltas: RollupDeltas = {}
+        for value in values:
+            add_delta(deltas, rollup_key(value["date"], value["category_id"]), value["amount"], 1)
+        await RollupService(self.db).apply(user_id, deltas)
+        await BudgetService(self.db).track_spend(user_id, deltas)
+        await AnomalyService(self.db).observe_rows(user_id, values)
+        await EmbeddingCategorizer(self.db).add_examples(
+            user_id, [(value["description"], value["category_id"]) for value in values]
+        )
+        
+        return expense_ids
+    
     async def update_expense(
         self,
         expense_id: int,
@@ -156,9 +518,38 @@ class ExpenseService:
         if not expense:
             return None
         
+        deltas: RollupDeltas = {}
+        add_delta(
+            deltas,
+            rollup_key(cast(Any, expense.date), cast(Any, expense.category_id)),
+            -float(cast(Any, expense.amount)),
+            -1
+        )
+        
         update_data = expense_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(expense, field, value)
+        if update_data.keys() & {"amount", "date", "description"}:
+            cast(Any, expense).fingerprint = expense_fingerprint(
+                user_id,
+                cast(Any, expense.amount),
+                cast(Any, expense.date),
+                cast(Any, expense.description)
+            )
+        
+        add_delta(
+            deltas,
+            rollup_key(cast(Any, expense.date), cast(Any, expense.category_id)),
+            float(cast(Any, expense.amount)),
+            1
+        )
+        await RollupService(self.db).apply(user_id, deltas)
+        
+        await BudgetService(self.db).track_spend(user_id, deltas)
+        if "category_id" in update_data:
+            await EmbeddingCategorizer(self.db).add_example(
+                user_id, cast(Any, expense.description), cast(Any, expense.category_id)
+            )
         
         # Log Event
         from app.services.event_service import EventService
@@ -173,6 +564,9 @@ class ExpenseService:
 
         await self.db.commit()
         await self.db.refresh(expense)
+        if "category_id" in update_data:
+            # A corrected category is the strongest signal for the memo
+            await category_memo.learn(user_id, cast(Any, expense.description), expense.category_id)
         return expense
     
     async def delete_expense(self, expense_id: int, user_id: int) -> bool:
@@ -191,50 +585,107 @@ class ExpenseService:
             description=f"Expense {expense_id} deleted"
         )
 
+        deltas = await RollupService(self.db).record_expense(expense, sign=-1)
+        await BudgetService(self.db).track_spend(user_id, deltas)
         await self.db.delete(expense)
         await self.db.commit()
         return True
     
     async def bulk_delete_expenses(self, expense_ids: List[int], user_id: int) -> int:
-        """Bulk delete expenses"""
-        deleted_count = 0
-        for expense_id in expense_ids:
-            if await self.delete_expense(expense_id, user_id):
-                deleted_count += 1
-        return deleted_count
-
-    async def export_csv(self, user_id: int):
-        """Export expenses as CSV"""
-        import csv
-        import io
-        from fastapi.responses import StreamingResponse
+        """
+        Bulk delete expenses in one transaction.
+        
+        A single ownership-checked DELETE ... RETURNING removes the rows; the
+        rollup and budget counters are adjusted from the returned values and
+        one summarizing event is logged. Ids the user does not own are ignored.
+        """
+        ids = list(dict.fromkeys(expense_ids))
+        if not ids:
+            return 0
+        if len(ids) > BULK_DELETE_LIMIT:
+            raise BadRequestException(
+                f"Cannot delete more than {BULK_DELETE_LIMIT} expenses at once"
+            )
         
+        owned = and_(Expense.user_id == user_id, Expense.id.in_(ids))
+        # Splits have no ON DELETE CASCADE, and a bulk DELETE skips ORM cascades
+        await self.db.execute(
+            delete(ExpenseSplit)
+            .where(ExpenseSplit.expense_id.in_(select(Expense.id).where(owned)))
+            .execution_options(synchronize_session=False)
+        )
         result = await self.db.execute(
-            select(Expense, Category.name)
-            .outerjoin(Category, Expense.category_id == Category.id)
-            .where(Expense.user_id == user_id)
-            .order_by(Expense.date.desc())
+            delete(Expense)
+            .where(owned)
+            .returning(Expense.id, Expense.date, Expense.category_id, Expense.amount)
+            .execution_options(synchronize_session=False)
         )
-        data = result.all()
+        deleted = result.all()
+        if not deleted:
+            return 0
+        
+        deltas: RollupDeltas = {}
+        for row in deleted:
+            add_delta(deltas, rollup_key(row.date, row.category_id), -float(row.amount), -1)
+        await RollupService(self.db).apply(user_id, deltas)
+        await BudgetService(self.db).track_spend(user_id, deltas)
         
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(["Date", "Description", "Amount", "Category", "Payment Method"])
+        change_seq = await self.db.run_sync(next_change_seq, user_id)
+        await self.db.execute(insert(Tombstone), [
+            {"user_id": user_id, "entity": "expenses", "entity_id": row.id, "change_seq": change_seq}
+            for row in deleted
+        ])
+        
+        from app.services.event_service import EventService
+        from app.models.event import EventType
+        await EventService(self.db).log_event(
+            user_id=user_id,
+            event_type=EventType.EXPENSE_DELETED,
+            description=f"{len(deleted)} expenses deleted",
+            event_metadata={"expense_ids": [row.id for row in deleted]}
+        )
+        
+        await self.db.commit()
+        return len(deleted)
+
+    async def export_csv(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_id: Optional[int] = None,
+        compress: bool = False
+    ):
+        """
+        Export expenses as a streamed CSV (optionally gzipped).
+        
+        Rows are read through a server-side cursor in EXPORT_BATCH_SIZE
+        partitions and encoded batch by batch, so memory use stays flat
+        regardless of history length.
+        """
+        from fastapi.responses import StreamingResponse
+        
+        filters = self._build_filters(user_id, category_id, start_date, end_date)
+        query = (
+            select(Expense.date, Expense.description, Expense.amount, Category.name, Expense.source)
+            .outerjoin(Category, Expense.category_id == Category.id)
+            .where(*filters)
+            .order_by(Expense.date.desc(), Expense.id.desc())
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
         
-        for expense, category_name in data:
-            writer.writerow([
-                expense.date.isoformat(),
-                expense.description,
-                expense.amount,
-                category_name or "Uncategorized",
-                expense.payment_method
-            ])
+        chunks: AsyncIterator[Any] = _stream_csv(query)
+        filename = f"expenses_{datetime.now().strftime('%Y%m%d')}.csv"
+        media_type = "text/csv"
+        if compress:
+            chunks = _gzip_chunks(chunks)
+            filename += ".gz"
+            media_type = "application/gzip"
         
-        output.seek(0)
         return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename=expenses_{datetime.now().strftime('%Y%m%d')}.csv"}
+            chunks,
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
 
     async def export_pdf(self, user_id: int):
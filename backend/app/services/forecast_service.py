@@ -0,0 +1,286 @@
+"""
+Spending Forecast Service
+"""
+import calendar
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import Optional, Dict, List, Tuple, Any
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.models.category import Category
+from app.models.daily_spend import DailySpend, UNCATEGORIZED
+from app.models.sync import SyncVersion
+from app.schemas.analytics import ForecastResponse, CategoryForecast
+from app.utils.logger import logger
+
+# Days of daily history the models are fitted on (ending yesterday)
+LOOKBACK_DAYS = 182
+
+# Smoothing factor of the exponentially weighted level
+EWMA_ALPHA = 0.1
+
+# Coverage of the prediction intervals
+FORECAST_INTERVAL = 0.8
+
+# History needed before the first backtest origin
+BACKTEST_WARMUP_DAYS = 28
+
+# Series per process-pool task in batch mode
+FORECAST_CHUNK_SIZE = 2000
+
+# Category id of the per-user total series
+TOTAL_SERIES = -1
+
+
+def next_month(today: date) -> Tuple[date, int]:
+    """First day and length of the calendar month after `today`"""
+    start = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return start, calendar.monthrange(start.year, start.month)[1]
+
+
+def build_history(
+    user_ids: np.ndarray,
+    category_ids: np.ndarray,
+    day_index: np.ndarray,
+    totals: np.ndarray,
+    days: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Dense (series x day) spend matrix from rollup rows.
+
+    Rows are every (user, category) pair, sorted, followed by one total
+    series per user. Returns the matrix and each row's user and category id
+    (TOTAL_SERIES for the totals).
+    """
+    pair_keys = (user_ids.astype(np.int64) << 32) | category_ids.astype(np.int64)
+    pairs, pair_index = np.unique(pair_keys, return_inverse=True)
+    users, user_index = np.unique(user_ids, return_inverse=True)
+
+    history = np.zeros((len(pairs) + len(users), days))
+    np.add.at(history, (pair_index, day_index), totals)
+    np.add.at(history, (len(pairs) + user_index, day_index), totals)
+
+    series_users = np.concatenate([pairs >> 32, users]).astype(np.int64)
+    series_categories = np.concatenate([
+        pairs & 0xFFFFFFFF,
+        np.full(len(users), TOTAL_SERIES, dtype=np.int64)
+    ])
+    return history, series_users, series_categories
+
+
+def forecast_series(
+    history: np.ndarray,
+    history_start: date,
+    horizon_start: date,
+    horizon_days: int,
+    interval: float = FORECAST_INTERVAL
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Forecast total spend over a horizon for every row of a (series x day) matrix.
+
+    Averages three models, each vectorized across series: seasonal naive
+    (last week repeated), an exponentially weighted level, and that level
+    scaled by the series' weekday profile. Intervals are empirical quantiles
+    of the ensemble's errors on rolling backtests of the same horizon length
+    over the history. Returns (predicted, lower, upper) arrays.
+    """
+    y = np.asarray(history, dtype=np.float64)
+    n_days = y.shape[1]
+    origins = np.arange(max(BACKTEST_WARMUP_DAYS, 7), n_days - horizon_days + 1)
+    if not len(origins):
+        raise ValueError(f"Need at least {BACKTEST_WARMUP_DAYS + horizon_days} days of history")
+
+    weekdays = (history_start.weekday() + np.arange(n_days)) % 7
+    # Weekday counts of a horizon starting on each weekday
+    window_counts = np.stack([
+        np.bincount((first + np.arange(horizon_days)) % 7, minlength=7)
+        for first in range(7)
+    ])
+    horizon_counts = window_counts[horizon_start.weekday()]
+    cumulative = np.concatenate([np.zeros((y.shape[0], 1)), y.cumsum(axis=1)], axis=1)
+
+    # Exponentially weighted level after each day
+    level = np.empty_like(y)
+    current = y[:, :7].mean(axis=1)
+    for day in range(n_days):
+        current = EWMA_ALPHA * y[:, day] + (1 - EWMA_ALPHA) * current
+        level[:, day] = current
+
+    # Weekday profile: mean spend per weekday relative to the overall mean
+    weekday_means = np.stack([y[:, weekdays == wd].mean(axis=1) for wd in range(7)], axis=1)
+    overall = y.mean(axis=1, keepdims=True)
+    profile = np.divide(weekday_means, overall, out=np.ones_like(weekday_means), where=overall > 0)
+
+    # Backtests: forecast [o, o + horizon) from the history before each origin o.
+    # The weekday profile uses the full history, which is slightly optimistic.
+    weeks, extra = divmod(horizon_days, 7)
+    last_week = cumulative[:, origins] - cumulative[:, origins - 7]
+    naive_bt = weeks * last_week + cumulative[:, origins - 7 + extra] - cumulative[:, origins - 7]
+    ewma_bt = horizon_days * level[:, origins - 1]
+    weekday_bt = level[:, origins - 1] * (profile @ window_counts[weekdays[origins]].T)
+    actual = cumulative[:, origins + horizon_days] - cumulative[:, origins]
+    errors = actual - (naive_bt + ewma_bt + weekday_bt) / 3
+
+    # Final forecast, aligning last week's days with the horizon by weekday
+    by_weekday = np.empty((y.shape[0], 7))
+    by_weekday[:, weekdays[-7:]] = y[:, -7:]
+    naive = by_weekday @ horizon_counts
+    ewma = horizon_days * level[:, -1]
+    weekday = level[:, -1] * (profile @ horizon_counts)
+    predicted = (naive + ewma + weekday) / 3
+
+    tail = (1 - interval) / 2
+    low_error, high_error = np.quantile(errors, [tail, 1 - tail], axis=1)
+    predicted = np.maximum(predicted, 0.0)
+    lower = np.clip(predicted + low_error, 0.0, predicted)
+    upper = np.maximum(predicted + high_error, predicted)
+    return predicted, lower, upper
+
+
+def _forecast_chunks(
+    history: np.ndarray,
+    history_start: date,
+    horizon_start: date,
+    horizon_days: int,
+    max_workers: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Run forecast_series over row chunks in a process pool"""
+    run = partial(
+        forecast_series,
+        history_start=history_start,
+        horizon_start=horizon_start,
+        horizon_days=horizon_days
+    )
+    chunks = [
+        history[offset:offset + FORECAST_CHUNK_SIZE]
+        for offset in range(0, len(history), FORECAST_CHUNK_SIZE)
+    ]
+    if len(chunks) == 1 or multiprocessing.current_process().daemon:
+        # Daemonic processes (e.g. Celery prefork workers) cannot start children
+        results = [run(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(run, chunks))
+    predicted, lower, upper = (np.concatenate(parts) for parts in zip(*results))
+    return predicted, lower, upper
+
+
+class ForecastService:
+    """Next-month spending forecasts from the daily_spend rollup"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def forecast_user(self, user_id: int) -> ForecastResponse:
+        """Forecast one user's next calendar month, in total and per category"""
+        forecasts = await self._forecast(user_id)
+        return forecasts.get(user_id) or self._empty_forecast()
+
+    async def precompute_all(self, max_workers: Optional[int] = None) -> int:
+        """
+        Forecast every user with recent spend and store the results in the
+        analytics cache under their current generation, so daytime requests
+        are cache hits. Returns the number of users forecast.
+        """
+        from app.services.analytics_cache import analytics_cache, analytics_cache_key
+
+        forecasts = await self._forecast(max_workers=max_workers)
+        result = await self.db.execute(
+            select(SyncVersion.user_id, SyncVersion.seq)
+            .where(SyncVersion.user_id.in_(list(forecasts)))
+        )
+        generations = {row.user_id: int(row.seq) for row in result}
+
+        for user_id, forecast in forecasts.items():
+            key = analytics_cache_key(user_id, generations.get(user_id, 0), "forecast")
+            await analytics_cache.set(key, forecast.model_dump(mode="json"))
+        return len(forecasts)
+
+    async def _forecast(
+        self,
+        user_id: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[int, ForecastResponse]:
+        """Load the history in one query and forecast one user, or all of them"""
+        today = datetime.utcnow().date()
+        history_start = today - timedelta(days=LOOKBACK_DAYS)
+        horizon_start, horizon_days = next_month(today)
+
+        query = (
+            select(DailySpend.user_id, DailySpend.category_id, Category.name, DailySpend.day, DailySpend.total)
+            .outerjoin(Category, DailySpend.category_id == Category.id)
+            .where(DailySpend.day >= history_start, DailySpend.day < today)
+        )
+        if user_id is not None:
+            query = query.where(DailySpend.user_id == user_id)
+        rows = (await self.db.execute(query)).all()
+        if not rows:
+            return {}
+
+        user_ids, category_ids, names, days, totals = zip(*rows)
+        history, series_users, series_categories = build_history(
+            np.array(user_ids, dtype=np.int64),
+            np.array(category_ids, dtype=np.int64),
+            np.array([(day - history_start).days for day in days]),
+            np.array(totals, dtype=np.float64),
+            LOOKBACK_DAYS
+        )
+        if user_id is not None:
+            predicted, lower, upper = forecast_series(history, history_start, horizon_start, horizon_days)
+        else:
+            predicted, lower, upper = _forecast_chunks(
+                history, history_start, horizon_start, horizon_days, max_workers
+            )
+        logger.info(f"Forecast {len(history)} spend series")
+
+        category_names = dict(zip(category_ids, names))
+        period_end = horizon_start + timedelta(days=horizon_days - 1)
+        forecasts: Dict[int, ForecastResponse] = {}
+        categories: Dict[int, List[CategoryForecast]] = {}
+        for index, (uid, category_id) in enumerate(zip(series_users.tolist(), series_categories.tolist())):
+            if category_id != TOTAL_SERIES:
+                categories.setdefault(uid, []).append(CategoryForecast(
+                    category_id=category_id if category_id != UNCATEGORIZED else None,
+                    category_name=category_names.get(category_id) or "Uncategorized",
+                    predicted_amount=float(predicted[index]),
+                    lower_bound=float(lower[index]),
+                    upper_bound=float(upper[index])
+                ))
+                continue
+
+            # All category rows precede the totals, so the list is complete
+            forecasts[uid] = ForecastResponse(
+                predicted_amount=float(predicted[index]),
+                confidence=self._confidence(predicted[index], lower[index], upper[index]),
+                based_on_months=LOOKBACK_DAYS // 30,
+                lower_bound=float(lower[index]),
+                upper_bound=float(upper[index]),
+                interval=FORECAST_INTERVAL,
+                period_start=horizon_start,
+                period_end=period_end,
+                categories=sorted(categories.get(uid, []), key=lambda c: c.predicted_amount, reverse=True)
+            )
+        return forecasts
+
+    @staticmethod
+    def _confidence(predicted: Any, lower: Any, upper: Any) -> float:
+        """1 for a point forecast, falling towards 0 as the interval widens"""
+        if predicted <= 0:
+            return 0.0
+        return float(np.clip(1 - (upper - lower) / (2 * predicted), 0.0, 1.0))
+
+    def _empty_forecast(self) -> ForecastResponse:
+        horizon_start, horizon_days = next_month(datetime.utcnow().date())
+        return ForecastResponse(
+            predicted_amount=0.0,
+            confidence=0.0,
+            based_on_months=LOOKBACK_DAYS // 30,
+            interval=FORECAST_INTERVAL,
+            period_start=horizon_start,
+            period_end=horizon_start + timedelta(days=horizon_days - 1)
+        )
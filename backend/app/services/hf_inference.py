@@ -0,0 +1,61 @@
+"""
+Async Hugging Face Inference
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Any
+
+from huggingface_hub import InferenceClient
+
+from app.core.config import settings
+
+
+class AsyncInference:
+    """
+    Awaitable wrapper around the blocking `InferenceClient`.
+
+    Calls run on a dedicated thread pool, so a slow model never blocks the
+    event loop. `max_concurrency` threads cap the in-flight requests per
+    worker; further calls queue for a thread. Each call, queueing included,
+    is bounded by `timeout` seconds and raises asyncio.TimeoutError past it.
+    The HTTP request itself carries the same timeout, so an abandoned call
+    frees its thread shortly after.
+    """
+
+    def __init__(self, token: str, max_concurrency: int, timeout: float):
+        self.timeout = timeout
+        self.client = InferenceClient(token=token, timeout=timeout)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="hf-inference"
+        )
+
+    async def run(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Call `InferenceClient.<method>` off the event loop"""
+        loop = asyncio.get_running_loop()
+        call = partial(getattr(self.client, method), *args, **kwargs)
+        # Cancelling a queued future on timeout also keeps it from ever starting
+        return await asyncio.wait_for(loop.run_in_executor(self._executor, call), self.timeout)
+
+    async def zero_shot_classification(self, *args: Any, **kwargs: Any) -> Any:
+        return await self.run("zero_shot_classification", *args, **kwargs)
+
+    async def summarization(self, *args: Any, **kwargs: Any) -> Any:
+        return await self.run("summarization", *args, **kwargs)
+
+    async def feature_extraction(self, *args: Any, **kwargs: Any) -> Any:
+        return await self.run("feature_extraction", *args, **kwargs)
+
+    def shutdown(self) -> None:
+        """Stop the thread pool without waiting for calls still in flight"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+hf_inference: Optional[AsyncInference] = None
+if settings.HF_API_KEY:
+    hf_inference = AsyncInference(
+        token=settings.HF_API_KEY,
+        max_concurrency=settings.HF_MAX_CONCURRENCY,
+        timeout=settings.HF_INFERENCE_TIMEOUT,
+    )
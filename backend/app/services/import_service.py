@@ -0,0 +1,288 @@
+"""
+Bank Statement Import Service
+"""
+import csv
+import os
+import tempfile
+from itertools import islice
+from typing import Optional, Dict, List, Tuple, Iterator, Any, cast
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+
+from app.core.exceptions import BadRequestException
+from app.models.category import Category
+from app.models.expense import ExpenseSource
+from app.models.import_job import ImportJob, ImportStatus
+from app.schemas.import_job import ImportProfile
+from app.services.expense_service import ExpenseService
+from app.utils.logger import logger
+
+# Rows parsed, categorized and inserted per transaction
+IMPORT_BATCH_SIZE = 5000
+
+# Bytes copied per read while spooling an upload to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Tried in order when a profile has no date_format
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%d/%m/%y",
+    "%d-%m-%Y",
+    "%m/%d/%Y",
+    "%d %b %Y",
+    "%d-%b-%Y",
+    "%d-%b-%y",
+)
+
+IMPORT_PROFILES: Dict[str, ImportProfile] = {
+    "generic": ImportProfile(
+        date_column="Date",
+        description_column="Description",
+        amount_column="Amount",
+    ),
+    "hdfc": ImportProfile(
+        date_column="Date",
+        description_column="Narration",
+        debit_column="Withdrawal Amt.",
+        credit_column="Deposit Amt.",
+        date_format="%d/%m/%y",
+    ),
+    "sbi": ImportProfile(
+        date_column="Txn Date",
+        description_column="Description",
+        debit_column="Debit",
+        credit_column="Credit",
+        date_format="%d %b %Y",
+    ),
+}
+
+
+def resolve_profile(name: str, overrides: Optional[Dict[str, Any]] = None) -> ImportProfile:
+    """Look up a built-in profile and apply per-upload column overrides"""
+    profile = IMPORT_PROFILES.get(name)
+    if profile is None:
+        raise BadRequestException(
+            f"Unknown import profile '{name}'. Available: {', '.join(IMPORT_PROFILES)}"
+        )
+    updates = {key: value for key, value in (overrides or {}).items() if value is not None}
+    if updates:
+        profile = profile.model_copy(update=updates)
+    if not profile.amount_column and not profile.debit_column:
+        raise BadRequestException("Import profile needs an amount or debit column")
+    return profile
+
+
+def parse_amount(value: Optional[str]) -> Optional[float]:
+    """Parse a bank amount such as '1,234.50', '₹ 99' or '(20.00)'"""
+    if value is None:
+        return None
+    text = value.strip().replace(",", "")
+    for symbol in ("₹", "$", "€", "£", "Rs.", "INR", " "):
+        text = text.replace(symbol, "")
+    if not text:
+        return None
+    negative = text.startswith("(") and text.endswith(")")
+    try:
+        amount = float(text.strip("()"))
+    except ValueError:
+        return None
+    return -amount if negative else amount
+
+
+def parse_date(value: Optional[str], date_format: Optional[str] = None) -> Optional[datetime]:
+    """Parse a statement date with the profile's format, or the common ones"""
+    if not value or not value.strip():
+        return None
+    value = value.strip()
+    for fmt in (date_format,) if date_format else DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def spend_amount(record: Dict[str, Any], profile: ImportProfile) -> Optional[float]:
+    """Amount spent on a statement row, or None for credits and blank rows"""
+    if profile.debit_column:
+        debit = parse_amount(record.get(profile.debit_column))
+        return debit if debit and debit > 0 else None
+
+    amount = parse_amount(record.get(cast(str, profile.amount_column)))
+    if not amount:
+        return None
+    if profile.debits_negative:
+        return -amount if amount < 0 else None
+    return abs(amount)
+
+
+def _batches(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+class ImportService:
+    """Streams bank-statement CSVs into expenses in batches"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def start_import(
+        self,
+        user_id: int,
+        file: Any,
+        profile_name: str,
+        profile: ImportProfile
+    ) -> Tuple[ImportJob, str]:
+        """
+        Spool an upload to disk, check its header and create a pending job.
+        Returns the job and the spooled file path for `run_import_job`.
+        """
+        path = await _spool_upload(file)
+        try:
+            _check_header(path, profile)
+        except Exception:
+            os.remove(path)
+            raise
+
+        job = ImportJob(user_id=user_id, profile=profile_name, filename=file.filename)
+        self.db.add(job)
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job, path
+
+    async def get_job(self, job_id: int, user_id: int) -> Optional[ImportJob]:
+        """Get an import job owned by the user"""
+        result = await self.db.execute(
+            select(ImportJob).where(ImportJob.id == job_id, ImportJob.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def process_file(self, job: ImportJob, path: str, profile: ImportProfile) -> None:
+        """
+        Load a spooled CSV into expenses, IMPORT_BATCH_SIZE rows per transaction.
+
+        Rows are read lazily, so memory stays flat regardless of file size.
+        Descriptions are categorized with the rule-based matcher, memoized per
+        job since statements repeat merchants. Rows matching an existing
+        expense's fingerprint are skipped. Job counters are committed
+        with each batch, so progress always matches what has been imported.
+        """
+        from app.services.ai_service import AIService
+        from app.services.event_service import EventService
+        from app.models.event import EventType
+
+        progress = cast(Any, job)
+        user_id = progress.user_id
+        result = await self.db.execute(
+            select(Category.id, Category.name, Category.keywords).where(Category.user_id == user_id)
+        )
+        categories = result.all()
+        category_names = [str(row.name) for row in categories]
+        category_by_name = {str(row.name): row.id for row in categories}
+        merchant_rules = {str(row.name): row.keywords for row in categories}
+
+        ai_service = AIService(self.db)
+        expense_service = ExpenseService(self.db)
+        categorized: Dict[str, Optional[int]] = {}
+
+        with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+            reader = csv.DictReader(f, delimiter=profile.delimiter)
+            if reader.fieldnames:
+                reader.fieldnames = [name.strip() for name in reader.fieldnames]
+            for batch in _batches(iter(reader), IMPORT_BATCH_SIZE):
+                rows = []
+                for record in batch:
+                    amount = spend_amount(record, profile)
+                    expense_date = parse_date(record.get(profile.date_column), profile.date_format)
+                    if amount is None or expense_date is None:
+                        continue
+
+                    description = (record.get(profile.description_column) or "").strip()
+                    key = description.lower()
+                    if key not in categorized:
+                        name = ai_service._rule_based_categorization(description, category_names, merchant_rules)
+                        categorized[key] = category_by_name.get(name) if name else None
+
+                    rows.append({
+                        "amount": amount,
+                        "description": description[:255] or None,
+                        "notes": record.get(profile.notes_column) if profile.notes_column else None,
+                        "category_id": categorized[key],
+                        "date": expense_date,
+                        "source": ExpenseSource.IMPORT,
+                    })
+
+                # Re-imported statement rows match existing fingerprints
+                duplicates = await expense_service.find_duplicate_rows(user_id, rows)
+                rows = [row for index, row in enumerate(rows) if index not in duplicates]
+                imported = len(await expense_service.bulk_insert_expenses(user_id, rows))
+                progress.rows_processed += len(batch)
+                progress.rows_imported += imported
+                progress.rows_skipped += len(batch) - imported
+                await self.db.commit()
+
+        await EventService(self.db).log_event(
+            user_id=user_id,
+            event_type=EventType.EXPENSE_CREATED,
+            description=f"Imported {job.rows_imported} expenses from {job.filename or 'CSV'}",
+            event_metadata={"import_job_id": job.id, "imported": job.rows_imported}
+        )
+
+
+async def run_import_job(job_id: int, path: str, profile: ImportProfile) -> None:
+    """Background entry point: run a pending job in its own session, then remove the file"""
+    from app.db.database import async_session
+
+    try:
+        async with async_session() as session:
+            job = await session.get(ImportJob, job_id)
+            if job is None:
+                return
+            cast(Any, job).status = ImportStatus.RUNNING
+            await session.commit()
+
+            try:
+                await ImportService(session).process_file(job, path, profile)
+                cast(Any, job).status = ImportStatus.COMPLETED
+                await session.commit()
+            except Exception as e:
+                logger.error(f"Import job {job_id} failed: {e}")
+                await session.rollback()
+                # Batches committed before the failure stay imported
+                await session.execute(
+                    update(ImportJob)
+                    .where(ImportJob.id == job_id)
+                    .values(status=ImportStatus.FAILED, error=str(e)[:1000])
+                )
+                await session.commit()
+    finally:
+        os.remove(path)
+
+
+async def _spool_upload(file: Any) -> str:
+    """Copy an upload to a temp file in chunks so the job can outlive the request"""
+    fd, path = tempfile.mkstemp(prefix="import_", suffix=".csv")
+    with os.fdopen(fd, "wb") as out:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            out.write(chunk)
+    return path
+
+
+def _check_header(path: str, profile: ImportProfile) -> None:
+    """Fail fast when the file lacks the profile's columns"""
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        header = next(csv.reader(f, delimiter=profile.delimiter), None)
+    if not header:
+        raise BadRequestException("CSV file is empty")
+
+    required = [profile.date_column, profile.description_column]
+    required.append(cast(str, profile.debit_column or profile.amount_column))
+    missing = [column for column in required if column not in {h.strip() for h in header}]
+    if missing:
+        raise BadRequestException(f"CSV is missing columns: {', '.join(missing)}")
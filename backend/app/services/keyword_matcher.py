@@ -0,0 +1,135 @@
+"""
+Keyword Categorization Engine
+"""
+import re
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple, Iterable
+
+# Built-in keywords per spending concept; merchant names are the strongest
+# signal and generic words the weakest
+DEFAULT_KEYWORDS: Dict[str, Dict[str, float]] = {
+    "food": {
+        "food": 1.0, "restaurant": 1.0, "cafe": 1.0, "grocery": 1.0, "groceries": 1.0,
+        "lunch": 1.0, "dinner": 1.0, "breakfast": 1.0, "burger": 1.0, "pizza": 1.0,
+        "eat": 0.5, "swiggy": 2.0, "zomato": 2.0,
+    },
+    "transport": {
+        "taxi": 1.0, "fuel": 1.0, "bus": 1.0, "train": 1.0, "petrol": 1.0, "gas": 0.5,
+        "uber": 2.0, "ola": 2.0, "rapido": 2.0, "pathao": 2.0, "indriver": 2.0,
+    },
+    "shopping": {
+        "shopping": 1.0, "mall": 1.0, "store": 0.5, "buy": 0.5, "bought": 0.5, "purchase": 0.5,
+        "amazon": 2.0, "flipkart": 2.0, "myntra": 2.0, "daraz": 2.0,
+    },
+    "bills": {
+        "electricity": 1.0, "internet": 1.0, "bill": 1.0, "recharge": 1.0, "wifi": 1.0,
+        "broadband": 1.0, "water": 0.5, "phone": 0.5,
+    },
+    "entertainment": {
+        "movie": 1.0, "game": 1.0, "cinema": 1.0, "netflix": 2.0, "spotify": 2.0, "pvr": 2.0,
+    },
+    "health": {
+        "doctor": 1.0, "medicine": 1.0, "pharmacy": 1.0, "hospital": 1.0, "pharmeasy": 2.0,
+    },
+}
+
+# Weight of a category's own name appearing in the text
+CATEGORY_NAME_WEIGHT = 1.0
+
+# Weight of a user's merchant rule, so it outranks the built-in keywords
+MERCHANT_RULE_WEIGHT = 3.0
+
+
+def parse_merchant_rules(keywords: Optional[str]) -> List[str]:
+    """Split a category's comma-separated merchant rules"""
+    return [keyword.strip().lower() for keyword in (keywords or "").split(",") if keyword.strip()]
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation factored as a trie, so each text position costs one walk down it"""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: Dict[str, dict]) -> str:
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # Words ending here may also continue; the longer match is tried first
+    return f"(?:{body})?" if "" in node else body
+
+
+class KeywordMatcher:
+    """
+    Weighted keyword matcher compiled into a single regex.
+
+    Keywords match whole words (an optional plural "s"/"es" is allowed), so
+    "bus" no longer fires on "business" nor "ola" on "chocolate". Every hit
+    adds its weight to its labels and the highest total wins; ties go to the
+    label listed first. Build it once per rule set and reuse it.
+    """
+
+    def __init__(self, rules: Dict[str, Dict[str, float]]):
+        self._labels = {label: position for position, label in enumerate(rules)}
+        # keyword -> {label: weight}
+        self._targets: Dict[str, Dict[str, float]] = {}
+        for label, keywords in rules.items():
+            for keyword, weight in keywords.items():
+                targets = self._targets.setdefault(keyword.strip().lower(), {})
+                targets[label] = max(weight, targets.get(label, 0.0))
+        self._targets.pop("", None)
+        self._pattern = None
+        if self._targets:
+            self._pattern = re.compile(rf"\b({_trie_pattern(self._targets)})(?:e?s)?\b")
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Total keyword weight per label found in the text"""
+        totals: Dict[str, float] = {}
+        if self._pattern is None:
+            return totals
+        for match in self._pattern.finditer(text.lower()):
+            for label, weight in self._targets[match.group(1)].items():
+                totals[label] = totals.get(label, 0.0) + weight
+        return totals
+
+    def match(self, text: str) -> Optional[str]:
+        """Best label for the text, or None when no keyword matches"""
+        totals = self.scores(text)
+        if not totals:
+            return None
+        return max(totals, key=lambda label: (totals[label], -self._labels[label]))
+
+    def match_many(self, texts: Iterable[str]) -> List[Optional[str]]:
+        return [self.match(text) for text in texts]
+
+
+@lru_cache(maxsize=1024)
+def category_matcher(categories: Tuple[Tuple[str, str], ...]) -> KeywordMatcher:
+    """
+    Matcher for one user's categories, given as (name, merchant rules) pairs.
+
+    A category picks up the built-in keywords of every concept its name
+    contains ("Food & Dining" gets "food"), its own name and its merchant
+    rules. Cached, so it is compiled once per distinct category set.
+    """
+    rules: Dict[str, Dict[str, float]] = {}
+    for name, keywords in categories:
+        rule = rules.setdefault(name, {})
+        lowered = name.lower()
+        for concept, defaults in DEFAULT_KEYWORDS.items():
+            if concept in lowered:
+                rule.update(defaults)
+        rule[lowered] = max(CATEGORY_NAME_WEIGHT, rule.get(lowered, 0.0))
+        for keyword in parse_merchant_rules(keywords):
+            rule[keyword] = MERCHANT_RULE_WEIGHT
+    return KeywordMatcher(rules)
+
+
+# Category-agnostic matcher returning concept names ("food", "transport", ...)
+default_matcher = KeywordMatcher(DEFAULT_KEYWORDS)
@@ -7,6 +7,7 @@ from sqlalchemy import select, and_, update, func
 
 from typing import List, Any, cast
 from app.models.notification import Notification, NotificationType
+from app.models.sync import next_change_seq
 from app.schemas.notification import NotificationResponse
 
 
@@ -45,9 +46,10 @@ class NotificationService:
         user_id: int,
         notification_type: NotificationType,
         title: str,
-        message: str
+        message: str,
+        commit: bool = True
     ) -> Notification:
-        """Create a new notification"""
+        """Create a new notification (commit=False leaves it in the caller's transaction)"""
         notification = Notification(
             user_id=user_id,
             type=notification_type,
@@ -55,6 +57,8 @@ class NotificationService:
             message=message
         )
         self.db.add(notification)
+        if not commit:
+            return notification
         await self.db.commit()
         await self.db.refresh(notification)
         return notification
@@ -85,4 +89,6 @@ class NotificationService:
             .where(Notification.user_id == user_id)
             .values(is_read=True)
         )
+        # Core UPDATE skips the flush hook, so bump the ETag version here
+        await self.db.run_sync(next_change_seq, user_id)
         await self.db.commit()
@@ -0,0 +1,185 @@
+"""
+Spend Rollup Service
+"""
+from typing import Optional, Dict, Tuple, Any, cast
+from datetime import date, datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, delete, update, insert
+
+from app.models.expense import Expense
+from app.models.daily_spend import DailySpend, UNCATEGORIZED
+
+# (day, category_id) -> (amount delta, count delta)
+RollupDeltas = Dict[Tuple[date, int], Tuple[float, int]]
+
+
+def rollup_key(expense_date: datetime, category_id: Optional[int]) -> Tuple[date, int]:
+    """Map an expense's date and category to its rollup row key"""
+    return expense_date.date(), category_id or UNCATEGORIZED
+
+
+def add_delta(deltas: RollupDeltas, key: Tuple[date, int], amount: float, count: int) -> None:
+    """Accumulate a delta, merging changes that land on the same row"""
+    prev_amount, prev_count = deltas.get(key, (0.0, 0))
+    deltas[key] = (prev_amount + amount, prev_count + count)
+
+
+def expense_deltas(expense: Expense, sign: int = 1) -> RollupDeltas:
+    """Deltas for adding (sign=1) or removing (sign=-1) a single expense"""
+    deltas: RollupDeltas = {}
+    add_delta(
+        deltas,
+        rollup_key(cast(Any, expense.date), cast(Any, expense.category_id)),
+        sign * float(cast(Any, expense.amount)),
+        sign
+    )
+    return deltas
+
+
+class RollupService:
+    """Maintains the daily_spend rollup alongside expense writes"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record_expense(self, expense: Expense, sign: int = 1) -> RollupDeltas:
+        """Add (sign=1) or remove (sign=-1) a single expense from the rollup"""
+        deltas = expense_deltas(expense, sign)
+        await self.apply(cast(Any, expense.user_id), deltas)
+        return deltas
+
+    async def apply(self, user_id: int, deltas: RollupDeltas) -> None:
+        """
+        Apply deltas in the caller's transaction.
+
+        Uses a single multi-row upsert on PostgreSQL and SQLite, and
+        update-then-insert elsewhere.
+        """
+        rows = [
+            {
+                "user_id": user_id,
+                "day": day,
+                "category_id": category_id,
+                "total": amount,
+                "expense_count": count,
+            }
+            for (day, category_id), (amount, count) in deltas.items()
+            if amount or count
+        ]
+        if not rows:
+            return
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+            stmt = dialect_insert(DailySpend).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[DailySpend.user_id, DailySpend.day, DailySpend.category_id],
+                set_={
+                    "total": DailySpend.total + stmt.excluded.total,
+                    "expense_count": DailySpend.expense_count + stmt.excluded.expense_count,
+                }
+            )
+            await self.db.execute(stmt)
+            return
+
+        for row in rows:
+            result = await self.db.execute(
+                update(DailySpend)
+                .where(
+                    DailySpend.user_id == row["user_id"],
+                    DailySpend.day == row["day"],
+                    DailySpend.category_id == row["category_id"]
+                )
+                .values(
+                    total=DailySpend.total + row["total"],
+                    expense_count=DailySpend.expense_count + row["expense_count"]
+                )
+            )
+            if not cast(Any, result).rowcount:
+                await self.db.execute(insert(DailySpend).values(**row))
+
+    async def uncategorize(self, user_id: int, category_id: int) -> None:
+        """
+        Fold a category's rows into the uncategorized rows of the same days and
+        drop them, as when the category is deleted. Caller commits.
+        """
+        result = await self.db.execute(
+            select(DailySpend.day, DailySpend.total, DailySpend.expense_count).where(
+                DailySpend.user_id == user_id,
+                DailySpend.category_id == category_id
+            )
+        )
+        deltas: RollupDeltas = {}
+        for day, total, count in result:
+            add_delta(deltas, (day, UNCATEGORIZED), float(total), int(count))
+        await self.apply(user_id, deltas)
+        await self.db.execute(
+            delete(DailySpend).where(
+                DailySpend.user_id == user_id,
+                DailySpend.category_id == category_id
+            )
+        )
+
+    async def rebuild(self, user_id: Optional[int] = None) -> int:
+        """
+        Recompute the rollup from raw expenses for one user, or everyone.
+        Returns the number of rollup rows written. Caller commits.
+        """
+        delete_stmt = delete(DailySpend)
+        if user_id is not None:
+            delete_stmt = delete_stmt.where(DailySpend.user_id == user_id)
+        await self.db.execute(delete_stmt)
+
+        day = func.date(Expense.date)
+        category = func.coalesce(Expense.category_id, UNCATEGORIZED)
+        source = select(
+            Expense.user_id,
+            day,
+            category,
+            func.sum(Expense.amount),
+            func.count(Expense.id)
+        ).group_by(Expense.user_id, day, category)
+        if user_id is not None:
+            source = source.where(Expense.user_id == user_id)
+
+        await self.db.execute(
+            insert(DailySpend).from_select(
+                ["user_id", "day", "category_id", "total", "expense_count"],
+                source
+            )
+        )
+
+        count_query = select(func.count()).select_from(DailySpend)
+        if user_id is not None:
+            count_query = count_query.where(DailySpend.user_id == user_id)
+        result = await self.db.execute(count_query)
+        return int(result.scalar() or 0)
+
+    async def get_totals(
+        self,
+        user_id: int,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+        category_id: Optional[int] = None
+    ) -> Tuple[float, int]:
+        """Get (total, count) for a day range, optionally for one category"""
+        query = select(
+            func.sum(DailySpend.total),
+            func.sum(DailySpend.expense_count)
+        ).where(DailySpend.user_id == user_id)
+
+        if start_day:
+            query = query.where(DailySpend.day >= start_day)
+        if end_day:
+            query = query.where(DailySpend.day <= end_day)
+        if category_id:
+            query = query.where(DailySpend.category_id == category_id)
+
+        result = await self.db.execute(query)
+        row = result.one()
+        return float(row[0] or 0.0), int(row[1] or 0)
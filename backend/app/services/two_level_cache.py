@@ -0,0 +1,60 @@
+"""
+Two-Level (In-Process LRU + Redis) Cache
+"""
+import time
+from collections import OrderedDict
+from typing import Optional, Any, Tuple
+
+from app.services.redis_service import redis_service
+from app.utils.logger import logger
+
+
+class TwoLevelCache:
+    """
+    Two-level cache for JSON-ready values.
+
+    L1 is a small in-process LRU with a short TTL; L2 is Redis, shared by all
+    workers. Redis errors degrade to L1-only caching. `name` labels log lines.
+    """
+
+    def __init__(self, name: str, max_entries: int, l1_ttl: float, ttl: int):
+        self.name = name
+        self.max_entries = max_entries
+        self.l1_ttl = l1_ttl
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        try:
+            value = await redis_service.get_json(key)
+        except Exception as e:
+            logger.warning(f"{self.name} cache read failed: {e}")
+            return None
+        if value is not None:
+            self._remember(key, value)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._remember(key, value)
+        try:
+            await redis_service.set_json(key, value, expire=self.ttl)
+        except Exception as e:
+            logger.warning(f"{self.name} cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Drop the in-process entries (Redis entries expire on their own)"""
+        self._entries.clear()
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.l1_ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -6,6 +6,7 @@ from fastapi import UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.event_service import EventService
+from app.services.keyword_matcher import default_matcher
 from app.models.event import EventType
 
 
@@ -67,18 +68,7 @@ class VoiceService:
             "needs_confirmation": True
         }
         
-        # Simple category detection
-        categories_keywords = {
-            "food": ["food", "eat", "restaurant", "lunch", "dinner", "breakfast", "groceries"],
-            "transport": ["uber", "taxi", "bus", "train", "fuel", "gas", "petrol"],
-            "shopping": ["shopping", "bought", "purchase", "amazon", "store"],
-            "bills": ["bill", "electricity", "water", "internet", "phone"],
-        }
-        
-        text_lower = text.lower()
-        for category, keywords in categories_keywords.items():
-            if any(kw in text_lower for kw in keywords):
-                extracted["category_suggestion"] = category
-                break
+        # Same keyword engine as AIService, without the user's categories
+        extracted["category_suggestion"] = default_matcher.match(text)
         
         return extracted
@@ -2,18 +2,19 @@
 Celery Background Tasks
 """
 import asyncio
-from typing import Optional
+from typing import Any, Awaitable, Callable, Optional, TypeVar
 from app.core.celery_app import celery_app
 from app.services.email_service import email_service
 from app.utils.logger import logger
 
-@celery_app.task(name="app.tasks.send_email_task")
-def send_email_task(to: str, subject: str, html_content: str):
+T = TypeVar("T")
+
+
+def _run_coroutine(coro):
     """
-    Background task to send an email using Resend.
-    Ensures safe async execution even if an event loop is already running (e.g., in eager mode).
+    Run a coroutine to completion from a Celery task.
+    Uses a separate thread when an event loop is already running (eager mode inside FastAPI).
     """
-    import threading
     from concurrent.futures import ThreadPoolExecutor
 
     def run_async(coro):
@@ -25,6 +26,55 @@ def send_email_task(to: str, subject: str, html_content: str):
         finally:
             new_loop.close()
 
+    # Try to get the current loop
+    loop = None
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+
+    if loop and loop.is_running():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(run_async, coro).result()
+    # No running loop, just create one and run (standard sync context)
+    return asyncio.run(coro)
+
+
+def _with_session(fn: Callable[[Any], Awaitable[T]], action: str) -> T:
+    """
+    Run `fn(session)` on a fresh engine, commit and log the outcome.
+    Batch tasks use their own engine because the app's pooled connections
+    belong to another event loop. `action` reads like "rebuild spending stats".
+    """
+    from sqlalchemy.pool import NullPool
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from app.core.config import settings
+
+    async def run() -> T:
+        engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                result = await fn(session)
+                await session.commit()
+                return result
+        finally:
+            await engine.dispose()
+
+    try:
+        result = _run_coroutine(run())
+        logger.info(f"Finished: {action} ({result})")
+        return result
+    except Exception as e:
+        logger.error(f"Failed to {action}: {e}")
+        raise
+
+
+@celery_app.task(name="app.tasks.send_email_task")
+def send_email_task(to: str, subject: str, html_content: str):
+    """
+    Background task to send an email using Resend.
+    Ensures safe async execution even if an event loop is already running (e.g., in eager mode).
+    """
     try:
         # Check if we should even send emails
         from app.core.config import settings
@@ -32,24 +82,65 @@ def send_email_task(to: str, subject: str, html_content: str):
             logger.info("Email notifications are disabled. Skipping.")
             return "Email notifications disabled"
 
-        # Try to get the current loop
-        loop = None
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            pass
-
-        if loop and loop.is_running():
-            # If a loop is already running (common in eager mode within FastAPI),
-            # run the async work in a separate thread.
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(run_async, email_service.send_email(to, subject, html_content))
-                future.result()
-        else:
-            # No running loop, just create one and run (standard sync context)
-            asyncio.run(email_service.send_email(to, subject, html_content))
+        _run_coroutine(email_service.send_email(to, subject, html_content))
             
         return f"Email task processed for {to}"
     except Exception as e:
         logger.error(f"Failed to send email task: {e}")
         return f"Failed to send email to {to}: {e}"
+
+
+@celery_app.task(name="app.tasks.rebuild_spend_rollup_task")
+def rebuild_spend_rollup_task(user_id: Optional[int] = None):
+    """
+    Rebuild the daily_spend rollup from raw expenses.
+    Backfills new installs and repairs drift; pass user_id to limit it to one user.
+    """
+    from app.services.rollup_service import RollupService
+
+    return _with_session(
+        lambda session: RollupService(session).rebuild(user_id),
+        "rebuild daily_spend rollup"
+    )
+
+
+@celery_app.task(name="app.tasks.precompute_forecasts_task")
+def precompute_forecasts_task(max_workers: Optional[int] = None):
+    """
+    Nightly batch: forecast every user's next month and warm the analytics cache.
+    The models run across a process pool when the worker can start one.
+    """
+    from app.services.forecast_service import ForecastService
+
+    return _with_session(
+        lambda session: ForecastService(session).precompute_all(max_workers),
+        "precompute spending forecasts"
+    )
+
+
+@celery_app.task(name="app.tasks.rebuild_spending_stats_task")
+def rebuild_spending_stats_task(user_id: Optional[int] = None):
+    """
+    Rebuild the anomaly detector's spending statistics from raw expenses.
+    Initializes new installs and resets drift; pass user_id to limit it to one user.
+    """
+    from app.services.anomaly_service import AnomalyService
+
+    return _with_session(
+        lambda session: AnomalyService(session).rebuild(user_id),
+        "rebuild spending stats"
+    )
+
+
+@celery_app.task(name="app.tasks.rebuild_category_examples_task")
+def rebuild_category_examples_task(user_id: Optional[int] = None):
+    """
+    Rebuild the nearest-neighbour categorizer's labelled examples from expenses.
+    Backfills new installs; pass user_id to limit it to one user.
+    """
+    from app.services.embedding_categorizer import EmbeddingCategorizer
+
+    return _with_session(
+        lambda session: EmbeddingCategorizer(session).rebuild(user_id),
+        "rebuild category examples"
+    )
@@ -0,0 +1,217 @@
+"""
+AI Service Tests
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.models import User, Category
+from app.models.goal import Goal  # noqa: F401 - registers the User.goals mapper
+from app.schemas.expense import ExpenseCreate
+from app.services.ai_service import AIService
+from app.services.category_memo import category_memo, normalize_description
+from app.services.embedding_categorizer import EmbeddingCategorizer, clear_indexes, embed
+from app.services.expense_service import ExpenseService
+from app.services.hf_inference import AsyncInference
+from app.services.keyword_matcher import category_matcher, default_matcher
+
+
+class SlowClient:
+    def zero_shot_classification(self, text, candidate_labels, model=None):
+        time.sleep(0.3)
+        return {"labels": candidate_labels, "scores": [0.9]}
+
+
+@pytest.mark.asyncio
+async def test_inference_runs_off_the_event_loop():
+    """Test that a slow model call neither blocks other coroutines nor outlives its timeout"""
+    inference = AsyncInference(token="test", max_concurrency=2, timeout=1.0)
+    inference.client = SlowClient()
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    output, _ = await asyncio.gather(
+        inference.zero_shot_classification(text="Uber ride", candidate_labels=["Transport"]),
+        ticker()
+    )
+    assert output["labels"] == ["Transport"]
+    assert ticks[-1] - ticks[0] < 0.25  # Ticked while the model call was running
+
+    inference.timeout = 0.05
+    with pytest.raises(asyncio.TimeoutError):
+        await inference.zero_shot_classification(text="Uber ride", candidate_labels=["Transport"])
+    inference.shutdown()
+
+
+def test_keyword_matcher_word_boundaries_and_merchant_rules():
+    """Test whole-word matching, weights and user merchant rules"""
+    matcher = category_matcher((
+        ("Food & Dining", ""),
+        ("Transport", ""),
+        ("Shopping", "blinkit, big bazaar"),
+    ))
+    assert matcher.match("Business lunch") == "Food & Dining"  # Not "bus"
+    assert matcher.match("Hot chocolate") is None  # Not "ola"
+    assert matcher.match("Uber rides") == "Transport"
+    assert matcher.match("Big Bazaar groceries") == "Shopping"  # Merchant rule outweighs "groceries"
+    assert matcher.match_many(["blinkit", "cafes", "misc"]) == ["Shopping", "Food & Dining", None]
+    assert default_matcher.match("took the bus home") == "transport"
+
+
+def test_normalize_description():
+    """Test that order numbers and punctuation don't split memo entries"""
+    assert normalize_description("Swiggy order #4411") == "swiggy order"
+    assert normalize_description("UPI/0923/ZOMATO  ") == "upi zomato"
+    assert normalize_description("1234") == ""
+
+
+@pytest.mark.asyncio
+async def test_suggest_category_uses_saved_category(db_session):
+    """Test that a category saved on an expense answers repeat suggestions"""
+    category_memo.clear()
+    user = User(email="ai-memo@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+    travel = Category(user_id=user.id, name="Travel")
+    db_session.add(travel)
+    await db_session.commit()
+
+    await ExpenseService(db_session).create_expense(
+        user.id, ExpenseCreate(amount=250.0, description="Uber ride #8812", category_id=travel.id)
+    )
+    suggestion = await AIService(db_session).suggest_category("uber ride 9921", 180.0, user.id)
+    assert suggestion["suggested_category"] == "Travel"
+    assert suggestion["source"] == "memo"
+
+
+def test_embed_similarity():
+    """Test that spelling variants of a merchant embed close together"""
+    vectors = embed(["Cult.fit membership #22", "cultfit renewal", "electricity bill"])
+    assert vectors.dtype.name == "float32"
+    assert float(vectors[0] @ vectors[1]) > float(vectors[0] @ vectors[2])
+
+
+@pytest.mark.asyncio
+async def test_nearest_examples_categorize_custom_categories(db_session):
+    """Test that saved expenses teach the local categorizer, and that rebuild restores it"""
+    clear_indexes()
+    user = User(email="ai-knn@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+    gym = Category(user_id=user.id, name="Gym")
+    db_session.add(gym)
+    await db_session.commit()
+
+    expenses = ExpenseService(db_session)
+    for description in ["cult fit membership", "cultfit renewal"]:
+        await expenses.create_expense(
+            user.id, ExpenseCreate(amount=1500.0, description=description, category_id=gym.id)
+        )
+
+    categorizer = EmbeddingCategorizer(db_session)
+    [match, unknown] = await categorizer.suggest(user.id, ["Cult fit monthly", "random thing"])
+    assert match is not None and match[0] == gym.id
+    assert unknown is None
+    assert await categorizer.suggest(user.id, ["Cult fit monthly"], allowed=[]) == [None]
+
+    assert await categorizer.rebuild(user.id) == 2
+    await db_session.commit()
+    [match] = await categorizer.suggest(user.id, ["cult fit monthly"])
+    assert match is not None and match[0] == gym.id
+
+
+@pytest.mark.asyncio
+async def test_suggest_categories_batch(db_session):
+    """Test that batch suggestions resolve locally, dedupe, and keep input order"""
+    category_memo.clear()
+    clear_indexes()
+    user = User(email="ai-batch@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+    food = Category(user_id=user.id, name="Food")
+    travel = Category(user_id=user.id, name="Travel")
+    db_session.add_all([food, travel])
+    await db_session.commit()
+
+    await ExpenseService(db_session).create_expense(
+        user.id, ExpenseCreate(amount=250.0, description="Uber ride #8812", category_id=travel.id)
+    )
+    ai = AIService(db_session)
+    ai.longcat_client = None
+    results = await ai.suggest_categories(
+        user.id, [("Swiggy order", 300.0), ("uber ride 9921", 180.0), ("SWIGGY ORDER!", 120.0), ("zzqx", 1.0)]
+    )
+    assert [r["description"] for r in results] == ["Swiggy order", "uber ride 9921", "SWIGGY ORDER!", "zzqx"]
+    assert [r["source"] for r in results] == ["rule-based", "memo", "rule-based", "fallback-default"]
+    assert results[0]["category_id"] == results[2]["category_id"] == food.id
+    assert results[1]["suggested_category"] == "Travel"
+
+
+@pytest.mark.asyncio
+async def test_bulk_inserts_add_examples_after_commit(db_session, monkeypatch):
+    """Test that bulk writes teach the index, only once committed, within the per-user cap"""
+    from sqlalchemy import func, select
+    from app.models.category_example import CategoryExample
+    from app.services import embedding_categorizer
+
+    clear_indexes()
+    monkeypatch.setattr(embedding_categorizer, "MAX_EXAMPLES_PER_USER", 2)
+    user = User(email="ai-bulk-knn@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+    gym = Category(user_id=user.id, name="Gym")
+    db_session.add(gym)
+    await db_session.commit()
+    user_id, gym_id = user.id, gym.id  # The rollback below expires the instances
+
+    categorizer = EmbeddingCategorizer(db_session)
+    assert await categorizer.suggest(user_id, ["cult fit monthly"]) == [None]  # Loads the index
+
+    # A rolled-back write leaves nothing behind in the loaded index
+    await categorizer.add_example(user_id, "cult fit membership", gym_id)
+    await db_session.rollback()
+    assert await categorizer.suggest(user_id, ["cult fit monthly"]) == [None]
+
+    await ExpenseService(db_session).bulk_create_expenses(user_id, [
+        ExpenseCreate(amount=900.0, description=description, category_id=gym_id)
+        for description in ["yoga class", "cult fit membership", "cultfit renewal"]
+    ])
+    [match] = await categorizer.suggest(user_id, ["cult fit monthly"])
+    assert match is not None and match[0] == gym_id
+
+    count = await db_session.execute(
+        select(func.count()).select_from(CategoryExample).where(CategoryExample.user_id == user_id)
+    )
+    assert count.scalar() == 2
+    assert embedding_categorizer._indexes[user_id].texts == ["cult fit membership", "cultfit renewal"]
+
+
+@pytest.mark.asyncio
+async def test_merchant_rule_outranks_remembered_model_guess(db_session):
+    """Test that a rule added later beats a memoized model answer, and weak guesses aren't kept"""
+    category_memo.clear()
+    user = User(email="ai-memo-rule@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+    gym = Category(user_id=user.id, name="Gym")
+    misc = Category(user_id=user.id, name="Misc")
+    db_session.add_all([gym, misc])
+    await db_session.commit()
+
+    await category_memo.learn(user.id, "Acme Wellness #118", misc.id, 0.5)
+    assert await category_memo.get(user.id, "acme wellness") is None
+
+    await category_memo.learn(user.id, "Acme Wellness #118", misc.id, 0.95)  # As a model would
+    ai = AIService(db_session)
+    suggestion = await ai.suggest_category("acme wellness 204", 1500.0, user.id)
+    assert (suggestion["suggested_category"], suggestion["source"]) == ("Misc", "memo")
+
+    gym.keywords = "acme"
+    await db_session.commit()
+    suggestion = await ai.suggest_category("acme wellness 204", 1500.0, user.id)
+    assert (suggestion["suggested_category"], suggestion["source"]) == ("Gym", "rule-based")
@@ -0,0 +1,170 @@
+"""
+Analytics Tests
+"""
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.models import User
+from app.models.goal import Goal  # noqa: F401 - registers the User.goals mapper
+from app.schemas.expense import ExpenseCreate
+from app.services.analytics_cache import analytics_cache
+from app.services.analytics_service import AnalyticsService, bucket_start, bucket_label
+from app.services.expense_service import ExpenseService
+from app.services.forecast_service import ForecastService, forecast_series, next_month
+
+
+def test_bucket_start():
+    """Test calendar bucketing for trends"""
+    day = date(2026, 8, 20)  # Thursday
+    assert bucket_start(day, "week") == date(2026, 8, 17)
+    assert bucket_start(day, "month") == date(2026, 8, 1)
+    assert bucket_start(day, "quarter") == date(2026, 7, 1)
+
+
+def test_bucket_label():
+    """Test trend bucket labels"""
+    assert bucket_label(date(2026, 1, 1), "month") == "January 2026"
+    assert bucket_label(date(2026, 10, 1), "quarter") == "Q4 2026"
+
+
+@pytest.mark.asyncio
+async def test_trends_buckets_fill_gaps_across_year_boundary(db_session):
+    """Test month, week and quarter trends: calendar bounds, zero-filled gaps and one grouped query"""
+    from dateutil.relativedelta import relativedelta
+    from sqlalchemy import event
+
+    analytics_cache.clear()
+    user = User(email="analytics-trends@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+
+    year = datetime.utcnow().year - 1
+    spends = {date(year - 1, 12, 31): 10.0, date(year, 1, 1): 20.0, date(year, 3, 15): 30.0}  # No February
+    expenses = ExpenseService(db_session)
+    for day, amount in spends.items():
+        await expenses.create_expense(
+            user.id, ExpenseCreate(amount=amount, date=datetime.combine(day, datetime.min.time()).replace(hour=12))
+        )
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    analytics = AnalyticsService(db_session)
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        months = await analytics.get_trends(user.id, months=36, bucket="month")
+        weeks = await analytics.get_trends(user.id, months=36, bucket="week")
+        quarters = await analytics.get_trends(user.id, months=36, bucket="quarter")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # Per call: the change sequence for the cache key, then one grouped query
+    assert len(statements) == 6
+    assert sum("daily_spend" in statement for statement in statements) == 3
+
+    this_month = datetime.utcnow().date().replace(day=1)
+    assert len(months) == 36
+    assert months[0]["start_date"] == (this_month - relativedelta(months=35)).isoformat()
+    assert months[-1]["start_date"] == this_month.isoformat()
+    by_start = {point["start_date"]: point for point in months}
+    assert by_start[f"{year - 1}-12-01"]["total"] == 10.0
+    assert by_start[f"{year}-01-01"]["total"] == 20.0
+    assert by_start[f"{year}-02-01"] == {
+        "period": f"February {year}",
+        "start_date": f"{year}-02-01",
+        "total": 0.0,
+        "month": f"February {year}",
+    }
+    assert by_start[f"{year}-03-01"]["total"] == 30.0
+    assert sum(point["total"] for point in months) == 60.0
+
+    expected_weeks = {}
+    for day, amount in spends.items():
+        start = bucket_start(day, "week")
+        expected_weeks[start.isoformat()] = expected_weeks.get(start.isoformat(), 0.0) + amount
+    assert {p["start_date"]: p["total"] for p in weeks if p["total"]} == expected_weeks
+    assert all(date.fromisoformat(p["start_date"]).weekday() == 0 for p in weeks)
+    assert all(p["period"].startswith("Week of ") for p in weeks)
+
+    by_quarter = {point["period"]: point for point in quarters}
+    assert by_quarter[f"Q4 {year - 1}"]["start_date"] == f"{year - 1}-10-01"
+    assert by_quarter[f"Q4 {year - 1}"]["total"] == 10.0
+    assert by_quarter[f"Q1 {year}"]["total"] == 50.0
+    assert by_quarter[f"Q2 {year}"]["total"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_summary_cache_invalidates_on_write(db_session):
+    """Test that summaries are served from cache until an expense write"""
+    analytics_cache.clear()
+    user = User(email="analytics-cache@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+
+    expenses = ExpenseService(db_session)
+    await expenses.create_expense(user.id, ExpenseCreate(amount=40.0, date=datetime.utcnow()))
+
+    analytics = AnalyticsService(db_session)
+    first = await analytics.get_summary(user.id)
+    assert first.summary.total == 40.0
+
+    calls = []
+    compute = analytics._compute_summary
+
+    async def counting(*args):
+        calls.append(args)
+        return await compute(*args)
+
+    analytics._compute_summary = counting
+    assert (await analytics.get_summary(user.id)).summary.total == 40.0
+    assert calls == []
+
+    await expenses.create_expense(user.id, ExpenseCreate(amount=2.0, date=datetime.utcnow()))
+    assert (await analytics.get_summary(user.id)).summary.total == 42.0
+    assert len(calls) == 1
+
+
+def test_forecast_series_intervals():
+    """Test that steady spend forecasts exactly and noisy spend gets a wider interval"""
+    history_start = date(2026, 4, 1)
+    weekdays = (history_start.weekday() + np.arange(182)) % 7
+    steady = np.full(182, 10.0)
+    weekends = np.where(weekdays >= 5, 50.0, 0.0)
+    noisy = np.random.default_rng(0).poisson(0.3, 182) * 100.0
+
+    predicted, lower, upper = forecast_series(
+        np.stack([steady, weekends, noisy]), history_start, date(2026, 11, 1), 30
+    )
+    assert predicted[0] == pytest.approx(300.0)
+    assert lower[0] == pytest.approx(300.0) and upper[0] == pytest.approx(300.0)
+    assert predicted[1] == pytest.approx(50.0 * 9, rel=0.05)  # 9 weekend days in Nov 2026
+    assert (lower <= predicted).all() and (predicted <= upper).all()
+    assert upper[2] - lower[2] > upper[1] - lower[1]
+
+
+@pytest.mark.asyncio
+async def test_forecast_per_category(db_session):
+    """Test next-month forecasts in total and per category"""
+    user = User(email="analytics-forecast@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+
+    expenses = ExpenseService(db_session)
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    for days_ago in range(1, 61):
+        await expenses.create_expense(user.id, ExpenseCreate(
+            amount=10.0, description=f"Coffee {days_ago}", date=today - timedelta(days=days_ago)
+        ))
+
+    forecast = await ForecastService(db_session).forecast_user(user.id)
+    period_start, period_days = next_month(today.date())
+    assert forecast.period_start == period_start
+    assert forecast.predicted_amount == pytest.approx(10.0 * period_days, rel=0.05)
+    assert forecast.lower_bound <= forecast.predicted_amount <= forecast.upper_bound
+    assert [c.category_name for c in forecast.categories] == ["Uncategorized"]
+    assert forecast.categories[0].predicted_amount == pytest.approx(forecast.predicted_amount)
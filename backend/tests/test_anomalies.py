@@ -0,0 +1,74 @@
+"""
+Spending Anomaly Tests
+"""
+import statistics
+
+import pytest
+from sqlalchemy import select
+
+from app.models import User, Notification, SpendingStats
+from app.models.goal import Goal  # noqa: F401 - registers the User.goals mapper
+from app.models.notification import NotificationType
+from app.schemas.expense import ExpenseCreate
+from app.services.anomaly_service import AnomalyService, anomaly_score, update_stats
+from app.services.expense_service import ExpenseService
+
+
+def test_update_stats_matches_batch_statistics():
+    """Test that the running mean and variance match a full pass"""
+    amounts = [120.0, 80.0, 95.5, 101.0, 250.0, 60.0, 99.0, 110.0]
+    stats = SpendingStats(count=0, mean=0.0, m2=0.0, ewma=0.0, ewm_var=0.0)
+    for amount in amounts:
+        update_stats(stats, amount)
+
+    assert stats.count == len(amounts)
+    assert stats.mean == pytest.approx(statistics.mean(amounts))
+    assert stats.m2 / (stats.count - 1) == pytest.approx(statistics.variance(amounts))
+    assert anomaly_score(stats, 100.0) < 1.0
+    assert anomaly_score(stats, 1000.0) > 3.0
+
+
+@pytest.mark.asyncio
+async def test_unusual_expense_notifies(db_session):
+    """Test that only an amount far above the category's usual spend notifies"""
+    user = User(email="anomaly@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+
+    expenses = ExpenseService(db_session)
+    for index, amount in enumerate([90.0, 110.0, 100.0, 95.0, 105.0, 98.0, 102.0, 100.0, 97.0, 103.0]):
+        await expenses.create_expense(user.id, ExpenseCreate(amount=amount, description=f"Lunch {index}"))
+    await expenses.create_expense(user.id, ExpenseCreate(amount=108.0, description="Lunch"))
+
+    query = select(Notification).where(
+        Notification.user_id == user.id,
+        Notification.type == NotificationType.UNUSUAL_SPENDING
+    )
+    assert (await db_session.execute(query)).scalars().all() == []
+
+    await expenses.create_expense(user.id, ExpenseCreate(amount=1200.0, description="Team dinner"))
+    notifications = (await db_session.execute(query)).scalars().all()
+    assert len(notifications) == 1
+    assert "Team dinner" in notifications[0].message
+
+
+@pytest.mark.asyncio
+async def test_rebuild_matches_incremental_stats(db_session):
+    """Test that the backfill reproduces the state kept on the create path"""
+    user = User(email="anomaly-rebuild@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+
+    expenses = ExpenseService(db_session)
+    for index, amount in enumerate([12.0, 40.0, 18.5, 22.0, 35.0]):
+        await expenses.create_expense(user.id, ExpenseCreate(amount=amount, description=f"Cab {index}"))
+
+    query = select(SpendingStats).where(SpendingStats.user_id == user.id)
+    incremental = (await db_session.execute(query)).scalar_one()
+    before = (incremental.count, incremental.mean, incremental.m2, incremental.ewma, incremental.ewm_var)
+
+    assert await AnomalyService(db_session).rebuild(user.id) == 1
+    await db_session.commit()
+    db_session.expire_all()
+    rebuilt = (await db_session.execute(query)).scalar_one()
+    assert (rebuilt.count, rebuilt.mean, rebuilt.m2, rebuilt.ewma, rebuilt.ewm_var) == pytest.approx(before)
@@ -0,0 +1,50 @@
+"""
+Budget Tests
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, func
+
+from app.models import User, Category, Notification
+from app.models.goal import Goal  # noqa: F401 - registers the User.goals mapper
+from app.models.notification import NotificationType
+from app.schemas.budget import BudgetCreate
+from app.schemas.expense import ExpenseCreate
+from app.services.budget_service import BudgetService
+from app.services.expense_service import ExpenseService
+
+
+@pytest.mark.asyncio
+async def test_budget_alerts_fire_once_per_threshold(db_session):
+    """Test that warnings and breaches are sent only when crossed"""
+    user = User(email="budget@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.flush()
+    food = Category(user_id=user.id, name="Food")
+    db_session.add(food)
+    await db_session.commit()
+
+    await BudgetService(db_session).create_budget(
+        user.id, BudgetCreate(name="Food", amount=100.0, category_id=food.id)
+    )
+    expenses = ExpenseService(db_session)
+    now = datetime.utcnow()
+    for amount in (50.0, 45.0, 1.0, 1.0, 10.0, 5.0):
+        await expenses.create_expense(
+            user.id, ExpenseCreate(amount=amount, category_id=food.id, date=now)
+        )
+
+    result = await db_session.execute(
+        select(Notification.type, func.count())
+        .where(Notification.user_id == user.id)
+        .group_by(Notification.type)
+    )
+    counts = dict(result.all())
+    assert counts == {
+        NotificationType.BUDGET_WARNING: 1,
+        NotificationType.BUDGET_EXCEEDED: 1,
+    }
+
+    budgets = await BudgetService(db_session).get_budgets(user.id)
+    assert budgets[0].spent == 112.0
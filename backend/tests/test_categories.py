@@ -1,7 +1,18 @@
 """
 Category Tests
 """
+from datetime import datetime
+
 import pytest
+from sqlalchemy import select
+
+from app.models import User, Category, DailySpend, SpendingStats
+from app.models.goal import Goal  # noqa: F401 - registers the User.goals mapper
+from app.schemas.expense import ExpenseCreate
+from app.services.anomaly_service import AnomalyService
+from app.services.category_service import CategoryService
+from app.services.expense_service import ExpenseService
+from app.services.rollup_service import RollupService
 
 
 @pytest.mark.asyncio
@@ -16,3 +27,46 @@ async def test_get_categories():
     """Test getting categories"""
     # TODO: Implement test
     pass
+
+
+@pytest.mark.asyncio
+async def test_delete_moves_aggregates_to_uncategorized(db_session):
+    """Test that the rollup and spending stats match a rebuild after a category delete"""
+    user = User(email="category-delete@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.flush()
+    food = Category(user_id=user.id, name="Food")
+    db_session.add(food)
+    await db_session.commit()
+    user_id = user.id
+
+    expenses = ExpenseService(db_session)
+    for amount, category_id, day in (
+        (10.0, food.id, 14), (30.0, food.id, 15), (5.0, None, 14), (7.0, None, 16)
+    ):
+        await expenses.create_expense(
+            user_id, ExpenseCreate(amount=amount, category_id=category_id, date=datetime(2026, 3, day, 12, 0))
+        )
+    assert await CategoryService(db_session).delete_category(food.id, user_id)
+
+    async def snapshot():
+        rollup = await db_session.execute(
+            select(DailySpend.day, DailySpend.category_id, DailySpend.total, DailySpend.expense_count)
+            .where(DailySpend.user_id == user_id)
+            .order_by(DailySpend.day, DailySpend.category_id)
+        )
+        stats = await db_session.execute(
+            select(SpendingStats.category_id, SpendingStats.count, SpendingStats.mean, SpendingStats.m2)
+            .where(SpendingStats.user_id == user_id)
+        )
+        return [tuple(row) for row in rollup], [
+            (category_id, count, pytest.approx(mean), pytest.approx(m2))
+            for category_id, count, mean, m2 in stats
+        ]
+
+    maintained = await snapshot()
+    assert [row[1] for row in maintained[0]] == [0, 0, 0]
+    await RollupService(db_session).rebuild(user_id)
+    await AnomalyService(db_session).rebuild(user_id)
+    await db_session.commit()
+    assert maintained == await snapshot()
@@ -0,0 +1,97 @@
+"""
+Columnar Export/Import Tests
+"""
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.exceptions import BadRequestException
+from app.models import User, Category
+from app.models.goal import Goal  # noqa: F401 - registers the User.goals mapper
+from app.schemas.expense import ExpenseCreate
+from app.services.columnar_service import ColumnarService, _require_pyarrow, _stream_batches
+from app.services.expense_service import ExpenseService
+
+
+async def _export(db_session, user_id: int, file_format: str) -> bytes:
+    pa = _require_pyarrow()
+    query = ColumnarService(db_session)._export_query(user_id)
+    factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    return b"".join([chunk async for chunk in _stream_batches(pa, query, file_format, factory)])
+
+
+async def _user_with_food(db_session, email: str):
+    user = User(email=email, hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+    food = Category(user_id=user.id, name="Food")
+    db_session.add(food)
+    await db_session.commit()
+    return user, food
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+async def test_round_trip_and_reimport_skips_duplicates(db_session, file_format):
+    """Test export then import into another account, and that a re-import is a no-op"""
+    owner, food = await _user_with_food(db_session, f"columnar-owner-{file_format}@example.com")
+    expenses = ExpenseService(db_session)
+    for day, amount in ((1, 120.0), (2, 80.5), (3, 42.0)):
+        await expenses.create_expense(owner.id, ExpenseCreate(
+            amount=amount,
+            description=f"Lunch {day}",
+            date=datetime(2026, 5, day, 13, 0),
+            category_id=food.id if day != 3 else None
+        ))
+    data = await _export(db_session, owner.id, file_format)
+
+    other, other_food = await _user_with_food(db_session, f"columnar-other-{file_format}@example.com")
+    service = ColumnarService(db_session)
+    result = await service.import_expenses(other.id, io.BytesIO(data), file_format)
+    assert result == {"imported": 3, "skipped": 0}
+
+    page = await expenses.get_expenses(other.id, page_size=10)
+    assert sorted(item.amount for item in page.items) == [42.0, 80.5, 120.0]
+    by_amount = {item.amount: item for item in page.items}
+    assert by_amount[120.0].category_id == other_food.id  # Matched by name
+    assert by_amount[42.0].category_id is None
+    assert by_amount[80.5].date == datetime(2026, 5, 2, 13, 0)
+
+    again = await service.import_expenses(other.id, io.BytesIO(data), file_format)
+    assert again == {"imported": 0, "skipped": 3}
+
+
+@pytest.mark.asyncio
+async def test_corrupt_batch_is_a_bad_request(db_session):
+    """Test that corruption after the header is reported, not raised as a server error"""
+    pa = _require_pyarrow()
+    user, _ = await _user_with_food(db_session, "columnar-corrupt@example.com")
+    schema = pa.schema([("amount", pa.float64()), ("description", pa.string())])
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, schema)
+    for i in range(3):
+        writer.write_batch(pa.RecordBatch.from_pylist([{"amount": float(i), "description": "x" * 50}], schema=schema))
+    writer.close()
+    truncated = sink.getvalue()[:-60]
+
+    with pytest.raises(BadRequestException):
+        await ColumnarService(db_session).import_expenses(user.id, io.BytesIO(truncated), "arrow")
+
+
+@pytest.mark.asyncio
+async def test_timezone_aware_dates_import_as_naive_utc(db_session):
+    """Test that zoned timestamp columns are converted to the naive UTC dates expenses store"""
+    pa = _require_pyarrow()
+    user, _ = await _user_with_food(db_session, "columnar-tz@example.com")
+    schema = pa.schema([("amount", pa.float64()), ("date", pa.timestamp("us", tz="+05:30"))])
+    local = datetime(2026, 5, 2, 1, 0, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+    sink = io.BytesIO()
+    pa.parquet.write_table(pa.Table.from_pylist([{"amount": 99.0, "date": local}], schema=schema), sink)
+
+    result = await ColumnarService(db_session).import_expenses(user.id, io.BytesIO(sink.getvalue()), "parquet")
+    assert result == {"imported": 1, "skipped": 0}
+
+    page = await ExpenseService(db_session).get_expenses(user.id, page_size=10)
+    assert page.items[0].date == datetime(2026, 5, 1, 19, 30)
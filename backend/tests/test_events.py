@@ -0,0 +1,77 @@
+"""
+Event Buffer Tests
+"""
+import asyncio
+from typing import List
+
+import pytest
+
+from app.services.event_service import EventBuffer
+
+
+class RecordingBuffer(EventBuffer):
+    """Event buffer that records batches instead of writing them"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches: List[List[dict]] = []
+        self.written = asyncio.Event()
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def _write(self, batch: List[dict]) -> None:
+        await self.gate.wait()
+        self.batches.append(batch)
+        self.written.set()
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_is_full():
+    """Test that a full batch is written without waiting for the interval"""
+    buffer = RecordingBuffer(max_size=100, batch_size=3, flush_interval=60.0, put_timeout=1.0)
+    await buffer.start()
+    for i in range(3):
+        await buffer.put({"n": i})
+    await asyncio.wait_for(buffer.written.wait(), 1.0)
+    assert buffer.batches == [[{"n": 0}, {"n": 1}, {"n": 2}]]
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_interval():
+    """Test that a partial batch is written once the flush interval passes"""
+    buffer = RecordingBuffer(max_size=100, batch_size=100, flush_interval=0.05, put_timeout=1.0)
+    await buffer.start()
+    await buffer.put({"n": 1})
+    await asyncio.wait_for(buffer.written.wait(), 1.0)
+    assert buffer.batches == [[{"n": 1}]]
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_after_put_timeout():
+    """Test backpressure on a full queue, then dropping once put_timeout expires"""
+    buffer = RecordingBuffer(max_size=1, batch_size=1, flush_interval=60.0, put_timeout=0.05)
+    buffer.gate.clear()  # Hold the flusher inside its first write
+    await buffer.start()
+    await buffer.put({"n": 1})
+    await asyncio.sleep(0.01)  # Flusher takes it and blocks
+    await buffer.put({"n": 2})  # Fills the queue
+    await buffer.put({"n": 3})  # Waits put_timeout, then is dropped
+    assert buffer.dropped == 1
+
+    buffer.gate.set()
+    await asyncio.wait_for(buffer.stop(), 1.0)
+    assert buffer.batches == [[{"n": 1}], [{"n": 2}]]
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queue_without_waiting_for_interval():
+    """Test that stop() writes everything queued and returns promptly"""
+    buffer = RecordingBuffer(max_size=100, batch_size=100, flush_interval=60.0, put_timeout=1.0)
+    await buffer.start()
+    for i in range(5):
+        await buffer.put({"n": i})
+    await asyncio.wait_for(buffer.stop(), 1.0)
+    assert [row["n"] for batch in buffer.batches for row in batch] == [0, 1, 2, 3, 4]
+    assert not buffer.running
@@ -1,7 +1,23 @@
 """
 Expense Tests
 """
+from datetime import datetime
+
 import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+
+from app.core.exceptions import BadRequestException
+from app.models import User, Category, Expense, DailySpend
+from app.models.goal import Goal  # noqa: F401 - registers the User.goals mapper
+from app.schemas.expense import ExpenseCreate, ExpenseUpdate
+from app.services.expense_service import (
+    ExpenseService,
+    encode_cursor,
+    decode_cursor,
+    expense_fingerprint,
+)
+from app.services.rollup_service import RollupService
 
 
 @pytest.mark.asyncio
@@ -30,3 +46,268 @@ async def test_delete_expense():
     """Test expense deletion"""
     # TODO: Implement test
     pass
+
+
+def test_cursor_round_trip():
+    """Test keyset cursor encoding"""
+    moment = datetime(2026, 1, 18, 17, 5, 26, 84684)
+    assert decode_cursor(encode_cursor(moment, 42)) == (moment, 42)
+
+
+def test_invalid_cursor_rejected():
+    """Test that a malformed cursor is a bad request"""
+    with pytest.raises(BadRequestException):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_tied_dates_exactly_once(db_session):
+    """Test that walking every cursor page yields each expense once, in (date, id) order"""
+    user = User(email="keyset@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.flush()
+    dates = [datetime(2026, 3, 1, 9, 0)] * 4 + [datetime(2026, 3, 2, 9, 0)] * 3 + [datetime(2026, 2, 28, 9, 0)]
+    db_session.add_all([
+        Expense(user_id=user.id, amount=float(i), date=day)
+        for i, day in enumerate(dates)
+    ])
+    await db_session.commit()
+
+    service = ExpenseService(db_session)
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        page = await service.get_expenses(user.id, page_size=3, cursor=cursor, total_mode="none")
+        assert page.total is None
+        seen.extend((item.date, item.id) for item in page.items)
+        cursor = page.next_cursor
+
+    assert len(seen) == len(dates)
+    assert len(set(seen)) == len(dates)
+    assert seen == sorted(seen, reverse=True)
+
+    page = await service.get_expenses(user.id, page_size=3, cursor="", total_mode="estimate")
+    assert (page.total, page.total_is_estimate) == (len(dates), False)
+    page = await service.get_expenses(user.id, page_size=3, cursor="", total_mode="exact")
+    assert (page.total, page.total_is_estimate) == (len(dates), False)
+
+
+@pytest.mark.asyncio
+async def test_get_expenses_query_count_is_constant(db_session):
+    """Test that listing cost does not grow with page size"""
+    user = User(email="paging@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.flush()
+    category = Category(user_id=user.id, name="Food", icon="🍽️", color="#FF6B6B")
+    db_session.add(category)
+    await db_session.flush()
+    db_session.add_all([
+        Expense(user_id=user.id, category_id=category.id, amount=10.0 + i)
+        for i in range(60)
+    ])
+    await db_session.commit()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        service = ExpenseService(db_session)
+        counts = []
+        for page_size in (5, 50):
+            statements.clear()
+            page = await service.get_expenses(user.id, page_size=page_size)
+            assert len(page.items) == page_size
+            assert page.items[0].category_name == "Food"
+            assert page.items[0].category_color == "#FF6B6B"
+            counts.append(len(statements))
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert counts[0] == counts[1]
+
+
+@pytest.mark.asyncio
+async def test_search_matches_notes_and_tags(db_session):
+    """Test that search covers description, notes and tags case-insensitively"""
+    user = User(email="search@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.flush()
+    db_session.add_all([
+        Expense(user_id=user.id, amount=1.0, description="Swiggy order"),
+        Expense(user_id=user.id, amount=2.0, description="Cab", notes="Airport SWIGGY pickup"),
+        Expense(user_id=user.id, amount=3.0, description="Lunch", tags="work,swiggy"),
+        Expense(user_id=user.id, amount=4.0, description="Rent"),
+        Expense(user_id=user.id, amount=5.0, description="100% cashback"),
+    ])
+    await db_session.commit()
+
+    service = ExpenseService(db_session)
+    page = await service.get_expenses(user.id, search="swiggy")
+    assert sorted(item.amount for item in page.items) == [1.0, 2.0, 3.0]
+    assert page.total == 3
+
+    page = await service.get_expenses(user.id, search="100%")
+    assert [item.amount for item in page.items] == [5.0]
+
+
+@pytest.mark.asyncio
+async def test_rollup_tracks_expense_writes(db_session):
+    """Test that the daily rollup matches a rebuild after create/update/delete"""
+    from sqlalchemy import select
+
+    user = User(email="rollup@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.flush()
+    food = Category(user_id=user.id, name="Food")
+    travel = Category(user_id=user.id, name="Travel")
+    db_session.add_all([food, travel])
+    await db_session.commit()
+
+    service = ExpenseService(db_session)
+    day = datetime(2026, 3, 14, 12, 0)
+    first = await service.create_expense(
+        user.id, ExpenseCreate(amount=100.0, category_id=food.id, date=day)
+    )
+    second = await service.create_expense(
+        user.id, ExpenseCreate(amount=40.0, category_id=food.id, date=day)
+    )
+    await service.create_expense(user.id, ExpenseCreate(amount=15.0, date=day))
+    await service.update_expense(
+        first.id, user.id, ExpenseUpdate(amount=120.0, category_id=travel.id)
+    )
+    await service.delete_expense(second.id, user.id)
+
+    async def snapshot():
+        result = await db_session.execute(
+            select(DailySpend.day, DailySpend.category_id, DailySpend.total, DailySpend.expense_count)
+            .where(DailySpend.user_id == user.id, DailySpend.expense_count > 0)
+            .order_by(DailySpend.category_id)
+        )
+        return [tuple(row) for row in result]
+
+    maintained = await snapshot()
+    await RollupService(db_session).rebuild(user.id)
+    assert maintained == await snapshot()
+    assert await RollupService(db_session).get_totals(user.id) == (135.0, 2)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_per_item_results(db_session):
+    """Test that bulk create inserts valid items and flags foreign categories"""
+    owner = User(email="bulk-create@example.com", hashed_password="x")
+    other = User(email="bulk-create-other@example.com", hashed_password="x")
+    db_session.add_all([owner, other])
+    await db_session.flush()
+    mine = Category(user_id=owner.id, name="Food")
+    theirs = Category(user_id=other.id, name="Food")
+    db_session.add_all([mine, theirs])
+    await db_session.commit()
+
+    service = ExpenseService(db_session)
+    day = datetime(2026, 5, 1, 8, 0)
+    response = await service.bulk_create_expenses(owner.id, [
+        ExpenseCreate(amount=12.0, category_id=mine.id, date=day),
+        ExpenseCreate(amount=99.0, category_id=theirs.id, date=day),
+        ExpenseCreate(amount=3.0, date=day),
+    ])
+
+    assert (response.created, response.failed) == (2, 1)
+    assert [r.error is None for r in response.results] == [True, False, True]
+    assert response.results[1].id is None
+    created = await service.get_expense(response.results[0].id, owner.id)
+    assert created.category_id == mine.id
+    assert await RollupService(db_session).get_totals(owner.id) == (15.0, 2)
+
+
+def test_fingerprint_normalizes_description():
+    """Test that fingerprints ignore case, punctuation and time of day"""
+    morning = expense_fingerprint(1, 250, datetime(2026, 4, 1, 9, 0), "Swiggy  Order!")
+    assert morning == expense_fingerprint(1, 250.0, datetime(2026, 4, 1, 21, 30), "swiggy order")
+    assert morning != expense_fingerprint(1, 250.0, datetime(2026, 4, 2, 9, 0), "swiggy order")
+    assert morning != expense_fingerprint(2, 250.0, datetime(2026, 4, 1, 9, 0), "swiggy order")
+
+
+@pytest.mark.asyncio
+async def test_create_flags_duplicates_and_honors_idempotency_key(db_session):
+    """Test duplicate flagging on create and idempotent retries"""
+    user = User(email="dupes@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+
+    service = ExpenseService(db_session)
+    data = ExpenseCreate(amount=80.0, description="Cab home", date=datetime(2026, 6, 1, 22, 0))
+    first = await service.create_expense(user.id, data, idempotency_key="sync-1")
+    assert first.duplicate_of is None
+
+    retry = await service.create_expense(user.id, data, idempotency_key="sync-1")
+    assert retry.id == first.id
+
+    second = await service.create_expense(user.id, data)
+    assert second.id != first.id
+    assert second.duplicate_of == first.id
+
+    response = await service.bulk_create_expenses(user.id, [data])
+    assert response.created == 0
+    assert response.results[0].duplicate_of == first.id
+
+
+@pytest.mark.asyncio
+async def test_create_without_idempotency_key_reraises_integrity_errors(db_session):
+    """Test that a key-less create surfaces the real constraint violation"""
+    user = User(email="fk-create@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+
+    service = ExpenseService(db_session)
+    for amount in (1.0, 2.0):
+        await service.create_expense(user.id, ExpenseCreate(amount=amount))
+
+    # SQLite only enforces foreign keys when asked to, per connection
+    await db_session.execute(text("PRAGMA foreign_keys=ON"))
+    with pytest.raises(IntegrityError):
+        await service.create_expense(user.id, ExpenseCreate(amount=3.0, category_id=999999))
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_is_ownership_checked(db_session):
+    """Test that bulk delete skips other users' expenses and updates the rollup"""
+    owner = User(email="bulk-owner@example.com", hashed_password="x")
+    other = User(email="bulk-other@example.com", hashed_password="x")
+    db_session.add_all([owner, other])
+    await db_session.commit()
+
+    service = ExpenseService(db_session)
+    day = datetime(2026, 4, 2, 9, 0)
+    mine = [
+        await service.create_expense(owner.id, ExpenseCreate(amount=float(i), date=day))
+        for i in (10, 20, 30)
+    ]
+    theirs = await service.create_expense(other.id, ExpenseCreate(amount=99.0, date=day))
+
+    deleted = await service.bulk_delete_expenses(
+        [mine[0].id, mine[1].id, mine[1].id, theirs.id], owner.id
+    )
+    assert deleted == 2
+    assert await service.get_expense(theirs.id, other.id) is not None
+    assert await RollupService(db_session).get_totals(owner.id) == (30.0, 1)
+
+    with pytest.raises(BadRequestException):
+        await service.bulk_delete_expenses(list(range(1, 502)), owner.id)
+
+
+@pytest.mark.asyncio
+async def test_export_gzip_stream():
+    """Test incremental gzip encoding of the CSV export stream"""
+    import gzip
+    from app.services.expense_service import _gzip_chunks
+
+    async def rows():
+        for line in ("Date,Amount\r\n", "2026-01-01T00:00:00,10.0\r\n"):
+            yield line
+
+    body = b"".join([chunk async for chunk in _gzip_chunks(rows())])
+    assert gzip.decompress(body) == b"Date,Amount\r\n2026-01-01T00:00:00,10.0\r\n"
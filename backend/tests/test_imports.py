@@ -0,0 +1,75 @@
+"""
+CSV Import Tests
+"""
+import os
+import tempfile
+from datetime import datetime
+
+import pytest
+
+from app.models import User, Category, ImportJob
+from app.models.goal import Goal  # noqa: F401 - registers the User.goals mapper
+from app.services.import_service import (
+    ImportService,
+    parse_amount,
+    parse_date,
+    resolve_profile,
+    spend_amount,
+)
+from app.services.rollup_service import RollupService
+
+
+def test_parse_amount():
+    """Test bank amount formats"""
+    assert parse_amount("1,234.50") == 1234.5
+    assert parse_amount("₹ 99") == 99.0
+    assert parse_amount("(20.00)") == -20.0
+    assert parse_amount("") is None
+    assert parse_amount("n/a") is None
+
+
+def test_parse_date():
+    """Test explicit and fallback date formats"""
+    assert parse_date("03/04/26", "%d/%m/%y") == datetime(2026, 4, 3)
+    assert parse_date("2026-04-03") == datetime(2026, 4, 3)
+    assert parse_date("not a date") is None
+
+
+def test_spend_amount_skips_credits():
+    """Test that only debits become expenses"""
+    hdfc = resolve_profile("hdfc")
+    assert spend_amount({"Withdrawal Amt.": "250.00", "Deposit Amt.": ""}, hdfc) == 250.0
+    assert spend_amount({"Withdrawal Amt.": "", "Deposit Amt.": "900.00"}, hdfc) is None
+
+    signed = resolve_profile("generic", {"debits_negative": True})
+    assert spend_amount({"Amount": "-45"}, signed) == 45.0
+    assert spend_amount({"Amount": "45"}, signed) is None
+
+
+@pytest.mark.asyncio
+async def test_process_file_imports_and_categorizes(db_session):
+    """Test that a CSV is loaded in batches with rule-based categories"""
+    user = User(email="import@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.flush()
+    food = Category(user_id=user.id, name="Food")
+    db_session.add(food)
+    job = ImportJob(user_id=user.id, profile="generic", filename="statement.csv")
+    db_session.add(job)
+    await db_session.commit()
+
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(fd, "w", newline="") as f:
+        f.write("Date, Description ,Amount\n")
+        f.write("2026-04-01,Swiggy order,250\n")
+        f.write("2026-04-02,Rent,\"12,000.00\"\n")
+        f.write("bad date,Cab,90\n")
+    try:
+        await ImportService(db_session).process_file(job, path, resolve_profile("generic"))
+        await db_session.commit()
+    finally:
+        os.remove(path)
+
+    assert (job.rows_processed, job.rows_imported, job.rows_skipped) == (3, 2, 1)
+    assert await RollupService(db_session).get_totals(user.id) == (12250.0, 2)
+    assert await RollupService(db_session).get_totals(user.id, category_id=food.id) == (250.0, 1)
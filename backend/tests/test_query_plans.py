@@ -0,0 +1,107 @@
+"""
+Query Plan Regression Tests
+
+Checks that the hot list/aggregate queries are served by their indexes
+instead of falling back to a scan (or a single-column index plus a sort). Runs against SQLite's EXPLAIN QUERY PLAN.
+"""
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from typing import Any, AsyncIterator, List, Tuple
+
+import pytest
+from sqlalchemy import event, select, func
+
+from app.models import Budget, Notification
+from app.models.goal import Goal  # noqa: F401 - registers the User.goals mapper
+from app.services.analytics_service import AnalyticsService
+from app.services.budget_service import BudgetService
+from app.services.expense_service import ExpenseService, encode_cursor
+from app.services.rollup_service import RollupService
+
+
+async def explain(db_session, query) -> str:
+    """Return SQLite's query plan for a statement as one string"""
+    compiled = query.compile(dialect=db_session.bind.dialect)
+    # Plans do not depend on parameter values
+    params = (None,) * len(compiled.positiontup or ())
+    return await explain_sql(db_session, str(compiled), params)
+
+
+async def explain_sql(db_session, statement: str, params: tuple) -> str:
+    """Return SQLite's query plan for raw SQL, e.g. a statement captured from a service"""
+    conn = await db_session.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params)
+    return " | ".join(str(row[-1]) for row in result)
+
+
+@asynccontextmanager
+async def captured(db_session) -> AsyncIterator[List[Tuple[str, Any]]]:
+    """Collect the (SQL, parameters) of every statement a service runs"""
+    statements: List[Tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_expense_list_uses_user_date_index(db_session):
+    """Test that offset, keyset and search pages walk (user_id, date DESC, id) without sorting"""
+    service = ExpenseService(db_session)
+    cursor = encode_cursor(datetime(2026, 1, 1), 5)
+    async with captured(db_session) as statements:
+        await service.get_expenses(1, total_mode="none")
+        await service.get_expenses(1, cursor=cursor, total_mode="none")
+        await service.get_expenses(1, cursor=cursor, search="swiggy", total_mode="none")
+
+    assert len(statements) == 3
+    for statement, parameters in statements:
+        assert "LEFT OUTER JOIN categories" in statement
+        plan = await explain_sql(db_session, statement, parameters)
+        assert "ix_expenses_user_date_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_rollup_aggregates_are_range_scans(db_session):
+    """Test that the analytics and budget sums read a user's day range of daily_spend"""
+    start, end = date(2026, 1, 1), date(2026, 2, 1)
+    async with captured(db_session) as statements:
+        rollup = RollupService(db_session)
+        await rollup.get_totals(1, start, end)
+        await rollup.get_totals(1, start, end, category_id=3)
+        await AnalyticsService(db_session)._get_category_breakdown(1, start, end, 100.0)
+        budget = Budget(id=1, user_id=1, amount=100.0, period="monthly")
+        await BudgetService(db_session)._calculate_spent_batch(1, [budget])
+
+    assert len(statements) == 4
+    for statement, parameters in statements:
+        plan = await explain_sql(db_session, statement, parameters)
+        assert "SEARCH daily_spend USING INDEX sqlite_autoindex_daily_spend_1 (user_id=? AND day>?" in plan
+        assert "SCAN daily_spend" not in plan
+
+
+@pytest.mark.asyncio
+async def test_notification_queries_use_indexes(db_session):
+    """Test that unread counts hit the partial index and lists skip the sort"""
+    unread = select(func.count(Notification.id)).where(
+        Notification.user_id == 1,
+        Notification.is_read == False  # noqa: E712
+    )
+    assert "ix_notifications_user_unread" in await explain(db_session, unread)
+
+    recent = (
+        select(Notification)
+        .where(Notification.user_id == 1)
+        .order_by(Notification.created_at.desc())
+        .limit(50)
+    )
+    plan = await explain(db_session, recent)
+    assert "ix_notifications_user_created" in plan
+    assert "TEMP B-TREE" not in plan
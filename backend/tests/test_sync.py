@@ -0,0 +1,132 @@
+"""
+Delta Sync Tests
+"""
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException, Request, Response
+
+from app.api.deps import check_etag
+from app.api.v1.endpoints.analytics import export_data
+from app.models import User, Category
+from app.models.notification import NotificationType
+from app.services.notification_service import NotificationService
+from app.schemas.expense import ExpenseCreate
+from app.services.expense_service import ExpenseService
+from app.services.sync_service import SyncService
+
+
+@pytest.mark.asyncio
+async def test_sync_returns_only_changes_and_tombstones(db_session):
+    """Test that a warm sync sees updates and deletes after the watermark"""
+    user = User(email="sync@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.flush()
+    db_session.add(Category(user_id=user.id, name="Food"))
+    await db_session.commit()
+
+    expenses = ExpenseService(db_session)
+    day = datetime(2026, 7, 1, 12, 0)
+    kept = await expenses.create_expense(user.id, ExpenseCreate(amount=10.0, date=day))
+    gone = await expenses.create_expense(user.id, ExpenseCreate(amount=20.0, date=day))
+
+    sync = SyncService(db_session)
+    cold = await sync.get_changes(user.id)
+    assert [c.name for c in cold.categories] == ["Food"]
+    assert {e.id for e in cold.expenses} == {kept.id, gone.id}
+    assert cold.next_cursor is None
+
+    await expenses.bulk_delete_expenses([gone.id], user.id)
+    added = await expenses.bulk_create_expenses(
+        user.id, [ExpenseCreate(amount=30.0, description="Offline", date=day)]
+    )
+
+    warm = await sync.get_changes(user.id, since=cold.watermark)
+    assert warm.watermark > cold.watermark
+    assert warm.categories == []
+    assert [e.id for e in warm.expenses] == [added.results[0].id]
+    assert [(t.entity, t.id) for t in warm.deleted] == [("expenses", gone.id)]
+
+
+@pytest.mark.asyncio
+async def test_sync_pages_with_cursor(db_session):
+    """Test that paging walks every row exactly once"""
+    user = User(email="sync-pages@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+
+    expenses = ExpenseService(db_session)
+    response = await expenses.bulk_create_expenses(user.id, [
+        ExpenseCreate(amount=float(i), description=f"Item {i}", date=datetime(2026, 7, 2))
+        for i in range(1, 8)
+    ])
+
+    sync = SyncService(db_session)
+    seen, cursor = [], None
+    while True:
+        page = await sync.get_changes(user.id, cursor=cursor, limit=3)
+        seen.extend(e.id for e in page.expenses)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(r.id for r in response.results)
+
+
+@pytest.mark.asyncio
+async def test_etag_revalidates_until_user_data_changes(db_session):
+    """Test that If-None-Match gets a 304 until a write bumps the version"""
+    user = User(email="etag@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+
+    def get(if_none_match=None):
+        headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+        return Request({
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/notifications/",
+            "query_string": b"",
+            "headers": headers,
+        })
+
+    first = Response()
+    await check_etag(get(), first, user, db_session)
+    etag = first.headers["etag"]
+
+    with pytest.raises(HTTPException) as exc:
+        await check_etag(get(etag), Response(), user, db_session)
+    assert exc.value.status_code == 304
+
+    notifications = NotificationService(db_session)
+    await notifications.create_notification(user.id, NotificationType.SYSTEM, "Hi", "Welcome")
+    fresh = Response()
+    await check_etag(get(etag), fresh, user, db_session)
+    assert fresh.headers["etag"] != etag
+
+    await notifications.mark_all_as_read(user.id)
+    after_read = Response()
+    await check_etag(get(fresh.headers["etag"]), after_read, user, db_session)
+    assert after_read.headers["etag"] != fresh.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_export_carries_etag_headers(db_session):
+    """Test that the CSV export returns the validators check_etag set"""
+    user = User(email="etag-export@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+
+    request = Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/analytics/export",
+        "query_string": b"",
+        "headers": [],
+    })
+    injected = Response()
+    await check_etag(request, injected, user, db_session)
+
+    export = await export_data(injected, user, db_session)
+    assert export.headers["etag"] == injected.headers["etag"]
+    assert export.headers["cache-control"] == "private, no-cache"
+    assert export.headers["content-disposition"].startswith("attachment; filename=")